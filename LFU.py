@@ -1,42 +1,59 @@
-class LFUCache:
+import heapq
+from collections import OrderedDict
+from cache_policies import CachePolicy
+
+
+class LFUCache(CachePolicy):
     def __init__(self, max_left, max_middle, max_total):
+        super().__init__(max_total)
         self.max_left = max_left
         self.max_middle = max_middle
-        self.max_total = max_total
 
-        self.left_segment = []
-        self.middle_segment = []
-        self.right_segment = []
+        # Сегменти - інтрузивні двозв'язні списки, голова списку - найновіший буфер
+        self.left_segment = Segment('left')
+        self.middle_segment = Segment('middle')
+        self.right_segment = Segment('right')
         self.time = 0
 
         # Словник для швидкого пошуку буферів за номером сектора
         self.sector_map = {}
 
-    def get_sector(self, sector_number):
+        # Частотні кошики правого сегмента: лічильник -> буфери в порядку надходження.
+        # Лічильник буфера у правому сегменті не змінюється (доступ переносить
+        # буфер ліворуч), тому мінімальний кошик знаходиться через купу лічильників
+        self._buckets = {}
+        self._bucket_heap = []
+        self._heap_counters = set()
+
+    def _lookup(self, sector_number):
         """
         Повертає дані сектора якщо він є в кеші,
         інакше повертає None
         """
         self.time += 1
 
-        if sector_number in self.sector_map:
-            buffer = self.sector_map[sector_number]
-            buffer.access(self.time)
+        buffer = self.sector_map.get(sector_number)
+        if buffer is not None:
+            # Переміщуємо до оновлення лічильника, щоб знайти буфер у його кошику
             self._move_to_left(buffer)
+            buffer.access(self.time)
             return buffer.data
 
         return None
 
-    def add_sector(self, sector_number, data):
+    def __contains__(self, sector_number):
+        return sector_number in self.sector_map
+
+    def _insert(self, sector_number, data):
         """Додає новий сектор в кеш"""
         self.time += 1
 
         # Якщо сектор вже є в кеші, оновлюємо дані
-        if sector_number in self.sector_map:
-            buffer = self.sector_map[sector_number]
+        buffer = self.sector_map.get(sector_number)
+        if buffer is not None:
             buffer.data = data
-            buffer.access(self.time)
             self._move_to_left(buffer)
+            buffer.access(self.time)
             return
 
         # Створюємо новий буфер
@@ -46,63 +63,184 @@ class LFUCache:
 
     def _move_to_left(self, buffer):
         """Переміщує буфер у лівий сегмент"""
+        segment = buffer.segment
+
+        # Буфер вже в лівому сегменті - лише переносимо його на початок
+        if segment is self.left_segment:
+            segment.remove(buffer)
+            segment.push_front(buffer)
+            return
+
         # Видаляємо буфер з поточного сегмента
-        for segment in [self.middle_segment, self.right_segment]:
-            if buffer in segment:
-                segment.remove(buffer)
-                break
+        if segment is self.right_segment:
+            self._remove_from_bucket(buffer)
+        segment.remove(buffer)
 
         self._add_to_left(buffer)
 
     def _add_to_left(self, buffer):
         """Додає буфер у лівий сегмент"""
-        if len(self.left_segment) >= self.max_left:
-            moved_buffer = self.left_segment.pop(-1)
+        if len(self.left_segment) >= self.max_left and self.left_segment:
+            moved_buffer = self.left_segment.pop_back()
             self._add_to_middle(moved_buffer)
 
-        self.left_segment.insert(0, buffer)
+        self.left_segment.push_front(buffer)
         self.sector_map[buffer.sector_number] = buffer
 
     def _add_to_middle(self, buffer):
         """Додає буфер у середній сегмент"""
-        if len(self.middle_segment) >= self.max_middle:
-            moved_buffer = self.middle_segment.pop(-1)
+        if len(self.middle_segment) >= self.max_middle and self.middle_segment:
+            moved_buffer = self.middle_segment.pop_back()
             self._add_to_right(moved_buffer)
 
-        self.middle_segment.insert(0, buffer)
+        self.middle_segment.push_front(buffer)
 
     def _add_to_right(self, buffer):
         """Додає буфер у правий сегмент"""
+        right_capacity = self.max_total - self.max_left - self.max_middle
+
+        # Правий сегмент відсутній - буфер одразу витісняється з кешу
+        if right_capacity <= 0:
+            del self.sector_map[buffer.sector_number]
+            self._on_evict(buffer.sector_number, buffer.data)
+            return
+
         # Якщо правий сегмент повний, видаляємо буфер з найменшим лічильником
-        if len(self.right_segment) >= (self.max_total - self.max_left - self.max_middle):
-            # Шукаємо буфер з найменшим лічильником з кінця списку
-            min_counter = float('inf')
-            min_index = -1
-
-            for i in range(len(self.right_segment) - 1, -1, -1):
-                if self.right_segment[i].counter < min_counter:
-                    min_counter = self.right_segment[i].counter
-                    min_index = i
-
-            # Видаляємо знайдений буфер
-            removed_buffer = self.right_segment.pop(min_index)
+        # (серед рівних - той, що довше за всіх перебуває в сегменті)
+        if len(self.right_segment) >= right_capacity:
+            removed_buffer = self._pop_min_counter()
+            self.right_segment.remove(removed_buffer)
             del self.sector_map[removed_buffer.sector_number]
-
-        self.right_segment.insert(0, buffer)
+            self._on_evict(removed_buffer.sector_number, removed_buffer.data)
+
+        self.right_segment.push_front(buffer)
+        self._add_to_bucket(buffer)
+
+    def _add_to_bucket(self, buffer):
+        bucket = self._buckets.get(buffer.counter)
+        if bucket is None:
+            bucket = OrderedDict()
+            self._buckets[buffer.counter] = bucket
+            if buffer.counter not in self._heap_counters:
+                self._heap_counters.add(buffer.counter)
+                heapq.heappush(self._bucket_heap, buffer.counter)
+        bucket[buffer] = None
+
+    def _remove_from_bucket(self, buffer):
+        bucket = self._buckets[buffer.counter]
+        del bucket[buffer]
+        if not bucket:
+            # Запис у купі видаляється ліниво під час пошуку мінімуму
+            del self._buckets[buffer.counter]
+
+    def _pop_min_counter(self):
+        """Вилучає з кошиків найстаріший буфер з найменшим лічильником"""
+        heap = self._bucket_heap
+        while heap[0] not in self._buckets:
+            self._heap_counters.discard(heapq.heappop(heap))
+
+        counter = heap[0]
+        bucket = self._buckets[counter]
+        buffer, _ = bucket.popitem(last=False)
+        if not bucket:
+            del self._buckets[counter]
+            self._heap_counters.discard(heapq.heappop(heap))
+        return buffer
 
     def display(self):
         """Виводить стан сегментів"""
-        print("Left Segment:", self.left_segment)
-        print("Middle Segment:", self.middle_segment)
-        print("Right Segment:", self.right_segment)
+        print("Left Segment:", list(self.left_segment))
+        print("Middle Segment:", list(self.middle_segment))
+        print("Right Segment:", list(self.right_segment))
+
+
+class Segment:
+    """Інтрузивний двозв'язний список буферів з мітками сегмента"""
+
+    def __init__(self, name):
+        self.name = name
+        self.head = None
+        self.tail = None
+        self.size = 0
+
+    def push_front(self, buffer):
+        """Додає буфер на початок списку"""
+        buffer.segment = self
+        buffer.prev = None
+        buffer.next = self.head
+        if self.head is not None:
+            self.head.prev = buffer
+        else:
+            self.tail = buffer
+        self.head = buffer
+        self.size += 1
+
+    def remove(self, buffer):
+        """Видаляє буфер зі списку за O(1)"""
+        if buffer.prev is not None:
+            buffer.prev.next = buffer.next
+        else:
+            self.head = buffer.next
+        if buffer.next is not None:
+            buffer.next.prev = buffer.prev
+        else:
+            self.tail = buffer.prev
+        buffer.prev = buffer.next = None
+        buffer.segment = None
+        self.size -= 1
+
+    def pop_back(self):
+        """Вилучає останній (найстаріший) буфер"""
+        buffer = self.tail
+        self.remove(buffer)
+        return buffer
+
+    def __len__(self):
+        return self.size
+
+    def __getstate__(self):
+        # Зв'язки буферів не зберігаються: pickle проходив би ланцюжок
+        # next рекурсивно і на великому кеші вичерпував би глибину рекурсії.
+        # Натомість сегмент зберігається як список буферів від голови до хвоста
+        return {'name': self.name, 'buffers': list(self)}
+
+    def __setstate__(self, state):
+        self.name = state['name']
+        self.head = None
+        self.tail = None
+        self.size = 0
+        for buffer in reversed(state['buffers']):
+            self.push_front(buffer)
+
+    def __iter__(self):
+        buffer = self.head
+        while buffer is not None:
+            yield buffer
+            buffer = buffer.next
+
+    def __repr__(self):
+        return f"Segment({self.name}, {list(self)})"
 
 
 class Buffer:
+    __slots__ = ('sector_number', 'data', 'counter', 'last_access_time', 'segment', 'prev', 'next')
+
     def __init__(self, sector_number, data):
         self.sector_number = sector_number  # Номер сектора
         self.data = data  # Дані сектора
         self.counter = 0  # Лічильник використання
         self.last_access_time = 0  # Час останнього доступу
+        self.segment = None  # Сегмент, у якому зараз перебуває буфер
+        self.prev = None
+        self.next = None
+
+    def __reduce__(self):
+        # Сегмент і зв'язки відновлює Segment.__setstate__ незалежно від того,
+        # що буде розпаковано першим - буфер чи його сегмент
+        return Buffer, (self.sector_number, self.data), (self.counter, self.last_access_time)
+
+    def __setstate__(self, state):
+        self.counter, self.last_access_time = state
 
     def access(self, time):
         """Оновлює статистику доступу до буфера"""
@@ -110,4 +248,4 @@ class Buffer:
         self.last_access_time = time
 
     def __repr__(self):
-        return f"Buffer(sector={self.sector_number}, counter={self.counter})"
\ No newline at end of file
+        return f"Buffer(sector={self.sector_number}, counter={self.counter})"
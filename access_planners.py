@@ -1,6 +1,9 @@
+from bisect import bisect_left, bisect_right, insort
 from collections import deque
 from dataclasses import dataclass
 from enum import Enum
+import heapq
+import itertools
 import numpy as np
 
 
@@ -9,6 +12,21 @@ class DiskRequest:
     sector: int
     is_write: bool
     data: np.ndarray = None
+    count: int = 1          # кількість суміжних секторів для читання (read-ahead)
+    result: object = None   # (дані, затримка) для читання або затримка для запису
+    done: bool = False
+    followers: list = None  # запити, об'єднані з цим при переповненні черги
+    merged: list = None     # суміжні запити, обслуговувані цим запитом однією операцією
+    pid: object = None      # процес, що подав запит
+    submit_time: float = None   # час подання за годинником диска
+
+    def parts(self):
+        """Запити викликачів, які завершує ця операція"""
+        return self.merged if self.merged is not None else [self]
+
+
+class QueueFullError(Exception):
+    """Черга планувальника заповнена, і запит відхилено"""
 
 
 class Direction(Enum):
@@ -16,23 +34,313 @@ class Direction(Enum):
     DOWN = 2
 
 
-class FIFOScheduler:
-    def __init__(self, hdd):
+class Scheduler:
+    """
+    Базовий планувальник з чергою запитів.
+    Запити можна подавати пакетом (submit_many) і потім обробити
+    всю чергу (drain) у порядку, який обирає конкретний планувальник.
+
+    Якщо max_transfer > 1, запит до сектора, суміжного з уже поставленим
+    у чергу запитом того ж типу на тій самій доріжці, приєднується до
+    нього спереду або ззаду; злиті запити обслуговуються однією
+    багатосекторною операцією, а дані розподіляються викликачам як
+    представлення спільного буфера. Злиття змінює місце запитів у черзі,
+    тому воно не виконується, якщо діапазон злитого запиту перетинається
+    з іншими запитами в черзі (інакше читання могло б обігнати запис до
+    того ж сектора або навпаки).
+
+    Глибину черги можна обмежити (max_queue_depth); при переповненні
+    overflow задає поведінку:
+        'block' - подавач чекає, доки планувальник обробить запити з черги;
+        'reject' - запит відхиляється з QueueFullError;
+        'coalesce' - запит об'єднується з уже поставленим у чергу запитом
+                     до того ж сектора, а якщо це неможливо - як 'block'.
+    """
+
+    OVERFLOW_POLICIES = ('block', 'reject', 'coalesce')
+
+    def __init__(self, hdd, max_queue_depth=None, overflow='block', max_transfer=1):
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Невідома політика переповнення черги: {overflow}")
+        if max_transfer < 1:
+            raise ValueError("max_transfer має бути додатним")
         self.hdd = hdd
-        self.queue = deque()
+        self.max_queue_depth = max_queue_depth
+        self.overflow = overflow
 
-    def add_request(self, sector, is_write=False, data=None):
-        request = DiskRequest(sector=sector, is_write=is_write, data=data)
+        # Злиття суміжних запитів: (is_write, перший сектор) та (is_write, сектор
+        # після останнього) -> запит у черзі, до якого можна приєднати сусіда
+        self.max_transfer = max_transfer
+        self._merge_starts = {}
+        self._merge_ends = {}
+        self._covered = {}      # сектор -> кількість запитів у черзі, що його охоплюють
+        self.merges = 0
 
-        # Додаємо запит до черги і одразу обробляємо його
-        self.queue.append(request)
-        return self._process_request(request)
+        # Останній запит у черзі для кожного сектора (для об'єднання)
+        self.pending = {}
+        self.coalesced = 0
+        self.rejected = 0
+
+    def submit(self, sector, is_write=False, data=None, count=1, pid=None, submit_time=None):
+        """
+        Ставить запит у чергу без обробки і повертає його.
+        submit_time - час подання (мс), за замовчуванням - годинник диска
+        """
+        request = DiskRequest(sector=sector, is_write=is_write, data=data, count=count, pid=pid,
+                              submit_time=submit_time)
+        self._admit(request)
+        return request
+
+    def submit_many(self, requests):
+        """
+        Ставить у чергу пакет запитів
+
+        Args:
+            requests: Ітерований набір DiskRequest або кортежів (sector, is_write, data)
+
+        Returns:
+            list: Поставлені в чергу запити в порядку подання
+        """
+        submitted = []
+        for request in requests:
+            if not isinstance(request, DiskRequest):
+                request = DiskRequest(*request)
+            self._admit(request)
+            submitted.append(request)
+        return submitted
+
+    def _admit(self, request):
+        """Ставить запит у чергу з урахуванням обмеження глибини"""
+        if request.submit_time is None:
+            request.submit_time = self.hdd.clock
+        if self.max_transfer > 1 and self._merge(request):
+            self.pending[request.sector] = request
+            self._cover(request, 1)
+            return
+
+        if self.max_queue_depth is not None and len(self) >= self.max_queue_depth:
+            if self.overflow == 'reject':
+                self.rejected += 1
+                raise QueueFullError(f"Черга заповнена ({self.max_queue_depth} запитів)")
+            if self.overflow == 'coalesce' and self._coalesce(request):
+                return
+            while len(self) >= self.max_queue_depth:
+                self.dispatch_next()
+
+        self.pending[request.sector] = request
+        self._enqueue(request)
+        if self.max_transfer > 1:
+            self._index_merge(request)
+            self._cover(request, 1)
+
+    def _merge(self, request):
+        """
+        Приєднує запит до суміжного запиту в черзі (злиття ззаду або спереду)
+
+        Returns:
+            bool: Чи було злиття
+        """
+        end = request.sector + request.count
+        candidates = (self._merge_ends.get((request.is_write, request.sector)),     # злиття ззаду
+                      self._merge_starts.get((request.is_write, end)))              # злиття спереду
+        for target in candidates:
+            if target is None or target.count + request.count > self.max_transfer:
+                continue
+            start = min(target.sector, request.sector)
+            count = target.count + request.count
+            if start + count > self.hdd.track_end(start) or self._overlaps(target, request):
+                continue
+
+            # Запит у черзі замінюється складеним запитом на весь діапазон
+            parts = target.merged if target.merged is not None else [target]
+            composite = DiskRequest(sector=start, is_write=request.is_write, count=count, merged=parts,
+                                    pid=target.pid, submit_time=target.submit_time)
+            self._unindex_merge(target)
+            self._replace(target, composite)
+
+            if request.sector < parts[0].sector:
+                parts.insert(0, request)
+            else:
+                parts.append(request)
+            self._index_merge(composite)
+            self.merges += 1
+            return True
+        return False
+
+    def _overlaps(self, target, request):
+        """Чи перетинає діапазон злиття target і request інші запити в черзі"""
+        covered = self._covered
+        # Сектори target охоплені його власними запитами рівно по одному разу
+        for sector in range(target.sector, target.sector + target.count):
+            if covered[sector] > 1:
+                return True
+        for sector in range(request.sector, request.sector + request.count):
+            if sector in covered:
+                return True
+        return False
+
+    def _cover(self, request, delta):
+        """Враховує сектори запиту, що входить у чергу (delta=1) або покидає її (delta=-1)"""
+        covered = self._covered
+        for sector in range(request.sector, request.sector + request.count):
+            left = covered.get(sector, 0) + delta
+            if left:
+                covered[sector] = left
+            else:
+                del covered[sector]
+
+    def _index_merge(self, request):
+        self._merge_starts[(request.is_write, request.sector)] = request
+        self._merge_ends[(request.is_write, request.sector + request.count)] = request
+
+    def _unindex_merge(self, request):
+        key = (request.is_write, request.sector)
+        if self._merge_starts.get(key) is request:
+            del self._merge_starts[key]
+        key = (request.is_write, request.sector + request.count)
+        if self._merge_ends.get(key) is request:
+            del self._merge_ends[key]
+
+    def _coalesce(self, request):
+        """
+        Приєднує запит до запиту в черзі до того ж сектора.
+        Запис після читання не об'єднується, бо читання має побачити старі дані.
+        """
+        leader = self.pending.get(request.sector)
+        if leader is None or (request.is_write and not leader.is_write):
+            return False
+        # Читання різної довжини повертають різні дані
+        if leader.count != request.count:
+            return False
+
+        # Повторний запис замінює дані запису, що ще чекає в черзі
+        if request.is_write:
+            leader.data = request.data
+            request.data = None
+
+        if leader.followers is None:
+            leader.followers = []
+        leader.followers.append(request)
+        self.coalesced += 1
+        return True
+
+    def dispatch_next(self):
+        """Обробляє наступний запит з черги і повертає його (або None, якщо черга порожня)"""
+        request = self._pop_next()
+        if request is None:
+            return None
+        if self.max_transfer > 1:
+            self._unindex_merge(request)
+            for part in request.parts():
+                self._cover(part, -1)
+
+        if request.merged is None:
+            if self.pending.get(request.sector) is request:
+                del self.pending[request.sector]
+            request.result = self._process_request(request)
+            request.done = True
+            if request.followers:
+                self._complete_followers(request)
+        else:
+            result = self._process_request(request)
+            request.result = result
+            request.done = True
+            for part in request.merged:
+                if self.pending.get(part.sector) is part:
+                    del self.pending[part.sector]
+                part.result = self._split_result(request, part, result)
+                part.done = True
+                if part.followers:
+                    self._complete_followers(part)
+                if part.is_write:
+                    part.data = None
+
+        # Після запису дані вже на диску - не утримуємо їх у запиті
+        if request.is_write:
+            request.data = None
+        return request
+
+    def _split_result(self, request, part, result):
+        """Частка результату злитої операції для одного з її запитів (без копіювання)"""
+        if result is None or part.is_write:
+            return result
+        data, delay = result
+        offset = part.sector - request.sector
+        if part.count == 1:
+            return data[offset], delay
+        return data[offset:offset + part.count], delay
+
+    def _complete_followers(self, request):
+        """Завершує об'єднані запити разом з основним"""
+        for follower in request.followers:
+            if follower.is_write or not request.is_write or request.result is None:
+                follower.result = request.result
+            else:
+                # Читання після запису отримує щойно записані дані
+                follower.result = (self.hdd.peek_sector(request.sector), request.result)
+            follower.done = True
+
+    def drain(self):
+        """
+        Обробляє всі запити черги
+
+        Returns:
+            list: Оброблені запити (включно з об'єднаними та злитими) в порядку їх виконання
+        """
+        completed = []
+        while True:
+            request = self.dispatch_next()
+            if request is None:
+                return completed
+            for part in request.parts():
+                completed.append(part)
+                if part.followers:
+                    completed.extend(part.followers)
+                    part.followers = None
+
+    def add_request(self, sector, is_write=False, data=None, count=1, pid=None):
+        """Ставить запит у чергу та обробляє чергу, доки цей запит не буде виконано"""
+        request = self.submit(sector, is_write, data, count, pid)
+        while not request.done:
+            if self.dispatch_next() is None:
+                break
+        return request.result
+
+    def _enqueue(self, request):
+        raise NotImplementedError
+
+    def _pop_next(self):
+        raise NotImplementedError
+
+    def _remove(self, request):
+        """Вилучає запит з черги (для черг, впорядкованих за доріжками)"""
+        self.queue.remove(request, self.hdd.track_of(request.sector))
+
+    def _replace(self, old, new):
+        """Замінює запит у черзі складеним запитом"""
+        self._remove(old)
+        self._enqueue(new)
+
+    def __len__(self):
+        return len(self.queue)
 
     def _process_request(self, request):
         try:
+            if request.merged is not None and request.is_write:
+                # Збирання даних злитих записів в одну операцію
+                rows = []
+                for part in request.merged:
+                    if part.count == 1:
+                        rows.append(part.data)
+                    else:
+                        rows.extend(part.data)
+                return self.hdd.write_sectors(request.sector, rows)
             if request.is_write and request.data is not None:
                 delay = self.hdd.write_sector(request.sector, request.data)
                 return delay
+            elif request.count > 1:
+                data, delay = self.hdd.read_sectors(request.sector, request.count)
+                return (data, delay)
             else:
                 data, delay = self.hdd.read_sector(request.sector)
                 return (data, delay)
@@ -41,119 +349,527 @@ class FIFOScheduler:
             return None
 
 
-class LOOKScheduler:
-    def __init__(self, hdd, max_same_track_requests=3):
-        self.hdd = hdd
+class FIFOScheduler(Scheduler):
+    def __init__(self, hdd, max_queue_depth=None, overflow='block', max_transfer=1):
+        super().__init__(hdd, max_queue_depth, overflow, max_transfer)
+        self.queue = deque()
+
+    def _enqueue(self, request):
+        self.queue.append(request)
+
+    def _pop_next(self):
+        if not self.queue:
+            return None
+        return self.queue.popleft()
+
+    def _remove(self, request):
+        for index, queued in enumerate(self.queue):
+            if queued is request:
+                del self.queue[index]
+                return
+
+    def _replace(self, old, new):
+        # Складений запит займає місце замінюваного, порядок FIFO зберігається
+        for index, queued in enumerate(self.queue):
+            if queued is old:
+                self.queue[index] = new
+                return
+
+    def simulate_batch(self, sectors, is_write=None):
+        """
+        Обчислює затримки пакета запитів векторно (без даних і кешу).
+        Черга спершу обробляється, щоб зберегти порядок FIFO.
+
+        Returns:
+            tuple: (масив затримок, кінцева позиція головки)
+        """
+        self.drain()
+        return self.hdd.simulate_batch(sectors, is_write)
+
+
+class TrackQueue:
+    """
+    Черга запитів, впорядкована за доріжками: словник доріжка -> запити
+    (відсортовані за сектором) та відсортований масив непорожніх доріжок.
+    Пошук найближчої доріжки в напрямку руху - бінарний, O(log n).
+    """
+
+    def __init__(self):
+        self.buckets = {}
+        self.tracks = []
+        self.size = 0
+
+    def add(self, request, track):
+        bucket = self.buckets.get(track)
+        if bucket is None:
+            bucket = []
+            self.buckets[track] = bucket
+            insort(self.tracks, track)
+        insort(bucket, request, key=_request_sector)
+        self.size += 1
+
+    def peek(self, track, lowest=True):
+        """Запит, який вилучить pop(track, lowest)"""
+        bucket = self.buckets[track]
+        return bucket[self._edge_index(bucket, lowest)]
+
+    def pop(self, track, lowest=True):
+        """Вилучає запит з доріжки: з найменшим або найбільшим номером сектора"""
+        bucket = self.buckets[track]
+        request = bucket.pop(self._edge_index(bucket, lowest))
+        if not bucket:
+            del self.buckets[track]
+            del self.tracks[bisect_left(self.tracks, track)]
+        self.size -= 1
+        return request
+
+    @staticmethod
+    def _edge_index(bucket, lowest):
+        # Запити до одного сектора лежать у порядку подання і в обох напрямках
+        # обслуговуються саме так: при русі вниз береться найбільший сектор,
+        # але найраніший запит до нього (інакше читання після запису
+        # повернуло б старі дані, а з двох записів на диску лишився б перший)
+        if lowest:
+            return 0
+        return bisect_left(bucket, bucket[-1].sector, key=_request_sector)
+
+    def first(self, track, sector):
+        """Найраніше поданий запит у черзі до сектора на доріжці"""
+        bucket = self.buckets[track]
+        return bucket[bisect_left(bucket, sector, key=_request_sector)]
+
+    def remove(self, request, track):
+        """Вилучає конкретний запит з доріжки"""
+        bucket = self.buckets[track]
+        index = bisect_left(bucket, request.sector, key=_request_sector)
+        while bucket[index] is not request:
+            index += 1
+        del bucket[index]
+        if not bucket:
+            del self.buckets[track]
+            del self.tracks[bisect_left(self.tracks, track)]
+        self.size -= 1
+        return request
+
+    def track_at_or_above(self, track):
+        """Найближча непорожня доріжка >= track або None"""
+        index = bisect_left(self.tracks, track)
+        return self.tracks[index] if index < len(self.tracks) else None
+
+    def track_above(self, track):
+        """Найближча непорожня доріжка > track або None"""
+        index = bisect_right(self.tracks, track)
+        return self.tracks[index] if index < len(self.tracks) else None
+
+    def track_at_or_below(self, track):
+        """Найближча непорожня доріжка <= track або None"""
+        index = bisect_right(self.tracks, track) - 1
+        return self.tracks[index] if index >= 0 else None
+
+    def track_below(self, track):
+        """Найближча непорожня доріжка < track або None"""
+        index = bisect_left(self.tracks, track) - 1
+        return self.tracks[index] if index >= 0 else None
+
+    def nearest_track(self, track):
+        """Найближча до track непорожня доріжка в будь-якому напрямку"""
+        above = self.track_at_or_above(track)
+        below = self.track_at_or_below(track)
+        if above is None:
+            return below
+        if below is None:
+            return above
+        return above if above - track < track - below else below
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for track in self.tracks:
+            yield from self.buckets[track]
+
+
+def _request_sector(request):
+    return request.sector
+
+
+class LOOKScheduler(Scheduler):
+    def __init__(self, hdd, max_same_track_requests=3, max_queue_depth=None, overflow='block', max_transfer=1):
+        super().__init__(hdd, max_queue_depth, overflow, max_transfer)
         self.max_same_track_requests = max_same_track_requests
-        self.queue = []
+        self.queue = TrackQueue()
         self.direction = Direction.UP
 
-    def add_request(self, sector, is_write=False, data=None):
-        request = DiskRequest(sector=sector, is_write=is_write, data=data)
+        # Скільки запитів поспіль обслуговано на поточній доріжці
+        self.same_track_count = 0
+        self.last_track = None
 
-        # Додаємо запит та сортуємо чергу
-        self.queue.append(request)
-        self.queue.sort(key=lambda x: x.sector)
+    def _enqueue(self, request):
+        self.queue.add(request, self.hdd.track_of(request.sector))
 
-        # Знаходимо та обробляємо наступний запит
-        next_request = self._find_next_request()
-        if next_request:
-            self.queue.remove(next_request)
-            return self._process_request(next_request)
-        return None
+    def _pop_next(self):
+        track = self._find_next_track()
+        if track is None:
+            return None
+        self._count_track(track)
+        return self.queue.pop(track, lowest=self.direction == Direction.UP)
 
-    def _find_next_request(self):
+    def _count_track(self, track):
+        if track == self.last_track:
+            self.same_track_count += 1
+        else:
+            self.last_track = track
+            self.same_track_count = 1
+
+    def _find_next_track(self):
         if not self.queue:
             return None
 
         current_track = self.hdd.rw_head_position
-        same_track_count = 0
+        # Після max_same_track_requests запитів поспіль доріжку пропускаємо,
+        # щоб потік запитів до однієї доріжки не блокував решту черги
+        skip_current = (self.last_track == current_track and
+                        self.same_track_count >= self.max_same_track_requests)
 
-        if self.direction == Direction.UP:
-            for request in self.queue:
-                request_track = request.sector // self.hdd.sectors_per_track
-                if request_track >= current_track:
-                    if request_track == current_track:
-                        same_track_count += 1
-                        if same_track_count > self.max_same_track_requests:
-                            continue
-                    return request
+        for _ in range(2):
+            if self.direction == Direction.UP:
+                if skip_current:
+                    track = self.queue.track_above(current_track)
+                else:
+                    track = self.queue.track_at_or_above(current_track)
+                if track is not None:
+                    return track
+                self.direction = Direction.DOWN
+            else:
+                if skip_current:
+                    track = self.queue.track_below(current_track)
+                else:
+                    track = self.queue.track_at_or_below(current_track)
+                if track is not None:
+                    return track
+                self.direction = Direction.UP
 
-            self.direction = Direction.DOWN
-            return self._find_next_request()
+        # Запити залишилися лише на поточній доріжці
+        return current_track
 
-        else:
-            for request in reversed(self.queue):
-                request_track = request.sector // self.hdd.sectors_per_track
-                if request_track <= current_track:
-                    if request_track == current_track:
-                        same_track_count += 1
-                        if same_track_count > self.max_same_track_requests:
-                            continue
-                    return request
-
-            self.direction = Direction.UP
-            return self._find_next_request()
 
-    def _process_request(self, request):
-        try:
-            if request.is_write and request.data is not None:
-                delay = self.hdd.write_sector(request.sector, request.data)
-                return delay
+class NLOOKScheduler(Scheduler):
+    def __init__(self, hdd, max_track_span=100, max_queue_depth=None, overflow='block', max_transfer=1):
+        super().__init__(hdd, max_queue_depth, overflow, max_transfer)
+        self.max_track_span = max_track_span
+        self.queue = TrackQueue()
+        self.direction = Direction.UP
+
+    def _enqueue(self, request):
+        self.queue.add(request, self.hdd.track_of(request.sector))
+
+    def _pop_next(self):
+        track = self._find_next_track()
+        if track is None:
+            return None
+        return self.queue.pop(track, lowest=self.direction == Direction.UP)
+
+    def _find_next_track(self):
+        if not self.queue:
+            return None
+
+        # rw_head_position вже зберігає номер доріжки
+        current_track = self.hdd.rw_head_position
+
+        # Шукаємо в межах вікна у поточному напрямку, потім у зворотному
+        for _ in range(2):
+            if self.direction == Direction.UP:
+                track = self.queue.track_at_or_above(current_track)
+                if track is not None and track <= current_track + self.max_track_span:
+                    return track
+                self.direction = Direction.DOWN
             else:
-                data, delay = self.hdd.read_sector(request.sector)
-                return (data, delay)
-        except Exception as e:
-            print(f"Помилка при обробці запиту: {e}")
+                track = self.queue.track_at_or_below(current_track)
+                if track is not None and track >= current_track - self.max_track_span:
+                    return track
+                self.direction = Direction.UP
+
+        # У вікні немає запитів - переходимо до найближчого
+        return self.queue.nearest_track(current_track)
+
+
+class SATFScheduler(Scheduler):
+    """
+    Shortest Access Time First: обирає запит з найменшою сумою часу
+    переведення головки та очікування обертання (з урахуванням кута
+    пластини при rotation_model='exact').
+
+    Кандидати переглядаються від поточної доріжки назовні: щойно час
+    переведення на наступну доріжку перевищує найкращу знайдену затримку,
+    пошук зупиняється. На кожній доріжці запити впорядковані за сектором,
+    тобто за кутом, тож найближчий за обертанням знаходиться бінарним
+    пошуком. Для далеких доріжок, де час переведення вже максимальний,
+    усі запити досягаються одночасно, і найкращий знаходиться у
+    відсортованому за кутом індексі всієї черги.
+    """
+
+    def __init__(self, hdd, max_queue_depth=None, overflow='block', max_transfer=1):
+        super().__init__(hdd, max_queue_depth, overflow, max_transfer)
+        self.queue = TrackQueue()
+        # Кутовий індекс: відсортовані (кут, порядковий номер, доріжка, запит)
+        self.angles = []
+        self._angle_keys = {}   # id(запиту) -> ключ у кутовому індексі
+        self._sequence = itertools.count()
+
+    def _enqueue(self, request):
+        track = self.hdd.track_of(request.sector)
+        self.queue.add(request, track)
+        entry = (self.hdd.angle_of(request.sector), next(self._sequence), track, request)
+        insort(self.angles, entry)
+        self._angle_keys[id(request)] = entry[:2]
+
+    def _pop_next(self):
+        if not self.queue:
             return None
 
+        hdd = self.hdd
+        head = hdd.rw_head_position
+        max_seek = float(hdd.max_reach_delay)
+        best, best_cost, best_track = None, float('inf'), None
 
-class NLOOKScheduler:
-    def __init__(self, hdd, max_track_span=100):
-        self.hdd = hdd
-        self.max_track_span = max_track_span
-        self.queue = []
-        self.direction = Direction.UP
+        # Доріжки в порядку зростання відстані від головки
+        below = self.queue.track_at_or_below(head)
+        above = self.queue.track_above(head)
+        far = False
+        while below is not None or above is not None:
+            if above is None or (below is not None and head - below <= above - head):
+                track, below = below, self.queue.track_below(below)
+            else:
+                track, above = above, self.queue.track_above(above)
 
-    def add_request(self, sector, is_write=False, data=None):
-        request = DiskRequest(sector=sector, is_write=is_write, data=data)
-        self.queue.append(request)
-        self.queue.sort(key=lambda x: x.sector)
+            seek = hdd.seek_time(abs(track - head))
+            if seek + hdd.rw_delay >= best_cost:
+                break
+            if seek >= max_seek:
+                far = True
+                break
+            for request in self._rotational_candidates(track, seek):
+                cost = hdd.access_time(request.sector, request.count)
+                if cost < best_cost:
+                    best, best_cost, best_track = request, cost, track
 
-        next_request = self._find_next_request()
-        if next_request:
-            self.queue.remove(next_request)
-            return self._process_request(next_request)
+        if far and max_seek + hdd.rw_delay < best_cost:
+            entry = self._nearest_far_request(head, max_seek)
+            if entry is not None:
+                track, request = entry
+                cost = hdd.access_time(request.sector, request.count)
+                if cost < best_cost:
+                    best, best_cost, best_track = request, cost, track
+
+        # Запити до одного сектора виконуються в порядку подання
+        best = self.queue.first(best_track, best.sector)
+        self._remove(best)
+        return best
+
+    def _remove(self, request):
+        self.queue.remove(request, self.hdd.track_of(request.sector))
+        del self.angles[bisect_left(self.angles, self._angle_keys.pop(id(request)))]
+
+    def __setstate__(self, state):
+        # Після відновлення зі знімка id запитів інші - ключі індексу перебудовуються
+        self.__dict__.update(state)
+        self._angle_keys = {id(entry[3]): entry[:2] for entry in self.angles}
+
+    def _rotational_candidates(self, track, seek):
+        """Запити доріжки, найближчі за обертанням до кута після переведення головки"""
+        bucket = self.queue.buckets[track]
+        if len(bucket) <= 2 or self.hdd.rotation_model != 'exact':
+            return bucket
+        position = self.hdd.rotational_position(self.hdd.clock + seek)
+        index = bisect_left(bucket, position, key=self._request_angle)
+        # Сусіди з обох боків покривають похибку округлення кута
+        return [bucket[(index - 1) % len(bucket)], bucket[index % len(bucket)]]
+
+    def _request_angle(self, request):
+        return self.hdd.angle_of(request.sector)
+
+    def _nearest_far_request(self, head, max_seek):
+        """
+        (доріжка, запит) першого за обертанням запиту серед доріжок, час
+        переведення до яких максимальний (ближчі доріжки вже переглянуто)
+        """
+        hdd = self.hdd
+        position = hdd.rotational_position(hdd.clock + max_seek) if hdd.rotation_model == 'exact' else 0.0
+        start = bisect_left(self.angles, (position,))
+        size = len(self.angles)
+        for offset in range(size):
+            _, _, track, request = self.angles[(start + offset) % size]
+            if hdd.seek_time(abs(track - head)) >= max_seek:
+                return track, request
         return None
 
-    def _find_next_request(self):
+
+class DeadlineScheduler(LOOKScheduler):
+    """
+    Ліфтовий порядок LOOK з кінцевими термінами та справедливістю між процесами.
+
+    Кожен запит отримує термін: час подання (за годинником диска) плюс
+    read_deadline або write_deadline. Якщо термін найстарішого запиту вже
+    минув, він обслуговується поза ліфтовим порядком, а наступні
+    fifo_batch - 1 запитів ліфт обслуговує від нового положення головки
+    без перевірки термінів (інакше при глибокій черзі, де прострочені всі
+    запити, порядок вироджувався б у FIFO). Поза цим обирається запит
+    ліфта.
+
+    Якщо процес обраного запиту вже отримав більше часу диска, ніж
+    найменш обслужений активний процес, понад fairness_quantum, то
+    обслуговується найстаріший запит цього процесу - так послідовне
+    сканування одного процесу не затримує запити решти.
+
+    Терміни та черги процесів зберігаються в купах з лінивим вилученням,
+    тож перевірка терміну й пошук найменш обслуженого процесу - O(log n).
+    """
+
+    def __init__(self, hdd, read_deadline=100.0, write_deadline=500.0, fairness_quantum=20.0, fifo_batch=16,
+                 max_same_track_requests=3, max_queue_depth=None, overflow='block', max_transfer=1):
+        """
+        Args:
+            hdd: Диск
+            read_deadline: Допустиме очікування читання (мс)
+            write_deadline: Допустиме очікування запису (мс)
+            fairness_quantum: На скільки мс часу диска процес може випередити
+                найменш обслужений активний процес
+            fifo_batch: Скільки запитів обслуговується після запиту з простроченим
+                терміном до наступної перевірки термінів
+        """
+        super().__init__(hdd, max_same_track_requests, max_queue_depth, overflow, max_transfer)
+        self.read_deadline = read_deadline
+        self.write_deadline = write_deadline
+        self.fairness_quantum = fairness_quantum
+        self.fifo_batch = fifo_batch
+        self._batch_left = 0
+
+        self._sequence = itertools.count()
+        self._queued = set()        # id запитів, що зараз у черзі
+        self._deadlines = []        # купа (термін, порядковий номер, запит)
+        self._process_queues = {}   # pid -> купа (термін, порядковий номер, запит)
+        self._active = {}           # pid -> кількість запитів у черзі
+        self._fairness = []         # купа (отриманий час диска, порядковий номер, pid)
+        self.service = {}           # pid -> отриманий час диска (мс)
+        self.virtual_time = 0.0     # час диска найменш обслуженого активного процесу
+
+        # Статистика
+        self.deadline_dispatches = 0    # запити, обслуговані поза порядком через прострочений термін
+        self.fairness_dispatches = 0    # запити, обслуговані поза порядком заради справедливості
+        self.deadline_misses = 0        # запити, завершені після свого терміну
+
+    def deadline_of(self, request):
+        """Кінцевий термін запиту (мс за годинником диска)"""
+        return request.submit_time + (self.write_deadline if request.is_write else self.read_deadline)
+
+    def _enqueue(self, request):
+        super()._enqueue(request)
+        entry = (self.deadline_of(request), next(self._sequence), request)
+        self._queued.add(id(request))
+        heapq.heappush(self._deadlines, entry)
+
+        pid = request.pid
+        if pid not in self._active:
+            # Процес, що повертається після простою, не отримує накопиченого запасу
+            self._active[pid] = 0
+            self.service[pid] = max(self.service.get(pid, 0.0), self.virtual_time)
+            heapq.heappush(self._fairness, (self.service[pid], next(self._sequence), pid))
+        self._active[pid] += 1
+        heapq.heappush(self._process_queues.setdefault(pid, []), entry)
+
+    def _pop_next(self):
         if not self.queue:
             return None
 
-        current_track = self.hdd.rw_head_position // self.hdd.sectors_per_track
-        if self.direction == Direction.UP:
-            for request in self.queue:
-                request_track = request.sector // self.hdd.sectors_per_track
-                if request_track >= current_track and request_track <= current_track + self.max_track_span:
-                    return request
-            self.direction = Direction.DOWN
-        elif self.direction == Direction.DOWN:
-            for request in reversed(self.queue):
-                request_track = request.sector // self.hdd.sectors_per_track
-                if request_track <= current_track and request_track >= current_track - self.max_track_span:
-                    return request
-            self.direction = Direction.UP
+        request = None
+        if self._batch_left:
+            self._batch_left -= 1
+        else:
+            request = self._expired(self.hdd.clock)
+        if request is not None:
+            self.deadline_dispatches += 1
+            self._batch_left = self.fifo_batch - 1
+        else:
+            track = self._find_next_track()
+            request = self.queue.peek(track, lowest=self.direction == Direction.UP)
+
+        # При перевантаженні прострочені всі запити, тож справедливість
+        # перевіряється і для запиту з простроченим терміном
+        least = self._least_served()
+        if least != request.pid and self.service[request.pid] - self.service[least] > self.fairness_quantum:
+            request = self._oldest(least)
+            self.fairness_dispatches += 1
+
+        # Раніше поданий запит до того ж сектора не обганяється
+        track = self.hdd.track_of(request.sector)
+        request = self.queue.first(track, request.sector)
+        self._count_track(track)
+        self._remove(request)
+        return request
+
+    def _remove(self, request):
+        super()._remove(request)
+        self._queued.discard(id(request))
+        pid = request.pid
+        self._active[pid] -= 1
+        if not self._active[pid]:
+            del self._active[pid]
+            del self._process_queues[pid]
+
+    def __setstate__(self, state):
+        # Після відновлення зі знімка id запитів інші
+        self.__dict__.update(state)
+        self._queued = {id(request) for request in self.queue}
+
+    def _expired(self, now):
+        """Запит з найранішим терміном, якщо цей термін уже минув"""
+        heap = self._deadlines
+        while heap and id(heap[0][2]) not in self._queued:
+            heapq.heappop(heap)
+        if heap and heap[0][0] <= now:
+            return heap[0][2]
         return None
 
+    def _least_served(self):
+        """Активний процес з найменшим отриманим часом диска"""
+        heap = self._fairness
+        while heap:
+            service, _, pid = heap[0]
+            if pid in self._active and self.service[pid] == service:
+                self.virtual_time = max(self.virtual_time, service)
+                return pid
+            heapq.heappop(heap)
+        return None
+
+    def _oldest(self, pid):
+        """Запит процесу з найранішим терміном"""
+        heap = self._process_queues[pid]
+        while id(heap[0][2]) not in self._queued:
+            heapq.heappop(heap)
+        return heap[0][2]
+
     def _process_request(self, request):
-        try:
-            if request.is_write and request.data is not None:
-                delay = self.hdd.write_sector(request.sector, request.data)
-                return delay
-            else:
-                data, delay = self.hdd.read_sector(request.sector)
-                return (data, delay)
-        except Exception as e:
-            print(f"Помилка при обробці запиту: {e}")
-            return None
+        result = super()._process_request(request)
+        if result is None:
+            return result
+
+        delay = result if request.is_write else result[1]
+        finish = self.hdd.clock
+        for part in request.parts():
+            # Час злитої операції ділиться між процесами пропорційно секторам
+            pid = part.pid
+            self.service[pid] = self.service.get(pid, 0.0) + delay * part.count / request.count
+            if pid in self._active:
+                heapq.heappush(self._fairness, (self.service[pid], next(self._sequence), pid))
+            if finish > self.deadline_of(part):
+                self.deadline_misses += 1
+        return result
 
+    def get_statistics(self) -> dict:
+        """Повертає статистику термінів і справедливості"""
+        return {
+            'deadline_dispatches': self.deadline_dispatches,
+            'fairness_dispatches': self.fairness_dispatches,
+            'deadline_misses': self.deadline_misses,
+            'service': dict(self.service),
+        }
@@ -0,0 +1,157 @@
+"""
+asyncio-інтерфейс до HDDController.
+
+Клієнтські корутини подають запити одночасно; промахи кешу потрапляють
+у чергу планувальника, а диспетчер обробляє чергу по одному запиту в
+порядку, який обирає планувальник. Кожен клієнт відновлюється, коли його
+власний запит завершено у віртуальному часі диска, тож LOOK/NLOOK бачать
+реальну глибину черги.
+"""
+import asyncio
+import random
+from typing import Tuple
+import numpy as np
+
+from controller import HDDController
+
+
+class AsyncHDDController:
+    def __init__(self, controller: HDDController):
+        if controller.scheduler.max_queue_depth is not None:
+            # Блокування подавача обробляло б запити в обхід диспетчера
+            raise ValueError("Асинхронний контролер потребує планувальника з необмеженою чергою")
+        if controller.write_back:
+            raise ValueError("Асинхронний контролер підтримує лише режим запису write-through")
+
+        self.controller = controller
+        self.now = 0.0      # віртуальний час завершення останньої дискової операції
+        self._waiters = {}  # id(DiskRequest) -> (future, час постановки в чергу)
+        self._dispatcher = None
+
+    async def read_sector(self, sector_num: int, pid=None) -> Tuple[np.ndarray, float, bool]:
+        """
+        Читає дані з вказаного сектора (pid - процес для справедливого планування)
+
+        Returns:
+            Tuple[np.ndarray, float, bool]: (дані сектора, затримка з урахуванням
+            очікування в черзі, чи був це кеш-хіт)
+        """
+        controller = self.controller
+        cached_data = controller.cache.get_sector(sector_num)
+
+        if cached_data is not None:
+            controller.cache_hits += 1
+            total_delay = (controller.syscall_read_delay + controller.cache_access_delay +
+                           controller.user_process_read_delay)
+            controller.total_delay += total_delay
+            if controller.metrics is not None:
+                controller._record_hit(total_delay)
+            return cached_data, total_delay, True
+
+        controller.cache_misses += 1
+        request = controller.scheduler.submit(sector_num, is_write=False, pid=pid)
+        result, queue_wait, service_delay = await self._wait(request)
+        data = result[0]
+        disk_delay = queue_wait + service_delay
+
+        total_delay = (controller.syscall_read_delay + disk_delay +
+                       controller.interrupt_handling_delay + controller.user_process_read_delay)
+        controller.total_delay += total_delay
+        if controller.metrics is not None:
+            controller._record_miss(total_delay, service_delay, queue_wait)
+        controller.cache.add_sector(sector_num, data)
+
+        return data, total_delay, False
+
+    async def write_sector(self, sector_num: int, data: np.ndarray, pid=None) -> Tuple[float, dict]:
+        """
+        Записує дані у вказаний сектор (pid - процес для справедливого планування)
+
+        Returns:
+            Tuple[float, dict]: (загальна затримка, словник з деталями затримок);
+            disk_operation включає очікування в черзі
+        """
+        controller = self.controller
+        delays = {
+            'syscall': controller.syscall_write_delay,
+            'user_process': controller.user_process_write_delay,
+            'disk_operation': 0,
+            'interrupt': controller.interrupt_handling_delay
+        }
+
+        request = controller.scheduler.submit(sector_num, is_write=True, data=data, pid=pid)
+        _, queue_wait, service_delay = await self._wait(request)
+        disk_delay = queue_wait + service_delay
+
+        delays['disk_operation'] = disk_delay
+        total_delay = delays['syscall'] + delays['user_process'] + disk_delay + delays['interrupt']
+        controller.total_delay += total_delay
+        if controller.metrics is not None:
+            controller.metrics.record_request(True, total_delay, syscall=delays['syscall'],
+                                              user_process=delays['user_process'], disk=service_delay,
+                                              interrupt=delays['interrupt'],
+                                              queue_wait=queue_wait, service_time=service_delay)
+        controller.cache.add_sector(sector_num, controller.hdd.peek_sector(sector_num))
+
+        return total_delay, delays
+
+    async def _wait(self, request):
+        """Чекає на завершення запиту; повертає (результат, очікування в черзі, обслуговування)"""
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[id(request)] = (future, self.now)
+        if self._dispatcher is None:
+            self._dispatcher = asyncio.ensure_future(self._dispatch_loop())
+        return await future
+
+    async def _dispatch_loop(self):
+        while True:
+            # Даємо всім готовим клієнтам подати запити до вибору наступного
+            await asyncio.sleep(0)
+
+            request = self.controller.scheduler.dispatch_next()
+            if request is None:
+                break
+
+            if request.result is None:
+                for part in request.parts():
+                    future, _ = self._waiters.pop(id(part))
+                    future.set_exception(ValueError(f"Помилка обробки сектора {part.sector}"))
+                continue
+
+            # Злиті суміжні запити завершуються однією операцією
+            service_delay = request.result if request.is_write else request.result[1]
+            start = self.now
+            self.now = start + service_delay
+            for part in request.parts():
+                future, enqueue_time = self._waiters.pop(id(part))
+                start_wait = max(start, enqueue_time) - enqueue_time
+                future.set_result((part.result, start_wait, service_delay))
+
+        self._dispatcher = None
+
+
+async def _client(controller, sectors, results):
+    for sector in sectors:
+        _, delay, _ = await controller.read_sector(sector)
+        results.append(delay)
+
+
+async def simulate_clients(clients=1000, requests_per_client=10, seed=0):
+    """Моделює одночасну роботу багатьох клієнтів з випадковими читаннями"""
+    controller = AsyncHDDController(HDDController(scheduler_type='LOOK'))
+    total_sectors = controller.controller.hdd.total_sectors
+    rng = random.Random(seed)
+
+    results = []
+    await asyncio.gather(*(
+        _client(controller, [rng.randrange(total_sectors) for _ in range(requests_per_client)], results)
+        for _ in range(clients)
+    ))
+
+    print(f"Виконано запитів: {len(results)}")
+    print(f"Віртуальний час: {controller.now:.2f} мс")
+    print(f"Середня затримка з очікуванням у черзі: {sum(results) / len(results):.2f} мс")
+
+
+if __name__ == "__main__":
+    asyncio.run(simulate_clients())
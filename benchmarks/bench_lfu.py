@@ -0,0 +1,49 @@
+"""
+Бенчмарк сегментованого LFU-кешу: час однієї операції
+при різних розмірах кешу (має залишатися сталим)
+"""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from LFU import LFUCache
+
+
+def bench_lfu(max_total, operations=200_000, seed=0):
+    """
+    Виконує суміш звернень і додавань до кешу з робочою множиною,
+    удвічі більшою за кеш
+
+    Returns:
+        float: Середній час однієї операції (мкс)
+    """
+    rng = np.random.default_rng(seed)
+    sectors = rng.integers(0, max_total * 2, size=operations).tolist()
+
+    cache = LFUCache(max_left=max_total // 4,
+                     max_middle=max_total // 4,
+                     max_total=max_total)
+
+    start = time.perf_counter()
+    for sector in sectors:
+        if cache.get_sector(sector) is None:
+            cache.add_sector(sector, sector)
+    elapsed = time.perf_counter() - start
+
+    return elapsed / operations * 1e6
+
+
+def main():
+    print(f"{'max_total':>10} | {'мкс/операцію':>12}")
+    print("-" * 25)
+    for max_total in (100, 1_000, 10_000, 100_000, 1_000_000):
+        # Операцій має вистачити, щоб кеш заповнився і почалося витіснення
+        operations = max(200_000, max_total * 3)
+        print(f"{max_total:>10} | {bench_lfu(max_total, operations):>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
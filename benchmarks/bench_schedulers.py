@@ -0,0 +1,59 @@
+"""
+Бенчмарк планувальників: вартість одного диспетчеризування
+при сталій глибині черги 10, 1 000 та 100 000 запитів
+"""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hard_drive import HDD
+from access_planners import FIFOScheduler, LOOKScheduler, NLOOKScheduler
+
+SCHEDULERS = {
+    'FIFO': FIFOScheduler,
+    'LOOK': LOOKScheduler,
+    'NLOOK': NLOOKScheduler,
+}
+
+
+def bench_dispatch(scheduler_cls, depth, dispatches=20_000, seed=0):
+    """
+    Заповнює чергу до заданої глибини, після чого на кожен оброблений
+    запит подає новий, тож глибина черги залишається сталою
+
+    Returns:
+        float: Середній час подання та обробки одного запиту (мкс)
+    """
+    hdd = HDD(rpm=7500, sectors_num=500, track_num=10000)
+    scheduler = scheduler_cls(hdd)
+    total_sectors = hdd.total_sectors
+
+    rng = np.random.default_rng(seed)
+    initial = rng.integers(0, total_sectors, size=depth).tolist()
+    incoming = rng.integers(0, total_sectors, size=dispatches).tolist()
+
+    scheduler.submit_many((sector, False, None) for sector in initial)
+
+    start = time.perf_counter()
+    for sector in incoming:
+        scheduler.dispatch_next()
+        scheduler.submit(sector)
+    elapsed = time.perf_counter() - start
+
+    return elapsed / dispatches * 1e6
+
+
+def main():
+    depths = (10, 1_000, 100_000)
+    print(f"{'scheduler':>10} | " + " | ".join(f"{f'depth={d}':>14}" for d in depths))
+    print("-" * (13 + 17 * len(depths)))
+    for name, scheduler_cls in SCHEDULERS.items():
+        timings = [bench_dispatch(scheduler_cls, depth) for depth in depths]
+        print(f"{name:>10} | " + " | ".join(f"{t:>11.2f} мкс" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""
+Набір бенчмарків гарячих шляхів: планувальники, LFU-кеш та запис
+метрик запиту на синтетичних навантаженнях.
+
+Для кожного випадку вимірюється швидкість (запитів/с) та пікова пам'ять
+(tracemalloc). Побудова диска, кешу та списків запитів виконується поза
+вимірюваною ділянкою, тож обидві величини відносяться лише до гарячого
+шляху. Результати можна зберегти як базові (--save-baseline) разом із
+параметрами запуску і порівнювати з ними наступні запуски (--baseline)
+з тими самими параметрами: регресія понад допуск повертає ненульовий
+код виходу. Для деяких випадків задано й абсолютний бюджет (BUDGETS):
+його перевищення - теж регресія, незалежно від базових результатів.
+
+    python benchmarks/run.py --filter LOOK --profile prof/
+    python benchmarks/run.py --baseline benchmarks/baseline.json
+"""
+import argparse
+import cProfile
+import json
+import os
+import sys
+import time
+import tracemalloc
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hard_drive import HDD
+from LFU import LFUCache
+from metrics import MetricsRecorder
+from access_planners import FIFOScheduler, LOOKScheduler, NLOOKScheduler, SATFScheduler, DeadlineScheduler
+from workloads import SequentialPattern, UniformPattern, ZipfPattern, HotspotPattern
+
+SCHEDULERS = {
+    'FIFO': FIFOScheduler,
+    'LOOK': LOOKScheduler,
+    'NLOOK': NLOOKScheduler,
+    'SATF': SATFScheduler,
+    'DEADLINE': DeadlineScheduler,
+}
+LFU_SIZES = (1_000, 10_000, 100_000)
+QUEUE_DEPTH = 32
+
+# Найменша допустима швидкість (запитів/с) незалежно від базових результатів:
+# запис метрик промаху кешу має коштувати менше мікросекунди
+BUDGETS = {
+    'metrics/record_request/miss': 1_000_000,
+}
+
+
+# Синтетичні навантаження з workloads.py: фабрика шаблону за розміром діапазону секторів
+WORKLOADS = {
+    'sequential': lambda universe: SequentialPattern(universe, start=universe // 3),
+    'random': UniformPattern,
+    'zipfian': ZipfPattern,
+    'hotspot': HotspotPattern,
+}
+
+
+# Випадки бенчмарків
+
+def scheduler_case(scheduler_cls, sectors):
+    """Подає запити пакетами глибини QUEUE_DEPTH і обробляє чергу"""
+    def setup():
+        hdd = HDD(rpm=7500, sectors_num=500, track_num=10000)
+        return scheduler_cls(hdd), sectors.tolist()
+
+    def run(state):
+        scheduler, batch = state
+        for start in range(0, len(batch), QUEUE_DEPTH):
+            scheduler.submit_many((sector, False, None) for sector in batch[start:start + QUEUE_DEPTH])
+            scheduler.drain()
+    return setup, run
+
+
+def lfu_case(size, sectors):
+    """Звернення до кешу з додаванням сектора при промаху"""
+    def setup():
+        return LFUCache(max_left=size // 4, max_middle=size // 4, max_total=size), sectors.tolist()
+
+    def run(state):
+        cache, batch = state
+        for sector in batch:
+            if cache.get_sector(sector) is None:
+                cache.add_sector(sector, sector)
+    return setup, run
+
+
+def metrics_case(is_hit, delays):
+    """Запис метрик запитів так, як це робить контролер для влучання або промаху кешу"""
+    def setup():
+        return MetricsRecorder(), delays.tolist()
+
+    def run(state):
+        metrics, batch = state
+        record = metrics.record_request
+        if is_hit:
+            for delay in batch:
+                record(False, delay, syscall=0.15, cache=0.01, user_process=7.0)
+        else:
+            for delay in batch:
+                record(False, delay, syscall=0.15, disk=delay, interrupt=0.05, user_process=7.0,
+                       queue_wait=0.0, service_time=delay)
+        metrics.summary()
+    return setup, run
+
+
+def build_cases(requests, seed):
+    cases = {}
+    delays = np.random.default_rng(seed).exponential(5.0, requests)
+    for kind in ('miss', 'hit'):
+        cases[f'metrics/record_request/{kind}'] = (*metrics_case(kind == 'hit', delays), requests)
+
+    disk_sectors = 500 * 10000
+    for workload_name, workload in WORKLOADS.items():
+        sectors = workload(disk_sectors).sample(requests, np.random.default_rng(seed))
+        for name, scheduler_cls in SCHEDULERS.items():
+            cases[f'scheduler/{name}/{workload_name}'] = (*scheduler_case(scheduler_cls, sectors), requests)
+
+        for size in LFU_SIZES:
+            # Множина секторів удесятеро більша за кеш, тож витіснення постійне
+            lfu_requests = max(requests, size * 3)
+            sectors = workload(size * 10).sample(lfu_requests, np.random.default_rng(seed))
+            cases[f'lfu/{size}/{workload_name}'] = (*lfu_case(size, sectors), lfu_requests)
+    return cases
+
+
+def measure(setup, run, requests, repeat=3, profile_path=None, tracemalloc_path=None):
+    """
+    Вимірює швидкість (найкращий з repeat прогонів без трасування пам'яті)
+    та пікову пам'ять (прогін під tracemalloc). Кожен прогін отримує
+    свіжий стан від setup, створений поза вимірюваною ділянкою
+
+    Returns:
+        dict: requests_per_second, peak_memory_kb
+    """
+    profiler = cProfile.Profile() if profile_path else None
+    elapsed = None
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        if profiler:
+            profiler.enable()
+        run(state)
+        if profiler:
+            profiler.disable()
+        duration = time.perf_counter() - start
+        elapsed = duration if elapsed is None else min(elapsed, duration)
+        del state
+    if profiler:
+        profiler.dump_stats(profile_path)
+
+    state = setup()
+    tracemalloc.start()
+    run(state)
+    _, peak = tracemalloc.get_traced_memory()
+    if tracemalloc_path:
+        snapshot = tracemalloc.take_snapshot()
+        with open(tracemalloc_path, 'w', encoding='utf-8') as f:
+            for stat in snapshot.statistics('lineno')[:25]:
+                f.write(f"{stat}\n")
+    tracemalloc.stop()
+
+    return {
+        'requests_per_second': requests / elapsed if elapsed > 0 else 0.0,
+        'peak_memory_kb': peak / 1024,
+    }
+
+
+def check_budgets(results):
+    """
+    Returns:
+        list: Описи випадків, повільніших за абсолютний бюджет
+    """
+    return [f"{name}: швидкість {results[name]['requests_per_second']:,.0f} "
+            f"нижча за бюджет {budget:,.0f} запитів/с"
+            for name, budget in BUDGETS.items()
+            if name in results and results[name]['requests_per_second'] < budget]
+
+
+def compare(results, baseline, tolerance):
+    """
+    Порівнює результати з базовими
+
+    Returns:
+        list: Описи регресій (падіння швидкості або зростання пам'яті понад допуск)
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result['requests_per_second'] < base['requests_per_second'] * (1 - tolerance):
+            regressions.append(f"{name}: швидкість {result['requests_per_second']:,.0f} "
+                               f"проти {base['requests_per_second']:,.0f} запитів/с")
+        if result['peak_memory_kb'] > base['peak_memory_kb'] * (1 + tolerance):
+            regressions.append(f"{name}: пам'ять {result['peak_memory_kb']:,.0f} "
+                               f"проти {base['peak_memory_kb']:,.0f} КБ")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарки планувальників і LFU-кешу")
+    parser.add_argument('--filter', default=None, help="Запускати лише випадки, що містять підрядок")
+    parser.add_argument('--requests', type=int, default=50_000, help="Запитів на випадок")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--profile', default=None, help="Каталог для файлів cProfile")
+    parser.add_argument('--tracemalloc', default=None, help="Каталог для звітів tracemalloc")
+    parser.add_argument('--save-baseline', default=None, help="Зберегти результати як базові (JSON)")
+    parser.add_argument('--baseline', default=None, help="Порівняти з базовими результатами (JSON)")
+    parser.add_argument('--tolerance', type=float, default=0.1, help="Допустиме відхилення (частка)")
+    parser.add_argument('--repeat', type=int, default=3, help="Прогонів на випадок (береться найшвидший)")
+    args = parser.parse_args(argv)
+    # Параметри, від яких залежать результати: порівнювати можна лише запуски з однаковими
+    params = {'requests': args.requests, 'seed': args.seed, 'queue_depth': QUEUE_DEPTH}
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('params') != params:
+            print(f"Базові результати отримано з параметрами {baseline.get('params')}, "
+                  f"а поточний запуск - {params}; порівняння неможливе")
+            return 2
+
+    for directory in (args.profile, args.tracemalloc):
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    results = {}
+    print(f"{'випадок':<32} | {'запитів/с':>12} | {'пам`ять, КБ':>12}")
+    print("-" * 62)
+    for name, (setup, run, requests) in build_cases(args.requests, args.seed).items():
+        if args.filter and args.filter not in name:
+            continue
+        file_name = name.replace('/', '_')
+        result = measure(
+            setup, run, requests, repeat=args.repeat,
+            profile_path=os.path.join(args.profile, f'{file_name}.prof') if args.profile else None,
+            tracemalloc_path=os.path.join(args.tracemalloc, f'{file_name}.txt') if args.tracemalloc else None,
+        )
+        results[name] = result
+        print(f"{name:<32} | {result['requests_per_second']:>12,.0f} | {result['peak_memory_kb']:>12,.0f}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump({'params': params, 'results': results}, f, indent=2)
+
+    regressions = check_budgets(results)
+    if baseline is not None:
+        regressions += compare(results, baseline['results'], args.tolerance)
+    if regressions:
+        print("\nРЕГРЕСІЇ:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    if baseline is not None:
+        print("\nРегресій не виявлено")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
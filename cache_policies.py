@@ -0,0 +1,336 @@
+from collections import OrderedDict
+
+
+class CachePolicy:
+    """
+    Базовий інтерфейс політики кешування секторів.
+    Підкласи реалізують _lookup/_insert, а лічильники влучань,
+    промахів та витіснень ведуться тут.
+    """
+
+    def __init__(self, max_total):
+        self.max_total = max_total
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Зовнішній обробник витіснення on_evict(sector, data), напр. для брудних секторів
+        self.on_evict = None
+
+    def get_sector(self, sector_number):
+        """
+        Повертає дані сектора якщо він є в кеші,
+        інакше повертає None
+        """
+        data = self._lookup(sector_number)
+        if data is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return data
+
+    def add_sector(self, sector_number, data):
+        """Додає сектор в кеш або оновлює його дані"""
+        if self.max_total <= 0:
+            # Кеш нульового розміру нічого не приймає: сектор одразу витісняється
+            self._on_evict(sector_number, data)
+            return
+        self._insert(sector_number, data)
+
+    def __contains__(self, sector_number):
+        """Чи є сектор у кеші (без впливу на статистику та порядок витіснення)"""
+        raise NotImplementedError
+
+    def _lookup(self, sector_number):
+        raise NotImplementedError
+
+    def _insert(self, sector_number, data):
+        raise NotImplementedError
+
+    def _on_evict(self, sector_number, data):
+        """Викликається для кожного витісненого з кешу сектора"""
+        self.evictions += 1
+        if self.on_evict is not None:
+            self.on_evict(sector_number, data)
+
+    def get_statistics(self) -> dict:
+        """Повертає статистику роботи кешу"""
+        total = self.hits + self.misses
+        return {
+            'policy': type(self).__name__,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': (self.hits / total * 100) if total > 0 else 0,
+        }
+
+
+class LRUCache(CachePolicy):
+    """Витіснення сектора, до якого найдовше не зверталися"""
+
+    def __init__(self, max_total):
+        super().__init__(max_total)
+        self.entries = OrderedDict()
+
+    def _lookup(self, sector_number):
+        data = self.entries.get(sector_number)
+        if data is not None:
+            self.entries.move_to_end(sector_number)
+        return data
+
+    def _insert(self, sector_number, data):
+        if sector_number in self.entries:
+            self.entries.move_to_end(sector_number)
+        elif len(self.entries) >= self.max_total:
+            self._on_evict(*self.entries.popitem(last=False))
+        self.entries[sector_number] = data
+
+    def __contains__(self, sector_number):
+        return sector_number in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class ClockCache(CachePolicy):
+    """Апроксимація LRU з кільцевим буфером та бітами звернення"""
+
+    def __init__(self, max_total):
+        super().__init__(max_total)
+        self.sectors = []
+        self.data = []
+        self.referenced = bytearray()
+        self.slots = {}     # номер сектора -> індекс слота
+        self.hand = 0
+
+    def _lookup(self, sector_number):
+        slot = self.slots.get(sector_number)
+        if slot is None:
+            return None
+        self.referenced[slot] = 1
+        return self.data[slot]
+
+    def _insert(self, sector_number, data):
+        slot = self.slots.get(sector_number)
+        if slot is not None:
+            self.data[slot] = data
+            self.referenced[slot] = 1
+            return
+
+        # Вільні слоти заповнюємо без витіснення
+        if len(self.sectors) < self.max_total:
+            self.slots[sector_number] = len(self.sectors)
+            self.sectors.append(sector_number)
+            self.data.append(data)
+            self.referenced.append(0)
+            return
+
+        # Стрілка знімає біти звернення, доки не знайде жертву
+        while self.referenced[self.hand]:
+            self.referenced[self.hand] = 0
+            self.hand = (self.hand + 1) % self.max_total
+
+        slot = self.hand
+        del self.slots[self.sectors[slot]]
+        self._on_evict(self.sectors[slot], self.data[slot])
+
+        self.sectors[slot] = sector_number
+        self.data[slot] = data
+        self.referenced[slot] = 0
+        self.slots[sector_number] = slot
+        self.hand = (self.hand + 1) % self.max_total
+
+    def __contains__(self, sector_number):
+        return sector_number in self.slots
+
+    def __len__(self):
+        return len(self.slots)
+
+
+class TwoQCache(CachePolicy):
+    """
+    Політика 2Q: нові сектори потрапляють у FIFO-чергу A1in, витіснені з неї
+    запам'ятовуються в примарній черзі A1out, а повторне звернення до сектора
+    з A1out переносить його в основну LRU-чергу Am.
+    """
+
+    def __init__(self, max_total, max_in, max_out):
+        super().__init__(max_total)
+        self.max_in = max_in
+        self.max_out = max_out
+        self.a1_in = OrderedDict()
+        self.a1_out = OrderedDict()     # лише номери секторів
+        self.am = OrderedDict()
+
+    def _lookup(self, sector_number):
+        data = self.am.get(sector_number)
+        if data is not None:
+            self.am.move_to_end(sector_number)
+            return data
+        return self.a1_in.get(sector_number)
+
+    def _insert(self, sector_number, data):
+        if sector_number in self.am:
+            self.am[sector_number] = data
+            self.am.move_to_end(sector_number)
+            return
+        if sector_number in self.a1_in:
+            self.a1_in[sector_number] = data
+            return
+
+        if len(self.a1_in) + len(self.am) >= self.max_total:
+            self._reclaim()
+
+        if sector_number in self.a1_out:
+            del self.a1_out[sector_number]
+            self.am[sector_number] = data
+        else:
+            self.a1_in[sector_number] = data
+
+    def _reclaim(self):
+        """Звільняє місце для нового сектора"""
+        if len(self.a1_in) > self.max_in or not self.am:
+            sector_number, data = self.a1_in.popitem(last=False)
+            self.a1_out[sector_number] = None
+            if len(self.a1_out) > self.max_out:
+                self.a1_out.popitem(last=False)
+        else:
+            sector_number, data = self.am.popitem(last=False)
+        self._on_evict(sector_number, data)
+
+    def __contains__(self, sector_number):
+        return sector_number in self.am or sector_number in self.a1_in
+
+    def __len__(self):
+        return len(self.a1_in) + len(self.am)
+
+
+class ARCCache(CachePolicy):
+    """
+    Адаптивний кеш заміщення (ARC): баланс між списками недавніх (T1) та
+    частих (T2) секторів підлаштовується за влучаннями в примарні списки B1/B2.
+    """
+
+    def __init__(self, max_total):
+        super().__init__(max_total)
+        self.p = 0
+        self.t1 = OrderedDict()
+        self.t2 = OrderedDict()
+        self.b1 = OrderedDict()
+        self.b2 = OrderedDict()
+
+    def _lookup(self, sector_number):
+        if sector_number in self.t1:
+            data = self.t1.pop(sector_number)
+            self.t2[sector_number] = data
+            return data
+        data = self.t2.get(sector_number)
+        if data is not None:
+            self.t2.move_to_end(sector_number)
+        return data
+
+    def _insert(self, sector_number, data):
+        if sector_number in self.t1:
+            del self.t1[sector_number]
+            self.t2[sector_number] = data
+            return
+        if sector_number in self.t2:
+            self.t2[sector_number] = data
+            self.t2.move_to_end(sector_number)
+            return
+
+        c = self.max_total
+        if sector_number in self.b1:
+            self.p = min(c, self.p + max(len(self.b2) // len(self.b1), 1))
+            self._replace(in_b2=False)
+            del self.b1[sector_number]
+            self.t2[sector_number] = data
+            return
+        if sector_number in self.b2:
+            self.p = max(0, self.p - max(len(self.b1) // len(self.b2), 1))
+            self._replace(in_b2=True)
+            del self.b2[sector_number]
+            self.t2[sector_number] = data
+            return
+
+        l1 = len(self.t1) + len(self.b1)
+        l2 = len(self.t2) + len(self.b2)
+        if l1 >= c:
+            if len(self.t1) < c:
+                self.b1.popitem(last=False)
+                self._replace(in_b2=False)
+            else:
+                self._on_evict(*self.t1.popitem(last=False))
+        elif l1 + l2 >= c:
+            if l1 + l2 >= 2 * c:
+                self.b2.popitem(last=False)
+            self._replace(in_b2=False)
+        self.t1[sector_number] = data
+
+    def _replace(self, in_b2):
+        """Витісняє сектор з T1 або T2 у відповідний примарний список"""
+        if not self.t1 and not self.t2:
+            return
+        if self.t1 and (len(self.t1) > self.p or (in_b2 and len(self.t1) == self.p) or not self.t2):
+            sector_number, data = self.t1.popitem(last=False)
+            self.b1[sector_number] = None
+        else:
+            sector_number, data = self.t2.popitem(last=False)
+            self.b2[sector_number] = None
+        self._on_evict(sector_number, data)
+
+    def __contains__(self, sector_number):
+        return sector_number in self.t1 or sector_number in self.t2
+
+    def __len__(self):
+        return len(self.t1) + len(self.t2)
+
+
+class SLRUCache(CachePolicy):
+    """
+    Сегментований LRU: нові сектори потрапляють у пробний сегмент,
+    повторне звернення переносить їх у захищений сегмент.
+    """
+
+    def __init__(self, max_total, max_protected):
+        super().__init__(max_total)
+        self.max_protected = max_protected
+        self.probationary = OrderedDict()
+        self.protected = OrderedDict()
+
+    def _lookup(self, sector_number):
+        data = self.protected.get(sector_number)
+        if data is not None:
+            self.protected.move_to_end(sector_number)
+            return data
+        data = self.probationary.pop(sector_number, None)
+        if data is not None:
+            self._promote(sector_number, data)
+        return data
+
+    def _insert(self, sector_number, data):
+        if sector_number in self.protected:
+            self.protected[sector_number] = data
+            self.protected.move_to_end(sector_number)
+            return
+        if sector_number in self.probationary:
+            del self.probationary[sector_number]
+            self._promote(sector_number, data)
+            return
+
+        if len(self.probationary) + len(self.protected) >= self.max_total:
+            victims = self.probationary if self.probationary else self.protected
+            self._on_evict(*victims.popitem(last=False))
+        self.probationary[sector_number] = data
+
+    def _promote(self, sector_number, data):
+        """Переносить сектор у захищений сегмент, понижуючи найстаріший з нього"""
+        if len(self.protected) >= self.max_protected and self.protected:
+            demoted_sector, demoted_data = self.protected.popitem(last=False)
+            self.probationary[demoted_sector] = demoted_data
+        self.protected[sector_number] = data
+
+    def __contains__(self, sector_number):
+        return sector_number in self.protected or sector_number in self.probationary
+
+    def __len__(self):
+        return len(self.probationary) + len(self.protected)
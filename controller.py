@@ -1,7 +1,14 @@
-from typing import Tuple
+from bisect import bisect_left
+from typing import Iterable, List, Tuple
 from LFU import LFUCache
+from metrics import MetricsRecorder
+from cache_policies import LRUCache, ClockCache, TwoQCache, ARCCache, SLRUCache
 from hard_drive import HDD
-from access_planners import FIFOScheduler, LOOKScheduler, NLOOKScheduler
+from geometry import Geometry
+from access_planners import FIFOScheduler, LOOKScheduler, NLOOKScheduler, SATFScheduler, DeadlineScheduler
+from readahead import ReadAhead
+from raid import DiskArray, ArrayScheduler
+import snapshot
 import numpy as np
 
 
@@ -14,12 +21,29 @@ class HDDController:
                  cache_middle: int = 10,
                  cache_total: int = 20,
                  scheduler_type: str = 'LOOK',
+                 cache_policy: str = 'LFU',
+                 max_queue_depth: int = None,
+                 queue_overflow: str = 'block',
                  syscall_read_delay: float = 0.15,
                  syscall_write_delay: float = 0.15,
                  interrupt_handling_delay: float = 0.05,
                  user_process_read_delay: float = 7.0,
                  user_process_write_delay: float = 7.0,
-                 cache_access_delay: float = 0.01):
+                 cache_access_delay: float = 0.01,
+                 storage: str = 'sparse',
+                 storage_path: str = None,
+                 collect_metrics: bool = True,
+                 readahead: bool = False,
+                 readahead_max_window: int = 64,
+                 write_policy: str = 'through',
+                 dirty_ratio: float = 0.5,
+                 flush_interval: float = None,
+                 raid_level: str = None,
+                 raid_disks: int = 4,
+                 stripe_size: int = 8,
+                 rotation_model: str = 'average',
+                 max_transfer: int = 1,
+                 geometry: Geometry = None):
         """
         Ініціалізує контролер жорсткого диска з усіма затримками
 
@@ -30,27 +54,89 @@ class HDDController:
             cache_left: Розмір лівого сегмента кешу
             cache_middle: Розмір середнього сегмента кешу
             cache_total: Загальний розмір кешу
-            scheduler_type: Тип планувальника ('FIFO' або 'LOOK')
+            scheduler_type: Тип планувальника ('FIFO', 'LOOK', 'NLOOK', 'SATF' або 'DEADLINE' -
+                LOOK з кінцевими термінами запитів і справедливістю між процесами)
+            cache_policy: Політика кешування ('LFU', 'LRU', 'CLOCK', '2Q', 'ARC' або 'SLRU').
+                Для 2Q cache_left задає розмір черги A1in, cache_middle - примарної A1out;
+                для SLRU cache_left задає розмір пробного сегмента
+            max_queue_depth: Максимальна глибина черги планувальника (None - без обмеження)
+            queue_overflow: Поведінка при переповненні черги ('block', 'reject' або 'coalesce')
             syscall_read_delay: Затримка системного виклику читання (мс)
             syscall_write_delay: Затримка системного виклику запису (мс)
             interrupt_handling_delay: Затримка обробки переривання (мс)
             user_process_read_delay: Затримка обробки даних після читання (мс)
             user_process_write_delay: Затримка формування даних для запису (мс)
             cache_access_delay: Затримка доступу до кешу (мс)
+            storage: Тип сховища секторів ('dense', 'sparse' або 'memmap')
+            storage_path: Шлях до образу диска для 'memmap'
+            collect_metrics: Збирати гістограми затримок (MetricsRecorder)
+            readahead: Адаптивне попереднє читання послідовних потоків процесів
+            readahead_max_window: Найбільше вікно попереднього читання (секторів);
+                обмежується половиною кешу, щоб вікно не витісняло запитаний сектор
+            write_policy: 'through' - запис одразу йде на диск;
+                'back' - запис завершується в кеші, а брудні сектори скидаються пакетом
+            dirty_ratio: Частка розміру кешу, при досягненні якої брудні сектори скидаються
+            flush_interval: Найбільший вік брудних даних (мс часу симуляції - суми затримок
+                запитів контролера), після якого вони скидаються периодичним скиданням;
+                None - скидання лише за dirty_ratio, при витісненні та явним викликом flush
+            raid_level: Масив дисків ('JBOD', 'RAID0', 'RAID1' або 'RAID5'); None - один диск.
+                Параметри диска та тип планувальника застосовуються до кожного диска масиву
+                (черги дисків масиву не обмежуються)
+            raid_disks: Кількість дисків масиву
+            stripe_size: Розмір смуги на одному диску (секторів) для RAID-0/5
+            rotation_model: Модель очікування обертання ('average' - пів оберту,
+                'exact' - за кутом пластини у віртуальному часі диска)
+            max_transfer: Найбільша кількість секторів в одній операції після злиття
+                суміжних запитів у черзі планувальника (1 - без злиття)
+            geometry: Геометрія диска з зонами та кривою переведення головки
+                (Geometry); якщо задана, sectors_num і tracks_num ігноруються
         """
         # Ініціалізація компонентів
-        self.hdd = HDD(rpm=rpm, sectors_num=sectors_num, track_num=tracks_num)
-        self.cache = LFUCache(max_left=cache_left,
-                              max_middle=cache_middle,
-                              max_total=cache_total)
+        if raid_level is None:
+            self.hdd = HDD(rpm=rpm, sectors_num=sectors_num, track_num=tracks_num,
+                           storage=storage, storage_path=storage_path, rotation_model=rotation_model,
+                           geometry=geometry)
+        else:
+            self.hdd = DiskArray(raid_level, disks=raid_disks, stripe_size=stripe_size, rpm=rpm,
+                                 sectors_num=sectors_num, track_num=tracks_num,
+                                 storage=storage, storage_path=storage_path,
+                                 rotation_model=rotation_model, geometry=geometry)
+
+        # Вибір політики кешування
+        if cache_policy.upper() == 'LRU':
+            self.cache = LRUCache(max_total=cache_total)
+        elif cache_policy.upper() == 'CLOCK':
+            self.cache = ClockCache(max_total=cache_total)
+        elif cache_policy.upper() == '2Q':
+            self.cache = TwoQCache(max_total=cache_total, max_in=cache_left, max_out=cache_middle)
+        elif cache_policy.upper() == 'ARC':
+            self.cache = ARCCache(max_total=cache_total)
+        elif cache_policy.upper() == 'SLRU':
+            self.cache = SLRUCache(max_total=cache_total, max_protected=cache_total - cache_left)
+        else:
+            self.cache = LFUCache(max_left=cache_left,
+                                  max_middle=cache_middle,
+                                  max_total=cache_total)
 
         # Вибір планувальника
+        queue_options = {'max_queue_depth': max_queue_depth, 'overflow': queue_overflow,
+                         'max_transfer': max_transfer}
         if scheduler_type.upper() == 'FIFO':
-            self.scheduler = FIFOScheduler(self.hdd)
+            scheduler_cls = FIFOScheduler
         elif scheduler_type.upper() == 'LOOK':
-            self.scheduler = LOOKScheduler(self.hdd)
+            scheduler_cls = LOOKScheduler
+        elif scheduler_type.upper() == 'SATF':
+            scheduler_cls = SATFScheduler
+        elif scheduler_type.upper() == 'DEADLINE':
+            scheduler_cls = DeadlineScheduler
+        else:
+            scheduler_cls = NLOOKScheduler
+
+        if raid_level is None:
+            self.scheduler = scheduler_cls(self.hdd, **queue_options)
         else:
-            self.scheduler = NLOOKScheduler(self.hdd)
+            # Кожен диск масиву має власну необмежену чергу; масив обробляє їх паралельно
+            self.scheduler = ArrayScheduler(self.hdd, lambda hdd: scheduler_cls(hdd, max_transfer=max_transfer))
 
         # Затримки
         self.syscall_read_delay = syscall_read_delay
@@ -65,59 +151,197 @@ class HDDController:
         self.cache_misses = 0
         self.total_delay = 0
 
-    def read_sector(self, sector_num: int) -> Tuple[np.ndarray, float, bool]:
+        # Гістограми затримок та розбивка за компонентами
+        self.metrics = MetricsRecorder() if collect_metrics else None
+        self.hdd.metrics = self.metrics
+
+        # Попереднє читання
+        self.readahead = None
+        if readahead:
+            max_window = max(1, min(readahead_max_window, cache_total // 2))
+            self.readahead = ReadAhead(initial_window=min(8, max_window),
+                                       min_window=min(2, max_window),
+                                       max_window=max_window)
+
+        # Відкладений запис (write-back)
+        if write_policy not in ('through', 'back'):
+            raise ValueError(f"Невідома політика запису: {write_policy}")
+        if not 0 < dirty_ratio <= 1:
+            raise ValueError("dirty_ratio має бути в межах (0, 1]")
+        if flush_interval is not None and flush_interval <= 0:
+            raise ValueError("flush_interval має бути додатним")
+        self.write_back = write_policy == 'back'
+        self.dirty = {}     # номер сектора -> дані, ще не записані на диск
+        self.dirty_limit = max(1, int(dirty_ratio * cache_total))
+        self.flush_needed = False
+        self.flush_interval = flush_interval
+        self.dirty_since = 0.0  # час симуляції, коли з'явився найстаріший брудний сектор
+        self.flushes = 0
+        self.flushed_sectors = 0
+        self.coalesced_writes = 0
+        self.flush_delay = 0.0
+        if self.write_back:
+            self.cache.on_evict = self._on_cache_evict
+
+    def read_sector(self, sector_num: int, pid=None) -> Tuple[np.ndarray, float, bool]:
         """
         Читає дані з вказаного сектора
 
         Args:
             sector_num: Абсолютний номер сектора
+            pid: Ідентифікатор процесу (для виявлення потоків попереднього читання
+                та справедливого планування)
 
         Returns:
             Tuple[np.ndarray, float, bool]: (дані сектора, загальна затримка, чи був це кеш-хіт)
+
+        Дані повертаються як представлення лише для читання без копіювання;
+        для зміни їх слід отримати через storage.writable(). Представлення
+        дійсне до наступного запису в цей сектор: після нього вміст масиву
+        не визначений (залежно від сховища він може показати нові дані або
+        залишитися старим), тож дані, потрібні після запису, слід скопіювати.
         """
         total_delay = self.syscall_read_delay
+        if self.readahead is not None:
+            self.readahead.observe(pid, sector_num)
 
         # Спроба читання з кешу
-        cached_data = self.cache.get_sector(sector_num)
+        cached_data = self._lookup(sector_num)
 
         if cached_data is not None:
             self.cache_hits += 1
             total_delay += self.cache_access_delay
             total_delay += self.user_process_read_delay
             self.total_delay += total_delay
+            if self.metrics is not None:
+                self._record_hit(total_delay)
+            self._maybe_flush()
             return cached_data, total_delay, True
 
         self.cache_misses += 1
 
-        # Читання з диска через планувальник
-        result = self.scheduler.add_request(sector_num, is_write=False)
+        # Читання з диска через планувальник (разом із сусідніми секторами потоку)
+        count, prefetch = self._plan_readahead(pid, sector_num)
+        result = self.scheduler.add_request(sector_num, is_write=False, count=count, pid=pid)
 
         if result is None:
             raise ValueError(f"Помилка читання сектора {sector_num}")
 
         data, disk_delay = result
+        if count > 1:
+            data = self._cache_prefetched(sector_num, data, prefetch)
         total_delay += disk_delay
         total_delay += self.interrupt_handling_delay
         total_delay += self.user_process_read_delay
 
         self.total_delay += total_delay
+        if self.metrics is not None:
+            self._record_miss(total_delay, disk_delay)
 
         # Додавання прочитаних даних в кеш
         self.cache.add_sector(sector_num, data)
+        self._maybe_flush()
 
         return data, total_delay, False
 
-    def write_sector(self, sector_num: int, data: np.ndarray) -> Tuple[float, dict]:
+    def read_sectors(self, sector_nums: Iterable[int], pids: Iterable = None) -> List[Tuple[np.ndarray, float, bool]]:
+        """
+        Читає пакет секторів: промахи кешу ставляться в чергу планувальника
+        всі разом і обробляються в порядку, який обирає планувальник
+        (при обмеженій черзі - порціями розміром з її глибину)
+
+        Args:
+            sector_nums: Абсолютні номери секторів
+            pids: Ідентифікатори процесів для кожного сектора (для попереднього читання)
+
+        Returns:
+            List[Tuple[np.ndarray, float, bool]]: Результати в порядку запитів,
+            як у read_sector (дані - представлення, дійсні до наступного
+            запису у відповідний сектор)
+        """
+        results = []
+        pending = []
+        # Сектори, що вже читаються запитом цього пакета (самі по собі або
+        # наперед разом з іншим сектором): сектор -> (запит, зсув)
+        covered = {}
+        prefetches = {}     # id(DiskRequest) -> сектори, що читаються наперед
+
+        depth = self.scheduler.max_queue_depth
+        pids = iter(pids) if pids is not None else None
+        for sector_num in sector_nums:
+            pid = next(pids) if pids is not None else None
+            if self.readahead is not None:
+                self.readahead.observe(pid, sector_num)
+            cached_data = self._lookup(sector_num)
+
+            if cached_data is not None:
+                self.cache_hits += 1
+                total_delay = self.syscall_read_delay + self.cache_access_delay + self.user_process_read_delay
+                self.total_delay += total_delay
+                if self.metrics is not None:
+                    self._record_hit(total_delay)
+                results.append((cached_data, total_delay, True))
+            elif sector_num in covered:
+                # Сектор надійде з читанням, яке вже в черзі: повторне звернення
+                # в межах пакета не породжує ще однієї дискової операції
+                self.cache_misses += 1
+                request, offset = covered[sector_num]
+                pending.append((len(results), request, offset))
+                results.append(None)
+            else:
+                self.cache_misses += 1
+                count, prefetch = self._plan_readahead(pid, sector_num)
+                # Повна черга обробляється до подання, щоб при overflow='reject'
+                # пакет не відхилявся посередині
+                if depth is not None and len(self.scheduler) >= depth:
+                    self.scheduler.drain()
+                request = self.scheduler.submit(sector_num, is_write=False, count=count, pid=pid)
+                prefetches[id(request)] = prefetch
+                covered[sector_num] = (request, 0)
+                for sector in prefetch:
+                    covered[sector] = (request, sector - sector_num)
+                pending.append((len(results), request, 0))
+                results.append(None)
+
+        self.scheduler.drain()
+
+        # Кожне завершення зіставляється з запитом, що його породив
+        for index, request, offset in pending:
+            if request.result is None:
+                raise ValueError(f"Помилка читання сектора {request.sector}")
+
+            data, disk_delay = request.result
+            if request.count > 1:
+                if offset == 0:
+                    self._cache_prefetched(request.sector, data, prefetches[id(request)])
+                data = data[offset]
+            total_delay = (self.syscall_read_delay + disk_delay +
+                           self.interrupt_handling_delay + self.user_process_read_delay)
+            self.total_delay += total_delay
+            if self.metrics is not None:
+                self._record_miss(total_delay, disk_delay)
+
+            self.cache.add_sector(request.sector + offset, data)
+            results[index] = (data, total_delay, False)
+
+        self._maybe_flush()
+        return results
+
+    def write_sector(self, sector_num: int, data: np.ndarray, pid=None) -> Tuple[float, dict]:
         """
         Записує дані у вказаний сектор
 
         Args:
             sector_num: Абсолютний номер сектора
             data: Дані для запису
+            pid: Ідентифікатор процесу (для справедливого планування)
 
         Returns:
             Tuple[float, dict]: (загальна затримка, словник з деталями затримок)
         """
+        if self.write_back:
+            return self._write_to_cache(sector_num, data)
+
         delays = {
             'syscall': self.syscall_write_delay,
             'user_process': self.user_process_write_delay,
@@ -128,7 +352,7 @@ class HDDController:
         total_delay = delays['syscall'] + delays['user_process']
 
         # Запис через планувальник
-        disk_delay = self.scheduler.add_request(sector_num, is_write=True, data=data)
+        disk_delay = self.scheduler.add_request(sector_num, is_write=True, data=data, pid=pid)
 
         if disk_delay is None:
             raise ValueError(f"Помилка запису в сектор {sector_num}")
@@ -137,12 +361,175 @@ class HDDController:
         total_delay += disk_delay + delays['interrupt']
 
         self.total_delay += total_delay
+        if self.metrics is not None:
+            self.metrics.record_request(True, total_delay, syscall=delays['syscall'],
+                                        user_process=delays['user_process'], disk=disk_delay,
+                                        interrupt=delays['interrupt'],
+                                        queue_wait=0.0, service_time=disk_delay)
+
+        # Оновлення даних в кеші: кеш посилається на дані сховища,
+        # а не на масив викликача, тож копія не потрібна
+        self.cache.add_sector(sector_num, self.hdd.peek_sector(sector_num))
+
+        return total_delay, delays
+
+    def _plan_readahead(self, pid, sector_num):
+        """Повертає (кількість секторів для читання, сектори для кешу наперед)"""
+        if self.readahead is None:
+            return 1, []
+        return self.readahead.plan(pid, sector_num, self.hdd.track_end(sector_num))
+
+    def _cache_prefetched(self, sector_num, buffer, prefetch):
+        """
+        Додає в кеш сектори, прочитані наперед, і повертає дані запитаного сектора.
+        Буфер - одне представлення діапазону сховища, тож сектори не копіюються.
+        Сектори, що вже є в кеші, пропускаються: повторна вставка рахувалася б
+        як звернення і штучно підвищувала б їхню частоту чи давність.
+        """
+        cache = self.cache
+        for sector in prefetch:
+            # Брудний сектор на диску застарів - у кеші вже новіші дані
+            if sector not in self.dirty and sector not in cache:
+                cache.add_sector(sector, buffer[sector - sector_num])
+        return buffer[0]
+
+    def _lookup(self, sector_num):
+        """Шукає сектор у кеші, а при відкладеному записі - і серед витіснених брудних секторів"""
+        data = self.cache.get_sector(sector_num)
+        if data is None and self.dirty:
+            data = self.dirty.get(sector_num)
+            if data is not None:
+                self.cache.add_sector(sector_num, data)
+        return data
+
+    def _write_to_cache(self, sector_num, data):
+        """Запис у режимі write-back: дані лише позначаються брудними в кеші"""
+        if not (0 <= sector_num < self.hdd.total_sectors):
+            raise ValueError("Невірний номер сектора")
+        if len(data) != self.hdd.sector_size:
+            raise ValueError(f"Розмір даних повинен бути {self.hdd.sector_size} байт")
+
+        # Власна копія: викликач може змінити свій масив до скидання на диск
+        data = np.array(data, dtype=np.uint8)
+        data.flags.writeable = False
+
+        # Повторний запис до скидання замінює попередні дані
+        if not self.dirty:
+            self.dirty_since = self.total_delay
+        if sector_num in self.dirty:
+            self.coalesced_writes += 1
+        self.dirty[sector_num] = data
+
+        delays = {
+            'syscall': self.syscall_write_delay,
+            'user_process': self.user_process_write_delay,
+            'cache': self.cache_access_delay,
+            'disk_operation': 0,
+            'interrupt': 0
+        }
+        total_delay = delays['syscall'] + delays['user_process'] + delays['cache']
+        self.total_delay += total_delay
+        if self.metrics is not None:
+            self.metrics.record_request(True, total_delay, syscall=delays['syscall'],
+                                        user_process=delays['user_process'], cache=delays['cache'])
 
-        # Оновлення даних в кеші
         self.cache.add_sector(sector_num, data)
+        self._maybe_flush()
 
         return total_delay, delays
 
+    def _on_cache_evict(self, sector_num, data):
+        # Витіснений брудний сектор лишається в self.dirty до найближчого скидання
+        if sector_num in self.dirty:
+            self.flush_needed = True
+
+    def _maybe_flush(self):
+        if not self.dirty:
+            return
+        # Периодичне скидання: час симуляції - сума затримок запитів контролера
+        if (self.flush_needed or len(self.dirty) >= self.dirty_limit or
+                (self.flush_interval is not None and
+                 self.total_delay - self.dirty_since >= self.flush_interval)):
+            self.flush()
+
+    def flush(self) -> float:
+        """
+        Скидає всі брудні сектори на диск одним проходом головки:
+        сектори впорядковуються за доріжками від поточної позиції головки
+        вгору, потім решта - вниз, і подаються в планувальник пакетом
+        (при обмеженій черзі - порціями розміром з її глибину).
+        Час скидання не входить у затримки запитів, а накопичується
+        окремо у flush_delay
+
+        Returns:
+            float: Сумарна затримка дискових операцій скидання (мс)
+        """
+        self.flush_needed = False
+        if not self.dirty:
+            return 0.0
+
+        sectors = sorted(self.dirty)
+        split = bisect_left(sectors, self.hdd.rw_head_position, key=self.hdd.track_of)
+        order = sectors[split:] + sectors[:split][::-1]
+
+        # Порції не більші за глибину черги: при overflow='reject' пакет
+        # не відхиляється посередині скидання
+        depth = self.scheduler.max_queue_depth
+        if depth is not None and len(self.scheduler):
+            self.scheduler.drain()
+        chunk = len(order) if depth is None else depth
+        requests = []
+        for start in range(0, len(order), chunk):
+            requests += self.scheduler.submit_many((sector, True, self.dirty[sector])
+                                                   for sector in order[start:start + chunk])
+            self.scheduler.drain()
+
+        delay = 0.0
+        for request in requests:
+            if request.result is None:
+                raise ValueError(f"Помилка запису в сектор {request.sector}")
+            delay += request.result
+
+        self.dirty.clear()
+        self.flushes += 1
+        self.flushed_sectors += len(requests)
+        self.flush_delay += delay
+        return delay
+
+    def save_snapshot(self, path):
+        """
+        Зберігає повний стан контролера (вміст дисків, кеш, черга
+        планувальника, стан головки та статистика) у файл знімка
+
+        Args:
+            path: Шлях до файлу знімка
+        """
+        snapshot.save_snapshot(self, path)
+
+    @staticmethod
+    def load_snapshot(path, storage_path=None) -> 'HDDController':
+        """
+        Відновлює контролер зі знімка; вміст дисків відображається з файлу
+        знімка з копіюванням під час запису, тож один знімок можна
+        відновлювати багато разів для незалежних запусків
+
+        Args:
+            path: Шлях до файлу знімка
+            storage_path: Шлях нового образу для memmap-сховища (див. snapshot.load_snapshot)
+        """
+        return snapshot.load_snapshot(path, storage_path)
+
+    def _record_hit(self, total_delay):
+        self.metrics.record_request(False, total_delay, syscall=self.syscall_read_delay,
+                                    cache=self.cache_access_delay,
+                                    user_process=self.user_process_read_delay)
+
+    def _record_miss(self, total_delay, disk_delay, queue_wait=0.0):
+        self.metrics.record_request(False, total_delay, syscall=self.syscall_read_delay, disk=disk_delay,
+                                    interrupt=self.interrupt_handling_delay,
+                                    user_process=self.user_process_read_delay,
+                                    queue_wait=queue_wait, service_time=disk_delay)
+
     def get_statistics(self) -> dict:
         """Повертає статистику роботи контролера"""
         total_requests = self.cache_hits + self.cache_misses
@@ -153,6 +540,19 @@ class HDDController:
             'cache_misses': self.cache_misses,
             'hit_rate': hit_rate,
             'total_delay': self.total_delay,
+            'cache': self.cache.get_statistics(),
+            'latency': self.metrics.summary() if self.metrics is not None else None,
+            'readahead': self.readahead.get_statistics() if self.readahead is not None else None,
+            'write_back': {
+                'dirty': len(self.dirty),
+                'flushes': self.flushes,
+                'flushed_sectors': self.flushed_sectors,
+                'coalesced_writes': self.coalesced_writes,
+                'flush_delay': self.flush_delay,
+            } if self.write_back else None,
+            'array': self.scheduler.get_statistics() if isinstance(self.scheduler, ArrayScheduler) else None,
+            'scheduler': (self.scheduler.get_statistics()
+                          if isinstance(self.scheduler, DeadlineScheduler) else None),
             'delays': {
                 'syscall_read': self.syscall_read_delay,
                 'syscall_write': self.syscall_write_delay,
@@ -0,0 +1,299 @@
+"""
+Геометрія диска: зони з різною кількістю секторів на доріжці (zoned bit
+recording) та крива часу переведення головки.
+
+Зони перелічуються від зовнішнього краю (доріжка 0) до внутрішнього;
+зовнішні доріжки довші, тож містять більше секторів і за один оберт
+передають більше даних. Час переведення головки на коротку відстань
+зростає як корінь з відстані (розгін і гальмування), на довгу - лінійно.
+
+Усі перетворення обчислюються з таблиць зон (перша доріжка, перший сектор,
+секторів на доріжці), яких лише кілька: сектор переводиться в доріжку
+пошуком серед меж зон та одним діленням, тож ні вартість, ні пам'ять не
+залежать від розміру диска, а масиви секторів перетворюються векторно.
+Лінійний час переведення обчислюється за формулою; таблиця часу для
+кожної відстані зберігається лише для кривої.
+
+    python geometry.py
+"""
+from bisect import bisect_right
+from dataclasses import dataclass
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Zone:
+    tracks: int                 # кількість доріжок зони
+    sectors_per_track: int      # секторів на кожній доріжці зони
+
+
+def linear_seek_table(track_count, one_step_delay=0.5, max_reach_delay=10):
+    """
+    Таблиця часу переведення: one_step_delay на доріжку, не більше max_reach_delay
+
+    Returns:
+        np.ndarray: Час переведення (мс) для кожної відстані 0..track_count-1
+    """
+    distances = np.arange(track_count, dtype=np.int64)
+    return np.minimum(float(max_reach_delay), distances * one_step_delay)
+
+
+def curve_seek_table(track_count, track_to_track=0.5, full_stroke=10.0, knee_fraction=0.2):
+    """
+    Таблиця часу переведення за кривою "корінь, потім пряма":
+    t(d) = track_to_track + a * (sqrt(d) - 1) до коліна, далі лінійно
+    з тим самим нахилом, що й корінь у коліні, до full_stroke на найбільшій відстані
+
+    Args:
+        track_count: Кількість доріжок
+        track_to_track: Час переведення на сусідню доріжку (мс)
+        full_stroke: Час переведення через увесь диск (мс)
+        knee_fraction: Положення коліна як частка найбільшої відстані
+
+    Returns:
+        np.ndarray: Час переведення (мс) для кожної відстані 0..track_count-1
+    """
+    if not 0 < track_to_track <= full_stroke:
+        raise ValueError("Має виконуватися 0 < track_to_track <= full_stroke")
+    if not 0 < knee_fraction <= 1:
+        raise ValueError("knee_fraction має бути в межах (0, 1]")
+
+    table = np.zeros(track_count, dtype=np.float64)
+    max_distance = track_count - 1
+    if max_distance < 1:
+        return table
+
+    knee = max(1, int(max_distance * knee_fraction))
+    root_knee = np.sqrt(knee)
+    # Неперервність часу й нахилу в коліні та full_stroke на краю визначають a
+    scale = (full_stroke - track_to_track) / ((root_knee - 1) + (max_distance - knee) / (2 * root_knee))
+
+    distances = np.arange(1, track_count, dtype=np.float64)
+    short = track_to_track + scale * (np.sqrt(distances) - 1)
+    long = track_to_track + scale * (root_knee - 1) + scale / (2 * root_knee) * (distances - knee)
+    table[1:] = np.where(distances <= knee, short, long)
+    return table
+
+
+class LinearSeek:
+    """
+    Лінійний час переведення з обмеженням, обчислюваний без таблиці:
+    індексується як linear_seek_table(track_count, ...), але не займає
+    пам'яті на кожну відстань
+    """
+
+    def __init__(self, track_count, one_step_delay=0.5, max_reach_delay=10):
+        self.track_count = track_count
+        self.one_step_delay = one_step_delay
+        self.max_reach_delay = float(max_reach_delay)
+
+    def __getitem__(self, distances):
+        if isinstance(distances, np.ndarray):
+            return np.minimum(self.max_reach_delay, distances * self.one_step_delay)
+        return min(self.max_reach_delay, distances * self.one_step_delay)
+
+    def __len__(self):
+        return self.track_count
+
+    def max(self):
+        return self[self.track_count - 1]
+
+
+class Geometry:
+    def __init__(self, zones, seek_table, max_seek_time=None):
+        """
+        Args:
+            zones: Послідовність Zone від зовнішнього краю до внутрішнього
+            seek_table: Час переведення (мс) для кожної відстані 0..кількість доріжок-1
+                (масив або LinearSeek)
+            max_seek_time: Час, після якого переведення вважається максимальним
+                (за замовчуванням - найбільше значення таблиці)
+        """
+        zones = tuple(zones)
+        if not zones:
+            raise ValueError("Геометрія потребує щонайменше однієї зони")
+        if any(zone.tracks < 1 or zone.sectors_per_track < 1 for zone in zones):
+            raise ValueError("Зона має містити додатну кількість доріжок і секторів")
+
+        self.zones = zones
+        self.uniform = len(zones) == 1
+
+        # Таблиці зон: межі доріжок і секторів (на одну більше за кількість зон)
+        zone_tracks = np.array([zone.tracks for zone in zones], dtype=np.int64)
+        self.zone_sectors_per_track = np.array([zone.sectors_per_track for zone in zones], dtype=np.int64)
+        self.zone_first_track = np.concatenate(([0], np.cumsum(zone_tracks)))
+        self.zone_first_sector = np.concatenate(([0], np.cumsum(zone_tracks * self.zone_sectors_per_track)))
+
+        self.track_count = int(self.zone_first_track[-1])
+        self.total_sectors = int(self.zone_first_sector[-1])
+        self.max_sectors_per_track = int(self.zone_sectors_per_track.max())
+
+        if len(seek_table) < self.track_count:
+            raise ValueError("Таблиця часу переведення коротша за кількість доріжок")
+        if not isinstance(seek_table, LinearSeek):
+            seek_table = np.asarray(seek_table, dtype=np.float64)[:self.track_count]
+        self.seek_table = seek_table
+        self.max_seek_time = float(self.seek_table.max()) if max_seek_time is None else max_seek_time
+
+        # Списки Python для скалярних звернень (індексація без створення скалярів NumPy)
+        self._zone_first_sector = self.zone_first_sector.tolist()
+        self._zone_first_track = self.zone_first_track.tolist()
+        self._zone_sectors = self.zone_sectors_per_track.tolist()
+        if isinstance(seek_table, LinearSeek):
+            # Скалярний час обчислюється в seek_time без виклику LinearSeek
+            self._seek = None
+            self._one_step = seek_table.one_step_delay
+            self._max_reach = seek_table.max_reach_delay
+        else:
+            self._seek = seek_table.tolist()
+
+    @classmethod
+    def uniform_disk(cls, track_count, sectors_per_track, one_step_delay=0.5, max_reach_delay=10):
+        """Однакові доріжки та лінійний час переведення з обмеженням (модель HDD за замовчуванням)"""
+        return cls([Zone(track_count, sectors_per_track)],
+                   LinearSeek(track_count, one_step_delay, max_reach_delay),
+                   max_seek_time=max_reach_delay)
+
+    @classmethod
+    def zoned_disk(cls, track_count, outer_sectors, inner_sectors, zones=8,
+                   track_to_track=0.5, full_stroke=10.0, knee_fraction=0.2):
+        """
+        Диск з зонами однакової ширини, кількість секторів у яких
+        рівномірно спадає від outer_sectors до inner_sectors, та кривою
+        часу переведення curve_seek_table
+        """
+        if not 1 <= zones <= track_count:
+            raise ValueError("Кількість зон має бути в межах від 1 до кількості доріжок")
+        bounds = np.linspace(0, track_count, zones + 1).astype(np.int64)
+        sectors = np.linspace(outer_sectors, inner_sectors, zones).round().astype(np.int64)
+        zone_list = [Zone(int(end - start), int(count))
+                     for start, end, count in zip(bounds[:-1], bounds[1:], sectors)]
+        return cls(zone_list, curve_seek_table(track_count, track_to_track, full_stroke, knee_fraction))
+
+    # Скалярні перетворення
+
+    def zone_of(self, sector):
+        """Номер зони сектора"""
+        return bisect_right(self._zone_first_sector, sector) - 1
+
+    def track_of(self, sector):
+        """Номер доріжки сектора"""
+        if self.uniform:
+            return sector // self._zone_sectors[0]
+        zone = bisect_right(self._zone_first_sector, sector) - 1
+        return self._zone_first_track[zone] + (sector - self._zone_first_sector[zone]) // self._zone_sectors[zone]
+
+    def zone_of_track(self, track):
+        """Номер зони доріжки"""
+        return bisect_right(self._zone_first_track, track) - 1
+
+    def sectors_on(self, track):
+        """Кількість секторів на доріжці"""
+        if self.uniform:
+            return self._zone_sectors[0]
+        return self._zone_sectors[self.zone_of_track(track)]
+
+    def track_start(self, track):
+        """Перший сектор доріжки"""
+        if self.uniform:
+            return track * self._zone_sectors[0]
+        zone = self.zone_of_track(track)
+        return self._zone_first_sector[zone] + (track - self._zone_first_track[zone]) * self._zone_sectors[zone]
+
+    def track_end(self, sector):
+        """Перший сектор наступної доріжки (межа доріжки сектора)"""
+        if self.uniform:
+            sectors = self._zone_sectors[0]
+            return (sector // sectors + 1) * sectors
+        zone = bisect_right(self._zone_first_sector, sector) - 1
+        first, sectors = self._zone_first_sector[zone], self._zone_sectors[zone]
+        return first + ((sector - first) // sectors + 1) * sectors
+
+    def angle_of(self, sector):
+        """Кутове положення початку сектора на доріжці (частка оберту, 0..1)"""
+        if self.uniform:
+            sectors = self._zone_sectors[0]
+            return (sector % sectors) / sectors
+        zone = bisect_right(self._zone_first_sector, sector) - 1
+        sectors = self._zone_sectors[zone]
+        return ((sector - self._zone_first_sector[zone]) % sectors) / sectors
+
+    def seek_time(self, distance):
+        """Час переведення головки на distance доріжок (мс)"""
+        if self._seek is None:
+            delay = distance * self._one_step
+            return delay if delay < self._max_reach else self._max_reach
+        return self._seek[distance]
+
+    # Векторні перетворення
+
+    def zones_of(self, sectors):
+        """Номери зон для масиву секторів"""
+        return np.searchsorted(self.zone_first_sector, sectors, side='right') - 1
+
+    def tracks_of(self, sectors):
+        """Номери доріжок для масиву секторів"""
+        sectors = np.asarray(sectors, dtype=np.int64)
+        if self.uniform:
+            return sectors // self._zone_sectors[0]
+        zones = self.zones_of(sectors)
+        return (self.zone_first_track[zones] +
+                (sectors - self.zone_first_sector[zones]) // self.zone_sectors_per_track[zones])
+
+    def angles_of(self, sectors):
+        """Кутові положення для масиву секторів"""
+        sectors = np.asarray(sectors, dtype=np.int64)
+        if self.uniform:
+            return (sectors % self._zone_sectors[0]) / self._zone_sectors[0]
+        zones = self.zones_of(sectors)
+        per_track = self.zone_sectors_per_track[zones]
+        return ((sectors - self.zone_first_sector[zones]) % per_track) / per_track
+
+    def seek_times(self, distances):
+        """Час переведення для масиву відстаней"""
+        return self.seek_table[distances]
+
+    def describe(self):
+        """Рядки з параметрами зон"""
+        return [f"зона {index}: доріжки {self._zone_first_track[index]}-{self._zone_first_track[index + 1] - 1}, "
+                f"{zone.sectors_per_track} секторів на доріжці"
+                for index, zone in enumerate(self.zones)]
+
+
+def compare_zones(rpm=7500, track_count=10000, outer_sectors=800, inner_sectors=400, zones=8, requests=2000):
+    """Порівнює швидкість послідовного та випадкового читання у зовнішній і внутрішній зоні"""
+    from hard_drive import HDD
+
+    geometry = Geometry.zoned_disk(track_count, outer_sectors, inner_sectors, zones)
+    for line in geometry.describe():
+        print(line)
+    print()
+
+    print(f"{'зона':>6} | {'послідовно, МБ/с':>16} | {'випадково, оп/с':>15}")
+    print("-" * 44)
+    rng = np.random.default_rng(0)
+    for zone in (0, len(geometry.zones) - 1):
+        first = int(geometry.zone_first_sector[zone])
+        last = int(geometry.zone_first_sector[zone + 1])
+
+        hdd = HDD(rpm=rpm, geometry=geometry, rotation_model='exact')
+        hdd.rw_head_position = int(geometry.zone_first_track[zone])
+        # Послідовне читання цілими доріжками
+        sector, total_delay, total_bytes = first, 0.0, 0
+        while total_bytes < 8 * 1024 * 1024 and sector < last:
+            count = hdd.track_end(sector) - sector
+            _, delay = hdd.read_sectors(sector, count)
+            total_delay += delay
+            total_bytes += count * hdd.sector_size
+            sector += count
+        sequential = total_bytes / (1024 * 1024) / (total_delay / 1000)
+
+        hdd = HDD(rpm=rpm, geometry=geometry)
+        hdd.rw_head_position = int(geometry.zone_first_track[zone])
+        delays, _ = hdd.simulate_batch(rng.integers(first, last, size=requests))
+        random_rate = requests / (float(delays.sum()) / 1000)
+        print(f"{zone:>6} | {sequential:>16.2f} | {random_rate:>15.1f}")
+
+
+if __name__ == "__main__":
+    compare_zones()
@@ -1,17 +1,112 @@
 import numpy as np
+from geometry import Geometry
+from storage import create_store, readonly_view, SECTOR_SIZE
+
+
+ROTATION_MODELS = ('average', 'exact')
+
 
 class HDD:
-    def __init__(self, rpm=7500, sectors_num=500, track_num=10000):
+    def __init__(self, rpm=7500, sectors_num=500, track_num=10000, storage='sparse', storage_path=None,
+                 rotation_model='average', geometry=None):
+        """
+        Args:
+            rpm: Швидкість обертання (об/хв)
+            sectors_num: Кількість секторів на доріжці
+            track_num: Кількість доріжок
+            storage: Тип сховища секторів ('dense', 'sparse' або 'memmap')
+            storage_path: Шлях до образу диска для 'memmap'
+            rotation_model: 'average' - очікування обертання завжди пів оберту;
+                'exact' - кут пластини відстежується у віртуальному часі диска,
+                і очікується фактичний час до підходу сектора під головку
+            geometry: Геометрія з зонами та кривою переведення головки
+                (geometry.Geometry); якщо задана, sectors_num і track_num
+                ігноруються. За замовчуванням - однакові доріжки та лінійний
+                час переведення з обмеженням
+        """
+        if rotation_model not in ROTATION_MODELS:
+            raise ValueError(f"Невідома модель обертання: {rotation_model}")
+        if geometry is None:
+            geometry = Geometry.uniform_disk(track_num, sectors_num)
+        self.geometry = geometry
         self.rpm = rpm
-        self.track_number = track_num   # Кількість доріжок
-        self.sectors_per_track = sectors_num    # Кількість секторів на доріжці
-        self.sector_size = 512      # Розмір одного сектора
+        self.track_number = geometry.track_count   # Кількість доріжок
+        # Кількість секторів на доріжці (для зонованого диска - у зовнішній зоні)
+        self.sectors_per_track = geometry.max_sectors_per_track
+        self.total_sectors = geometry.total_sectors
+        self.sector_size = SECTOR_SIZE      # Розмір одного сектора
         self.rw_head_position = 0
-        self.data = np.zeros(sectors_num * track_num)
+        # Сховище секторів: 'dense', 'sparse' або 'memmap' (образ на диску)
+        self.storage = create_store(storage, self.total_sectors, self.sectors_per_track,
+                                    path=storage_path, sector_size=self.sector_size)
+        self.revolution_time = (60*1000)/self.rpm
         self.rotation_delay = ((60*1000)/self.rpm)/2
+        # Найменша затримка читання/запису сектора (найдовші доріжки)
         self.rw_delay = ((60*1000)/self.rpm)/self.sectors_per_track
-        self.max_reach_delay = 10   # Максимальна затримка переведення головки
-        self.one_step_delay = 0.5   # Затримка переведення головки на одну доріжку
+        # Затримка читання/запису сектора в кожній зоні
+        self.zone_rw_delays = self.revolution_time / geometry.zone_sectors_per_track
+        self._zone_rw_delays = self.zone_rw_delays.tolist()
+        self.max_reach_delay = geometry.max_seek_time   # Максимальна затримка переведення головки
+        self.one_step_delay = geometry.seek_time(1) if self.track_number > 1 else 0.0   # на одну доріжку
+        self.metrics = None     # MetricsRecorder для відстаней переміщення головки
+        self.rotation_model = rotation_model
+        self.clock = 0.0        # віртуальний час диска (мс), задає кут пластини
+
+    def seek_time(self, track_delta):
+        """Час переведення головки на track_delta доріжок"""
+        return self.geometry.seek_time(track_delta)
+
+    def angle_of(self, abs_sector_num):
+        """Кутове положення початку сектора на доріжці (частка оберту, 0..1)"""
+        return self.geometry.angle_of(abs_sector_num)
+
+    def rotational_position(self, time):
+        """Кут пластини під головкою в момент time (частка оберту, 0..1)"""
+        return (time / self.revolution_time) % 1.0
+
+    def rotational_wait(self, abs_sector_num, time):
+        """Очікування (мс) від моменту time до підходу початку сектора під головку"""
+        return ((self.angle_of(abs_sector_num) - self.rotational_position(time)) % 1.0) * self.revolution_time
+
+    def access_time(self, abs_sector_num, count=1):
+        """
+        Оцінює затримку обслуговування запиту з поточного стану диска
+        (без переміщення головки та зміни годинника)
+        """
+        geometry = self.geometry
+        track_num = geometry.track_of(abs_sector_num)
+        track_reach_delay = geometry.seek_time(abs(self.rw_head_position - track_num))
+        if geometry.uniform:
+            rw_delay = self._zone_rw_delays[0]
+        else:
+            rw_delay = self._zone_rw_delays[geometry.zone_of(abs_sector_num)]
+        if self.rotation_model == 'exact':
+            wait = self.rotational_wait(abs_sector_num, self.clock + track_reach_delay)
+            return track_reach_delay + wait + count * rw_delay
+        if count == 1:
+            return track_reach_delay + (rw_delay + self.rotation_delay)
+        return track_reach_delay + self.rotation_delay + count * rw_delay
+
+    def advance_clock(self, idle_time):
+        """Просуває годинник диска на час простою (пластина обертається й без запитів)"""
+        self.clock += idle_time
+
+    def _access(self, abs_sector_num, count=1):
+        """Переводить головку до сектора та повертає затримку операції"""
+        track_num = self.track_of(abs_sector_num)
+        track_delta = abs(self.rw_head_position - track_num)
+        if self.metrics is not None:
+            self.metrics.record_seek(track_delta)
+        delay = self.access_time(abs_sector_num, count)
+
+        # Оновлюємо позицію головки та годинник
+        self.rw_head_position = track_num
+        self.clock += delay
+        return delay
+
+    def track_of(self, abs_sector_num):
+        """Повертає номер доріжки, на якій розташований сектор"""
+        return self.geometry.track_of(abs_sector_num)
 
     def read_sector(self, abs_sector_num):
         """
@@ -21,24 +116,50 @@ class HDD:
             abs_sector_num (int): Абсолютний номер сектора
 
         Returns:
-            tuple: (дані сектора, затримка операції)
+            tuple: (представлення даних сектора лише для читання, затримка операції).
+                Представлення дійсне до наступного запису в сектор; після запису
+                його вміст не визначений
         """
-        if not (0 <= abs_sector_num < self.track_number * self.sectors_per_track):
+        if not (0 <= abs_sector_num < self.total_sectors):
             raise ValueError("Невірний номер сектора")
 
-        # Отримуємо дані
-        curr_data = self.data[abs_sector_num:abs_sector_num + self.sector_size]
+        # Отримуємо дані без копіювання: представлення сховища лише для читання
+        curr_data = readonly_view(self.storage.read(abs_sector_num))
 
-        # Обчислюємо затримку
-        track_num = abs_sector_num // self.sectors_per_track
-        track_reach_delay = min(float(self.max_reach_delay), abs(self.rw_head_position - track_num)*self.one_step_delay)
-        sector_rw_delay = self.rw_delay + self.rotation_delay
-        delay = track_reach_delay + sector_rw_delay
+        # Обчислюємо затримку та переводимо головку
+        delay = self._access(abs_sector_num)
 
-        # Оновлюємо позицію головки
-        self.rw_head_position = track_num
+        return curr_data, delay
+
+    def track_end(self, abs_sector_num):
+        """Повертає номер першого сектора наступної доріжки (межа доріжки сектора)"""
+        return self.geometry.track_end(abs_sector_num)
+
+    def read_sectors(self, abs_sector_num, count):
+        """
+        Читає count суміжних секторів однієї доріжки за одну операцію:
+        після переведення головки та очікування обертання сектори
+        проходять під головкою один за одним, тож кожен додатковий
+        сектор коштує лише rw_delay (очікування обертання - один раз)
+
+        Args:
+            abs_sector_num (int): Абсолютний номер першого сектора
+            count (int): Кількість секторів (діапазон у межах однієї доріжки)
+
+        Returns:
+            tuple: (масив count × sector_size лише для читання, затримка операції);
+                як і в read_sector, дійсний до наступного запису в ці сектори
+        """
+        if not (0 <= abs_sector_num < self.total_sectors):
+            raise ValueError("Невірний номер сектора")
+        if count < 1 or abs_sector_num + count > self.track_end(abs_sector_num):
+            raise ValueError("Діапазон секторів виходить за межі доріжки")
+
+        curr_data = readonly_view(self.storage.read_range(abs_sector_num, count))
+
+        delay = self._access(abs_sector_num, count)
 
-        return curr_data.copy(), delay
+        return curr_data, delay
 
     def write_sector(self, abs_sector_num, data):
         """
@@ -51,25 +172,119 @@ class HDD:
         Returns:
             float: Затримка операції
         """
-        if not (0 <= abs_sector_num < self.track_number * self.sectors_per_track):
+        if not (0 <= abs_sector_num < self.total_sectors):
             raise ValueError("Невірний номер сектора")
 
         if len(data) != self.sector_size:
             raise ValueError(f"Розмір даних повинен бути {self.sector_size} байт")
 
         # Обчислюємо затримку так само, як і при читанні
-        track_num = abs_sector_num // self.sectors_per_track
-        track_delta = abs(self.rw_head_position - track_num)
-        track_reach_delay = min(float(self.max_reach_delay), track_delta*self.one_step_delay)
-        sector_rw_delay = self.rw_delay + self.rotation_delay
-        total_delay = track_reach_delay + sector_rw_delay
+        total_delay = self._access(abs_sector_num)
 
         # Записуємо дані
-        self.data[abs_sector_num:abs_sector_num + self.sector_size] = data
+        self.storage.write(abs_sector_num, data)
+
+        return total_delay
+
+    def write_sectors(self, abs_sector_num, rows):
+        """
+        Записує суміжні сектори однієї доріжки за одну операцію
+        (збирання даних кількох запитів)
 
-        # Оновлюємо позицію головки
-        self.rw_head_position = abs_sector_num // self.sectors_per_track
+        Args:
+            abs_sector_num (int): Абсолютний номер першого сектора
+            rows: Послідовність масивів даних секторів (або масив count × sector_size)
+
+        Returns:
+            float: Затримка операції
+        """
+        count = len(rows)
+        if not (0 <= abs_sector_num < self.total_sectors):
+            raise ValueError("Невірний номер сектора")
+        if count < 1 or abs_sector_num + count > self.track_end(abs_sector_num):
+            raise ValueError("Діапазон секторів виходить за межі доріжки")
+        if any(len(row) != self.sector_size for row in rows):
+            raise ValueError(f"Розмір даних повинен бути {self.sector_size} байт")
+
+        total_delay = self._access(abs_sector_num, count)
+        self.storage.write_range(abs_sector_num, rows)
 
         return total_delay
 
+    def simulate_batch(self, sectors, is_write=None, counts=None):
+        """
+        Векторно обчислює затримки для послідовності запитів без передачі даних.
+        Результат побітово збігається з послідовними викликами read_sector/write_sector
+        (для запитів з кількох секторів - read_sectors/write_sectors).
+        При rotation_model='exact' затримки залежать від кута пластини після
+        кожного запиту, тому обчислюються поелементно.
+
+        Args:
+            sectors (array-like): Абсолютні номери перших секторів у порядку обробки
+            is_write (array-like): Ознаки запису (модель затримки для читання
+                і запису однакова, параметр залишено для сумісності трас)
+            counts (array-like): Кількість секторів кожного запиту (None - по одному)
+
+        Returns:
+            tuple: (масив затримок кожного запиту, кінцева позиція головки)
+        """
+        sectors = np.asarray(sectors, dtype=np.int64)
+        if sectors.size == 0:
+            return np.empty(0, dtype=np.float64), self.rw_head_position
+
+        if sectors.min() < 0 or sectors.max() >= self.total_sectors:
+            raise ValueError("Невірний номер сектора")
+
+        tracks = self.geometry.tracks_of(sectors)
+        if counts is not None:
+            counts = np.asarray(counts, dtype=np.int64)
+            # Як у read_sectors: діапазон запиту не виходить за межі доріжки
+            last = sectors + counts - 1
+            if (counts.min() < 1 or last.max() >= self.total_sectors or
+                    (self.geometry.tracks_of(last) != tracks).any()):
+                raise ValueError("Діапазон секторів виходить за межі доріжки")
+
+        if self.rotation_model == 'exact':
+            # Очікування обертання залежить від годинника після попереднього
+            # запиту, тож затримки обчислюються послідовно
+            delays = np.empty(sectors.size, dtype=np.float64)
+            sector_counts = [1] * sectors.size if counts is None else counts.tolist()
+            for index, (sector, count) in enumerate(zip(sectors.tolist(), sector_counts)):
+                delays[index] = self.access_time(sector, count)
+                self.rw_head_position = self.track_of(sector)
+                self.clock += delays[index]
+            return delays, self.rw_head_position
+
+        # Відстань переміщення головки до кожної наступної доріжки
+        track_deltas = np.abs(np.diff(tracks, prepend=self.rw_head_position))
+        track_reach_delays = self.geometry.seek_times(track_deltas)
+        if self.geometry.uniform:
+            rw_delays = self._zone_rw_delays[0]
+        else:
+            rw_delays = self.zone_rw_delays[self.geometry.zones_of(sectors)]
+        if counts is None:
+            delays = track_reach_delays + (rw_delays + self.rotation_delay)
+        else:
+            # Той самий порядок додавань, що й в access_time
+            delays = np.where(counts == 1, track_reach_delays + (rw_delays + self.rotation_delay),
+                              track_reach_delays + self.rotation_delay + counts * rw_delays)
+
+        self.rw_head_position = int(tracks[-1])
+        self.clock += float(delays.sum())
+
+        return delays, self.rw_head_position
+
+    def peek_sector(self, abs_sector_num):
+        """
+        Повертає представлення даних сектора лише для читання
+        без моделювання затримки та руху головки
+        """
+        return readonly_view(self.storage.read(abs_sector_num))
+
+    def flush(self):
+        """Скидає дані сховища на носій (для memmap-образу)"""
+        self.storage.flush()
 
+    def close(self):
+        """Закриває сховище секторів"""
+        self.storage.close()
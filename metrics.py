@@ -0,0 +1,260 @@
+"""
+Метрики затримок з гістограмами фіксованої структури.
+
+Гістограма має логарифмічно-лінійні кошики (як HDR-гістограма): кожен
+степінь двійки поділено на SUB_BUCKETS рівних частин, тож відносна
+похибка перцентилів не перевищує 1/SUB_BUCKETS, а пам'ять стала
+незалежно від кількості записаних значень.
+"""
+import csv
+import json
+import numpy as np
+
+SUB_BUCKETS = 64
+PERCENTILES = (50, 95, 99, 99.9)
+# Скільки значень накопичується перед векторним розкладанням по кошиках
+BATCH_SIZE = 4096
+
+
+class Histogram:
+    __slots__ = ('unit', '_scale', 'exponents', '_counts', '_last_index', '_count', '_total', '_min', '_max',
+                 '_pending')
+
+    def __init__(self, unit=0.001, max_value=1e7):
+        """
+        Args:
+            unit: Найменше значення, що розрізняється (значення нижче - в нульовому кошику)
+            max_value: Найбільше очікуване значення (більші потрапляють в останній кошик)
+        """
+        self.unit = unit
+        self._scale = 1 / unit
+        self.exponents = int(max_value / unit).bit_length() + 1
+        self._counts = np.zeros(self.exponents * SUB_BUCKETS + 1, dtype=np.int64)
+        self._last_index = len(self._counts) - 1
+        self._count = 0
+        self._total = 0.0
+        self._min = float('inf')
+        self._max = float('-inf')
+        # Значення, ще не розкладені по кошиках
+        self._pending = []
+
+    def record(self, value):
+        """Записує значення в гістограму (по кошиках значення розкладаються порціями)"""
+        pending = self._pending
+        pending.append(value)
+        if len(pending) >= BATCH_SIZE:
+            self._fold()
+
+    def record_many(self, values):
+        """Записує масив значень"""
+        values = np.asarray(values, dtype=np.float64)
+        if not values.size:
+            return
+        self._count += values.size
+        self._total += float(values.sum())
+        self._min = min(self._min, float(values.min()))
+        self._max = max(self._max, float(values.max()))
+
+        # Значення в цілих одиницях; частина, менша за unit, не розрізняється.
+        # Обмеження 2**52 лише запобігає переповненню: такі значення й так
+        # потрапляють в останній кошик
+        scaled = np.minimum(np.floor(values * self._scale), 2.0 ** 52)
+        # Кошик: (exponent - 1) * SUB_BUCKETS + (старші 7 бітів - SUB_BUCKETS) + 1,
+        # де exponent - кількість бітів; старші 7 бітів цілого scaled = 2**exponent * mantissa
+        # дорівнюють цілій частині mantissa * 128 (константи - для SUB_BUCKETS = 64)
+        mantissa, exponent = np.frexp(scaled)
+        index = (exponent << 6) + (mantissa * 128).astype(np.int64) - 127
+        index[scaled < 1] = 0
+        np.minimum(index, self._last_index, out=index)
+        self._counts += np.bincount(index, minlength=len(self._counts))
+
+    def _fold(self):
+        """Розкладає відкладені значення по кошиках"""
+        if self._pending:
+            values = self._pending
+            self._pending = []
+            self.record_many(values)
+
+    @property
+    def counts(self):
+        self._fold()
+        return self._counts
+
+    @property
+    def count(self):
+        self._fold()
+        return self._count
+
+    @property
+    def total(self):
+        self._fold()
+        return self._total
+
+    @property
+    def min(self):
+        self._fold()
+        return self._min
+
+    @property
+    def max(self):
+        self._fold()
+        return self._max
+
+    def _bucket_upper(self, index):
+        """Верхня межа кошика у вихідних одиницях"""
+        if index == 0:
+            return self.unit
+        exponent, sub = divmod(index - 1, SUB_BUCKETS)
+        return self.unit * (2 ** exponent) * (1 + (sub + 1) / SUB_BUCKETS)
+
+    def percentile(self, q):
+        """Повертає наближене значення q-го перцентиля (0-100)"""
+        if self.count == 0:
+            return 0.0
+        threshold = self.count * q / 100
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts.tolist()):
+            cumulative += bucket_count
+            if cumulative >= threshold and bucket_count:
+                if index == 0:
+                    return self.min
+                return min(self._bucket_upper(index), self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self) -> dict:
+        result = {
+            'count': self.count,
+            'mean': self.mean,
+            'min': self.min if self.count else 0.0,
+            'max': self.max if self.count else 0.0,
+        }
+        for q in PERCENTILES:
+            result[f'p{q:g}'] = self.percentile(q)
+        return result
+
+
+class MetricsRecorder:
+    """
+    Збирає гістограми затримок та розбивку затримок за компонентами.
+    Поля запитів накопичуються в плоскому списку і розкладаються по
+    гістограмах порціями (векторно), тож запис запиту - лише
+    розширення списку
+    """
+
+    COMPONENTS = ('syscall', 'cache', 'disk', 'interrupt', 'user_process')
+    __slots__ = ('_latency', '_queue_wait', '_service_time', 'seek_distance', '_components', '_pending',
+                 '_served', '_pending_limit')
+
+    def __init__(self):
+        self._latency = {'read': Histogram(), 'write': Histogram()}
+        self._queue_wait = Histogram()
+        self._service_time = Histogram()
+        self.seek_distance = Histogram(unit=1, max_value=1e7)
+        self._components = dict.fromkeys(self.COMPONENTS, 0.0)
+        # Плоскі списки полів запитів: is_write, total_delay і компоненти кожного
+        # запиту та queue_wait, service_time запитів, що йшли на диск
+        self._pending = []
+        self._served = []
+        self._pending_limit = BATCH_SIZE * (len(self.COMPONENTS) + 2)
+
+    def record_request(self, is_write, total_delay, syscall=0.0, cache=0.0, disk=0.0, interrupt=0.0,
+                       user_process=0.0, queue_wait=None, service_time=None):
+        """
+        Записує завершений запит
+
+        Args:
+            is_write: Чи був це запис
+            total_delay: Загальна затримка запиту (мс)
+            syscall, cache, disk, interrupt, user_process: Затримки компонентів (мс)
+            queue_wait: Очікування в черзі диска (мс), якщо запит ішов на диск
+            service_time: Час обслуговування диском (мс), якщо запит ішов на диск
+        """
+        if service_time is not None:
+            self._served += (queue_wait or 0.0, service_time)
+        pending = self._pending
+        pending += (is_write, total_delay, syscall, cache, disk, interrupt, user_process)
+        if len(pending) >= self._pending_limit:
+            self._fold()
+
+    def _fold(self):
+        """Розкладає накопичені запити по гістограмах і сумах компонентів"""
+        pending = self._pending
+        if not pending:
+            return
+        self._pending = []
+
+        fields = len(self.COMPONENTS) + 2
+        is_write = np.array(pending[0::fields], dtype=bool)
+        totals = np.array(pending[1::fields], dtype=np.float64)
+        self._latency['read'].record_many(totals[~is_write])
+        self._latency['write'].record_many(totals[is_write])
+        for offset, name in enumerate(self.COMPONENTS, 2):
+            self._components[name] += sum(pending[offset::fields])
+
+        served = self._served
+        if served:
+            self._served = []
+            self._queue_wait.record_many(served[0::2])
+            self._service_time.record_many(served[1::2])
+
+    @property
+    def latency(self) -> dict:
+        """Гістограми загальної затримки читань і записів"""
+        self._fold()
+        return self._latency
+
+    @property
+    def queue_wait(self) -> Histogram:
+        self._fold()
+        return self._queue_wait
+
+    @property
+    def service_time(self) -> Histogram:
+        self._fold()
+        return self._service_time
+
+    @property
+    def components(self) -> dict:
+        """Сумарні затримки за компонентами"""
+        self._fold()
+        return dict(self._components)
+
+    def record_seek(self, distance):
+        """Записує відстань переміщення головки (доріжок)"""
+        self.seek_distance.record(distance)
+
+    def summary(self) -> dict:
+        requests = self.latency['read'].count + self.latency['write'].count
+        return {
+            'read': self.latency['read'].summary(),
+            'write': self.latency['write'].summary(),
+            'queue_wait': self.queue_wait.summary(),
+            'service_time': self.service_time.summary(),
+            'seek_distance': self.seek_distance.summary(),
+            'components': {
+                name: {'total': total, 'mean': total / requests if requests else 0.0}
+                for name, total in self.components.items()
+            },
+        }
+
+    def to_json(self, path):
+        """Експортує підсумок метрик у JSON"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=2, ensure_ascii=False)
+
+    def to_csv(self, path):
+        """Експортує перцентилі всіх гістограм у CSV (рядок на гістограму)"""
+        summary = self.summary()
+        components = summary.pop('components')
+        columns = ['metric', 'count', 'mean', 'min', 'max'] + [f'p{q:g}' for q in PERCENTILES]
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for metric, values in summary.items():
+                writer.writerow([metric] + [values[column] for column in columns[1:]])
+            for name, values in components.items():
+                writer.writerow([f'component_{name}', '', values['mean'], '', ''] + [''] * len(PERCENTILES))
@@ -0,0 +1,278 @@
+"""
+Крива частки промахів (miss-ratio curve) за один прохід траси.
+
+Для кожного звернення обчислюється відстань повторного використання -
+кількість різних секторів, до яких зверталися після попереднього
+звернення до того ж сектора. Позиції останніх звернень позначаються в
+дереві Фенвіка, тож відстань рахується за O(log n). Читання з відстанню
+d влучає в будь-який LRU-кеш розміром більше за d, тому гістограма
+відстаней дає частку промахів одразу для всіх розмірів кешу. Для
+сегментованого LFUCache це наближення: його частота промахів зазвичай
+не гірша за LRU того ж загального розміру на трасах з повторами.
+
+Для дуже великих трас можна ввімкнути просторову вибірку SHARDS:
+обробляються лише сектори, хеш яких менший за поріг (частка rate), а
+відстані масштабуються на 1/rate. Кеші, менші за 1/rate секторів,
+вибірка розрізняє погано.
+
+    python mrc.py trace.bin --sampling 0.01 --sizes 20,100,1000,10000
+"""
+import argparse
+import numpy as np
+
+from controller import HDDController
+from hard_drive import HDD
+from raid import DiskArray
+from replay import open_trace, iter_chunks, request_sectors, split_requests
+from trace_format import TraceFile, OP_WRITE
+
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+_HASH_BITS = 24
+
+
+class _Fenwick:
+    """Дерево Фенвіка для префіксних сум позначок"""
+
+    def __init__(self, size):
+        self.size = size
+        self.tree = [0] * (size + 1)
+
+    def add(self, index, delta):
+        index += 1
+        tree = self.tree
+        size = self.size
+        while index <= size:
+            tree[index] += delta
+            index += index & -index
+
+    def prefix(self, index):
+        """Сума позначок на позиціях [0, index)"""
+        total = 0
+        tree = self.tree
+        while index > 0:
+            total += tree[index]
+            index -= index & -index
+        return total
+
+
+class MissRatioCurve:
+    def __init__(self, sampling_rate=1.0, initial_capacity=1 << 16):
+        """
+        Args:
+            sampling_rate: Частка секторів у вибірці SHARDS (1.0 - без вибірки)
+            initial_capacity: Початковий розмір дерева (збільшується за потреби)
+        """
+        if not 0 < sampling_rate <= 1:
+            raise ValueError("sampling_rate має бути в межах (0, 1]")
+        self.sampling_rate = sampling_rate
+        self._threshold = int(sampling_rate * (1 << _HASH_BITS))
+
+        self._tree = _Fenwick(initial_capacity)
+        self._time = 0          # наступна позиція в дереві
+        self._last = {}         # сектор -> позиція останнього звернення
+
+        # Гістограма відстаней читань (у масштабі всієї траси) та холодні промахи
+        self.distances = {}
+        self.cold_misses = 0
+        self.reads = 0          # усі читання траси (включно з невибраними)
+        self.writes = 0
+        self.sampled_reads = 0
+
+    def _sampled(self, sectors):
+        """Маска секторів, що потрапляють у вибірку SHARDS"""
+        if self._threshold >= 1 << _HASH_BITS:
+            return np.ones(len(sectors), dtype=bool)
+        hashed = (sectors.astype(np.uint64) * np.uint64(_HASH_MULTIPLIER)) >> np.uint64(64 - _HASH_BITS)
+        return hashed < self._threshold
+
+    def feed(self, sectors, is_write=None):
+        """
+        Обробляє блок звернень
+
+        Args:
+            sectors: Масив номерів секторів у порядку звернень
+            is_write: Масив ознак запису (записи оновлюють давність, але не
+                рахуються як влучання чи промахи - як у контролері)
+        """
+        sectors = np.asarray(sectors, dtype=np.int64)
+        is_write = np.zeros(len(sectors), dtype=bool) if is_write is None else np.asarray(is_write, dtype=bool)
+        writes = int(is_write.sum())
+        self.writes += writes
+        self.reads += len(sectors) - writes
+
+        mask = self._sampled(sectors)
+        for sector, write in zip(sectors[mask].tolist(), is_write[mask].tolist()):
+            self.access(sector, write)
+
+    def access(self, sector, is_write=False):
+        """Обробляє одне звернення до сектора, що вже пройшов вибірку"""
+        if self._time == self._tree.size:
+            self._compact()
+
+        tree = self._tree
+        previous = self._last.get(sector)
+        if not is_write:
+            self.sampled_reads += 1
+            if previous is None:
+                self.cold_misses += 1
+            else:
+                # Різні сектори з пізнішим останнім зверненням
+                distance = len(self._last) - tree.prefix(previous + 1)
+                distance = int(distance / self.sampling_rate)
+                self.distances[distance] = self.distances.get(distance, 0) + 1
+
+        if previous is not None:
+            tree.add(previous, -1)
+        tree.add(self._time, 1)
+        self._last[sector] = self._time
+        self._time += 1
+
+    def _compact(self):
+        """Перенумеровує останні звернення підряд і за потреби збільшує дерево"""
+        order = sorted(self._last, key=self._last.get)
+        capacity = max(self._tree.size, 2 * len(order))
+        self._tree = _Fenwick(capacity)
+        for position, sector in enumerate(order):
+            self._last[sector] = position
+            self._tree.add(position, 1)
+        self._time = len(order)
+
+    def miss_ratio(self, sizes):
+        """
+        Частка промахів читань для кожного розміру кешу
+
+        Args:
+            sizes: Розміри кешу (секторів)
+
+        Returns:
+            np.ndarray: Частки промахів (0..1)
+        """
+        sizes = np.asarray(sizes, dtype=np.int64)
+        if self.sampled_reads == 0:
+            return np.ones(len(sizes))
+
+        if self.distances:
+            distances = np.fromiter(self.distances, dtype=np.int64, count=len(self.distances))
+            counts = np.fromiter(self.distances.values(), dtype=np.int64, count=len(self.distances))
+            order = np.argsort(distances)
+            distances, counts = distances[order], counts[order]
+            # Читання з відстанню d влучає в кеш розміром > d
+            hits = np.cumsum(counts)
+            index = np.searchsorted(distances, sizes, side='left')
+            hit_counts = np.where(index > 0, hits[np.maximum(index - 1, 0)], 0).astype(np.float64)
+        else:
+            # Повторних звернень немає - усі читання є холодними промахами
+            hit_counts = np.zeros(len(sizes))
+
+        sampled = self.sampled_reads
+        if self.sampling_rate < 1:
+            # SHARDS-adj: відхилення розміру вибірки від очікуваного
+            # відносимо до найменших відстаней
+            expected = self.reads * self.sampling_rate
+            hit_counts = np.where(sizes > 0, hit_counts + (expected - sampled), hit_counts)
+            sampled = expected
+        return np.clip(1.0 - hit_counts / sampled, 0.0, 1.0)
+
+    def latency(self, sizes, controller: HDDController, disk_delay):
+        """
+        Оцінює середню затримку запиту контролера для кожного розміру кешу
+        з компонент затримок влучання та промаху
+
+        Args:
+            sizes: Розміри кешу
+            controller: Контролер, чиї затримки використовуються
+            disk_delay: Середня затримка дискової операції (мс)
+
+        Returns:
+            np.ndarray: Середня затримка на запит (мс)
+        """
+        miss = self.miss_ratio(sizes)
+        hit_delay = (controller.syscall_read_delay + controller.cache_access_delay +
+                     controller.user_process_read_delay)
+        miss_delay = (controller.syscall_read_delay + disk_delay +
+                      controller.interrupt_handling_delay + controller.user_process_read_delay)
+        if controller.write_back:
+            write_delay = (controller.syscall_write_delay + controller.user_process_write_delay +
+                           controller.cache_access_delay)
+        else:
+            write_delay = (controller.syscall_write_delay + controller.user_process_write_delay +
+                           disk_delay + controller.interrupt_handling_delay)
+
+        read_delay = (1 - miss) * hit_delay + miss * miss_delay
+        total = self.reads + self.writes
+        if total == 0:
+            return np.zeros(len(miss))
+        return (self.reads * read_delay + self.writes * write_delay) / total
+
+
+def profile_trace(path, sizes, sampling_rate=1.0, fmt=None, controller=None, chunk_size=65536):
+    """
+    Будує криву промахів та оцінку затримок траси за один прохід.
+    Запит із кількох секторів, як і в replay, розгортається у звернення
+    до кожного сектора - і для кривої, і для затримки диска; частки
+    промахів і затримки рахуються на звернення до сектора
+
+    Returns:
+        tuple: (MissRatioCurve, масив часток промахів, масив середніх затримок)
+    """
+    controller = controller or HDDController(collect_metrics=False)
+    hdd = controller.hdd
+    if isinstance(hdd, DiskArray):
+        raise ValueError("Оцінка затримок для масиву дисків не підтримується")
+    mrc = MissRatioCurve(sampling_rate)
+    # Окремий диск тієї ж геометрії: середня затримка операції на цій трасі
+    disk = HDD(rpm=hdd.rpm, rotation_model=hdd.rotation_model, geometry=hdd.geometry)
+    operations = 0
+    disk_total = 0.0
+
+    for sectors, writes in _trace_accesses(path, fmt, chunk_size, hdd.sector_size):
+        mrc.feed(sectors, writes)
+        delays, _ = disk.simulate_batch(sectors, writes)
+        operations += len(delays)
+        disk_total += float(delays.sum())
+
+    disk_delay = disk_total / operations if operations else 0.0
+    return mrc, mrc.miss_ratio(sizes), mrc.latency(sizes, controller, disk_delay)
+
+
+def _trace_accesses(path, fmt, chunk_size, sector_size):
+    """Генератор порцій (масив секторів, масив ознак запису) звернень траси будь-якого формату"""
+    if (fmt or path.rsplit('.', 1)[-1]).lower() == 'bin':
+        for chunk in TraceFile(path).iter_chunks(chunk_size):
+            yield split_requests(chunk['sector'], chunk['op'] == OP_WRITE,
+                                 request_sectors(chunk['size'], sector_size))
+        return
+
+    for chunk in iter_chunks(open_trace(path, fmt), chunk_size):
+        sectors = np.fromiter((record.sector for record in chunk), dtype=np.int64, count=len(chunk))
+        writes = np.fromiter((record.is_write for record in chunk), dtype=bool, count=len(chunk))
+        sizes = np.fromiter((record.size for record in chunk), dtype=np.int64, count=len(chunk))
+        yield split_requests(sectors, writes, request_sectors(sizes, sector_size))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Крива промахів кешу за один прохід траси")
+    parser.add_argument('trace', help="Шлях до траси (.jsonl, .csv або .bin)")
+    parser.add_argument('--format', default=None, help="Формат траси (jsonl, csv, bin)")
+    parser.add_argument('--sizes', default='5,10,20,50,100,200,500,1000,2000,5000,10000',
+                        help="Розміри кешу через кому")
+    parser.add_argument('--sampling', type=float, default=1.0, help="Частка вибірки SHARDS")
+    parser.add_argument('--rpm', type=int, default=7500)
+    parser.add_argument('--sectors', type=int, default=500, help="Секторів на доріжці")
+    parser.add_argument('--tracks', type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    controller = HDDController(rpm=args.rpm, sectors_num=args.sectors, tracks_num=args.tracks,
+                               collect_metrics=False)
+    mrc, miss, latency = profile_trace(args.trace, sizes, args.sampling, args.format, controller)
+
+    print(f"Читань: {mrc.reads}, записів: {mrc.writes}, у вибірці: {mrc.sampled_reads}")
+    print(f"{'розмір кешу':>12} | {'промахи, %':>10} | {'затримка, мс':>12}")
+    print("-" * 40)
+    for size, ratio, delay in zip(sizes, miss, latency):
+        print(f"{size:>12} | {ratio * 100:>10.2f} | {delay:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
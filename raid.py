@@ -0,0 +1,430 @@
+"""
+Масив дисків: JBOD, RAID-0, RAID-1 та RAID-5.
+
+DiskArray відображає абсолютні (логічні) сектори на диски-учасники,
+кожен з яких - окремий HDD з власною позицією головки. ArrayScheduler
+має інтерфейс планувальника (submit/submit_many/drain/add_request) і
+для кожного диска тримає окрему чергу звичайного планувальника.
+
+Диски працюють паралельно у віртуальному часі: кожен має власний
+годинник, а логічний запит завершується, коли завершено всі його
+частини. Тому затримка смуги - максимум по дисках, читання з дзеркала
+йде на диск з найменшою очікуваною затримкою (найближча головка з
+урахуванням зайнятості), а малий запис у RAID-5 виконується як
+читання-модифікація-запис: читання старих даних і парності, потім
+запис нових даних і перерахованої парності.
+"""
+from collections import deque
+from dataclasses import dataclass
+import numpy as np
+
+from hard_drive import HDD
+from access_planners import DiskRequest
+
+RAID_LEVELS = ('JBOD', 'RAID0', 'RAID1', 'RAID5')
+
+
+class DiskArray:
+    def __init__(self, level='RAID0', disks=4, stripe_size=8, rpm=7500, sectors_num=500,
+                 track_num=10000, storage='sparse', storage_path=None, rotation_model='average', geometry=None):
+        """
+        Args:
+            level: Рівень масиву ('JBOD', 'RAID0', 'RAID1' або 'RAID5')
+            disks: Кількість дисків
+            stripe_size: Розмір смуги на одному диску (секторів) для RAID-0/5
+            rpm, sectors_num, track_num: Параметри кожного диска
+            storage: Тип сховища секторів дисків
+            storage_path: Префікс шляху образів для 'memmap' (до нього додається номер диска)
+            rotation_model: Модель очікування обертання дисків ('average' або 'exact')
+            geometry: Геометрія кожного диска (geometry.Geometry); якщо задана,
+                sectors_num і track_num ігноруються
+        """
+        level = level.upper().replace('-', '')
+        if level not in RAID_LEVELS:
+            raise ValueError(f"Невідомий рівень масиву: {level}")
+        min_disks = {'JBOD': 1, 'RAID0': 2, 'RAID1': 2, 'RAID5': 3}[level]
+        if disks < min_disks:
+            raise ValueError(f"{level} потребує щонайменше {min_disks} дисків")
+        if stripe_size < 1:
+            raise ValueError("Розмір смуги має бути додатним")
+
+        self.level = level
+        self.stripe_size = stripe_size
+        self.members = [
+            HDD(rpm=rpm, sectors_num=sectors_num, track_num=track_num, storage=storage,
+                storage_path=f"{storage_path}.{index}" if storage_path else None,
+                rotation_model=rotation_model, geometry=geometry)
+            for index in range(disks)
+        ]
+        self.member_sectors = self.members[0].total_sectors
+
+        # Логічна геометрія: доріжки масиву мають стільки ж секторів, як доріжки диска
+        if level == 'RAID1':
+            data_disks = 1
+        elif level == 'RAID5':
+            data_disks = disks - 1
+        else:
+            data_disks = disks
+        self.data_disks = data_disks
+        self.sectors_per_track = self.members[0].sectors_per_track
+        self.track_number = self.members[0].track_number * data_disks
+        self.total_sectors = self.member_sectors * data_disks
+        self.sector_size = self.members[0].sector_size
+        self.rw_head_position = 0   # логічна доріжка останнього запиту
+        self._metrics = None
+
+    @property
+    def metrics(self):
+        return self._metrics
+
+    @metrics.setter
+    def metrics(self, metrics):
+        # Відстані переміщення головок записуються для всіх дисків
+        self._metrics = metrics
+        for member in self.members:
+            member.metrics = metrics
+
+    def track_of(self, abs_sector_num):
+        """Логічна доріжка сектора"""
+        return abs_sector_num // self.sectors_per_track
+
+    def track_end(self, abs_sector_num):
+        """
+        Перший логічний сектор після суміжного діапазону, що лежить
+        на одній доріжці одного диска (межа для читання кількох секторів)
+        """
+        member, member_sector = self.locate(abs_sector_num)
+        track_left = self.members[member].track_end(member_sector) - member_sector
+        if self.level in ('RAID0', 'RAID5'):
+            strip_left = self.stripe_size - abs_sector_num % self.stripe_size
+            return abs_sector_num + min(strip_left, track_left)
+        return abs_sector_num + track_left
+
+    def _check(self, abs_sector_num):
+        if not (0 <= abs_sector_num < self.total_sectors):
+            raise ValueError("Невірний номер сектора")
+
+    def locate(self, abs_sector_num):
+        """
+        Повертає (номер диска, сектор на диску) з даними логічного сектора;
+        для RAID-1 - розташування на першому дзеркалі
+        """
+        self._check(abs_sector_num)
+        if self.level == 'JBOD':
+            return divmod(abs_sector_num, self.member_sectors)
+        if self.level == 'RAID1':
+            return 0, abs_sector_num
+
+        strip, offset = divmod(abs_sector_num, self.stripe_size)
+        row, index = divmod(strip, self.data_disks)
+        if self.level == 'RAID5':
+            # Парність зсувається по дисках від рядка до рядка
+            if index >= self.parity_disk(row):
+                index += 1
+        return index, row * self.stripe_size + offset
+
+    def parity_disk(self, row):
+        """Диск з парністю рядка смуг RAID-5"""
+        return len(self.members) - 1 - row % len(self.members)
+
+    def locate_parity(self, abs_sector_num):
+        """Повертає (номер диска, сектор на диску) парності логічного сектора RAID-5"""
+        strip, offset = divmod(abs_sector_num, self.stripe_size)
+        row = strip // self.data_disks
+        return self.parity_disk(row), row * self.stripe_size + offset
+
+    def peek_sector(self, abs_sector_num):
+        """Повертає дані логічного сектора без моделювання затримки"""
+        member, member_sector = self.locate(abs_sector_num)
+        return self.members[member].peek_sector(member_sector)
+
+    def advance_clock(self, idle_time):
+        for member in self.members:
+            member.advance_clock(idle_time)
+
+    def flush(self):
+        for member in self.members:
+            member.flush()
+
+    def close(self):
+        for member in self.members:
+            member.close()
+
+
+@dataclass
+class _ArrayJob:
+    request: DiskRequest    # логічний запит
+    submit_time: float
+    remaining: int = 0      # незавершені частини поточної фази
+    completion: float = 0.0
+    failed: bool = False
+    parts: list = None      # завершені частини фази читання RAID-5
+    parity: tuple = None    # (диск, сектор) парності запису RAID-5
+
+
+class ArrayScheduler:
+    """
+    Планувальник масиву: розбиває логічні запити на запити до дисків,
+    ставить їх у черги планувальників дисків і обробляє диски
+    паралельно у віртуальному часі
+    """
+
+    def __init__(self, array: DiskArray, scheduler_factory):
+        """
+        Args:
+            array: Масив дисків
+            scheduler_factory: Виклик hdd -> планувальник (напр. LOOKScheduler)
+        """
+        self.array = array
+        self.hdd = array
+        self.schedulers = [scheduler_factory(member) for member in array.members]
+        # Черги дисків не обмежуються: масив сам розподіляє роботу
+        self.max_queue_depth = None
+
+        self.now = 0.0                                  # час подання нових запитів
+        self.clocks = [0.0] * len(array.members)        # час звільнення кожного диска
+        self.busy_time = [0.0] * len(array.members)
+        self._jobs = {}     # id(логічного запиту) -> _ArrayJob
+        self._parts = {}    # id(запиту до диска) -> (_ArrayJob, номер диска, фаза, час готовності)
+        self._completed = []
+        self._parity_locks = {}     # (диск, сектор) парності -> записи RAID-5, що чекають
+
+    def submit(self, sector, is_write=False, data=None, count=1, pid=None, submit_time=None):
+        """Ставить логічний запит у черги дисків без обробки і повертає його"""
+        request = DiskRequest(sector=sector, is_write=is_write, data=data, count=count, pid=pid,
+                              submit_time=submit_time)
+        self._admit(request)
+        return request
+
+    def submit_many(self, requests):
+        """
+        Ставить у чергу пакет запитів
+
+        Args:
+            requests: Ітерований набір DiskRequest або кортежів (sector, is_write, data)
+
+        Returns:
+            list: Поставлені в чергу запити в порядку подання
+        """
+        submitted = []
+        for request in requests:
+            if not isinstance(request, DiskRequest):
+                request = DiskRequest(*request)
+            self._admit(request)
+            submitted.append(request)
+        return submitted
+
+    def _admit(self, request):
+        array = self.array
+        array._check(request.sector)
+        job = _ArrayJob(request=request, submit_time=self.now)
+        self._jobs[id(request)] = job
+        array.rw_head_position = array.track_of(request.sector)
+
+        if not request.is_write:
+            member, member_sector = self._read_target(request.sector)
+            self._submit_part(job, member, member_sector, False, None, request.count, 'read', self.now)
+        elif array.level == 'RAID1':
+            for member in range(len(array.members)):
+                self._submit_part(job, member, request.sector, True, request.data, 1, 'write', self.now)
+        elif array.level == 'RAID5':
+            # Записи з спільною парністю виконуються по черзі, інакше
+            # паралельні читання-модифікації-записи втратили б оновлення парності
+            job.parity = array.locate_parity(request.sector)
+            waiting = self._parity_locks.get(job.parity)
+            if waiting is not None:
+                waiting.append(job)
+            else:
+                self._parity_locks[job.parity] = deque()
+                self._start_rmw(job, self.now)
+        else:
+            member, member_sector = array.locate(request.sector)
+            self._submit_part(job, member, member_sector, True, request.data, 1, 'write', self.now)
+
+    def _start_rmw(self, job, ready_time):
+        """Читання-модифікація-запис RAID-5: спершу читаються старі дані та парність"""
+        data_member, data_sector = self.array.locate(job.request.sector)
+        parity_member, parity_sector = job.parity
+        job.parts = []
+        self._submit_part(job, data_member, data_sector, False, None, 1, 'old_data', ready_time)
+        self._submit_part(job, parity_member, parity_sector, False, None, 1, 'old_parity', ready_time)
+
+    def _read_target(self, sector):
+        """Диск для читання: для дзеркала - з найменшою очікуваною затримкою"""
+        array = self.array
+        if array.level != 'RAID1':
+            return array.locate(sector)
+
+        best, best_time = 0, None
+        for index, member in enumerate(array.members):
+            # Запити, що вже чекають у черзі диска, оцінюються без переміщення головки
+            backlog = len(self.schedulers[index]) * (member.rotation_delay + member.rw_delay)
+            seek = member.seek_time(abs(member.rw_head_position - member.track_of(sector)))
+            ready = max(self.clocks[index], self.now) + backlog + seek
+            if best_time is None or ready < best_time:
+                best, best_time = index, ready
+        return best, sector
+
+    def _submit_part(self, job, member, member_sector, is_write, data, count, phase, ready_time):
+        part = self.schedulers[member].submit(member_sector, is_write=is_write, data=data, count=count,
+                                              pid=job.request.pid)
+        self._parts[id(part)] = (job, member, phase, ready_time)
+        job.remaining += 1
+
+    def __getstate__(self):
+        # Словники за id() зберігаються як списки об'єктів: після відновлення
+        # зі знімка id інші
+        state = self.__dict__.copy()
+        state['_jobs'] = list(self._jobs.values())
+        state['_parts'] = [(part, self._parts[id(part)])
+                           for scheduler in self.schedulers
+                           for queued in scheduler.queue
+                           for part in queued.parts()]
+        return state
+
+    def __setstate__(self, state):
+        state['_jobs'] = {id(job.request): job for job in state['_jobs']}
+        state['_parts'] = {id(part): value for part, value in state['_parts']}
+        self.__dict__.update(state)
+
+    def dispatch_next(self):
+        """
+        Обробляє запити дисків, доки не завершиться якийсь логічний запит
+
+        Returns:
+            DiskRequest: Завершений логічний запит або None, якщо черги порожні
+        """
+        while not self._completed:
+            # Наступним працює диск, що звільняється найраніше
+            member = None
+            for index, scheduler in enumerate(self.schedulers):
+                if len(scheduler) and (member is None or self.clocks[index] < self.clocks[member]):
+                    member = index
+            if member is None:
+                return None
+
+            operation = self.schedulers[member].dispatch_next()
+            # Операція диска може обслуговувати кілька злитих запитів
+            parts = [(part, self._parts.pop(id(part))) for part in operation.parts()]
+            if operation.result is None:
+                service = 0.0
+            else:
+                service = operation.result if operation.is_write else operation.result[1]
+            start = max([self.clocks[member]] + [ready_time for _, (_, _, _, ready_time) in parts])
+            self.clocks[member] = start + service
+            self.busy_time[member] += service
+            for part, (job, _, phase, _) in parts:
+                if part.result is None:
+                    job.failed = True
+                self._part_done(job, part, member, phase, self.clocks[member])
+
+        return self._completed.pop(0)
+
+    def _part_done(self, job, part, member, phase, completion):
+        job.completion = max(job.completion, completion)
+        job.remaining -= 1
+        if phase in ('old_data', 'old_parity') and part.result is not None:
+            job.parts.append((phase, member, part.sector, part.result[0]))
+        if job.remaining:
+            return
+
+        request = job.request
+        if phase in ('old_data', 'old_parity') and not job.failed:
+            # Нова парність = стара парність ^ старі дані ^ нові дані
+            parts = {name: (index, sector, data) for name, index, sector, data in job.parts}
+            data_member, data_sector, old_data = parts['old_data']
+            parity_member, parity_sector, old_parity = parts['old_parity']
+            new_data = np.asarray(request.data, dtype=np.uint8)
+            new_parity = old_parity ^ old_data ^ new_data
+            job.parts = None
+            self._submit_part(job, data_member, data_sector, True, new_data, 1, 'write', job.completion)
+            self._submit_part(job, parity_member, parity_sector, True, new_parity, 1, 'write', job.completion)
+            return
+
+        del self._jobs[id(request)]
+        if job.parity is not None:
+            waiting = self._parity_locks[job.parity]
+            if waiting:
+                self._start_rmw(waiting.popleft(), job.completion)
+            else:
+                del self._parity_locks[job.parity]
+
+        delay = job.completion - job.submit_time
+        if job.failed:
+            request.result = None
+        elif request.is_write:
+            request.result = delay
+            request.data = None
+        else:
+            request.result = (part.result[0], delay)
+        request.done = True
+        self._completed.append(request)
+
+    def drain(self):
+        """
+        Обробляє всі запити черг дисків
+
+        Returns:
+            list: Завершені логічні запити в порядку завершення
+        """
+        completed = []
+        while True:
+            request = self.dispatch_next()
+            if request is None:
+                break
+            completed.append(request)
+        self.now = max(self.now, max(self.clocks))
+        return completed
+
+    def add_request(self, sector, is_write=False, data=None, count=1, pid=None):
+        """Ставить запит у черги та обробляє їх, доки цей запит не буде виконано"""
+        request = self.submit(sector, is_write, data, count, pid)
+        job = self._jobs[id(request)]
+        while not request.done:
+            if self.dispatch_next() is None:
+                break
+        # Наступний запит контролер подає після завершення цього
+        self.now = max(self.now, job.completion)
+        return request.result
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def get_statistics(self) -> dict:
+        """Повертає час роботи масиву та завантаженість кожного диска"""
+        makespan = max(self.now, max(self.clocks))
+        return {
+            'level': self.array.level,
+            'disks': len(self.array.members),
+            'makespan': makespan,
+            'busy_time': list(self.busy_time),
+            'utilization': [busy / makespan if makespan > 0 else 0 for busy in self.busy_time],
+        }
+
+
+def compare_levels(requests=20_000, disks=4, queue_depth=32, write_ratio=0.3, seed=0):
+    """Порівнює пропускну здатність рівнів масиву на випадковому навантаженні"""
+    from access_planners import LOOKScheduler
+
+    rng = np.random.default_rng(seed)
+    payload = np.zeros(512, dtype=np.uint8)
+    for level in RAID_LEVELS:
+        array = DiskArray(level, disks=disks)
+        scheduler = ArrayScheduler(array, LOOKScheduler)
+        sectors = rng.integers(0, array.total_sectors, size=requests).tolist()
+        writes = (rng.random(requests) < write_ratio).tolist()
+
+        for start in range(0, requests, queue_depth):
+            scheduler.submit_many((sector, is_write, payload if is_write else None)
+                                  for sector, is_write in zip(sectors[start:start + queue_depth],
+                                                              writes[start:start + queue_depth]))
+            scheduler.drain()
+
+        stats = scheduler.get_statistics()
+        throughput = requests / stats['makespan'] * 1000
+        utilization = sum(stats['utilization']) / len(stats['utilization'])
+        print(f"{level:<6} | {throughput:>10,.0f} запитів/с | завантаженість дисків {utilization * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    compare_levels()
@@ -0,0 +1,121 @@
+"""
+Адаптивне попереднє читання (read-ahead).
+
+Для кожного процесу відстежується потік звернень: якщо процес читає
+сектори з однаковим додатним кроком (послідовно або з кроком stride),
+при промаху кешу разом із запитаним сектором за одну дискову операцію
+читаються наступні сектори потоку на тій самій доріжці. Розмір вікна
+подвоюється, коли більшість попередньо прочитаних секторів справді
+використовується, і зменшується вдвічі, коли вони витрачаються марно.
+"""
+from dataclasses import dataclass, field
+
+
+@dataclass
+class Stream:
+    last_sector: int = None
+    stride: int = 0         # крок між останніми зверненнями
+    run: int = 0            # скільки разів поспіль крок повторився
+    window: int = 0         # поточний розмір вікна (секторів потоку)
+    prefetched: set = field(default_factory=set)   # ще не використані сектори останнього вікна
+    issued: int = 0         # сектори, прочитані наперед останнім вікном
+    used: int = 0           # з них використані процесом
+
+
+class ReadAhead:
+    def __init__(self, initial_window=8, min_window=2, max_window=64, max_stride=64, min_run=1):
+        """
+        Args:
+            initial_window: Початковий розмір вікна (секторів)
+            min_window: Найменший розмір вікна
+            max_window: Найбільший розмір вікна
+            max_stride: Найбільший крок, для якого потік вважається strided
+            min_run: Скільки повторів кроку потрібно для запуску попереднього читання
+                (для послідовного потоку перше ж звернення до наступного сектора - повтор)
+        """
+        if not 1 <= min_window <= initial_window <= max_window:
+            raise ValueError("Має виконуватися 1 <= min_window <= initial_window <= max_window")
+
+        self.initial_window = initial_window
+        self.min_window = min_window
+        self.max_window = max_window
+        self.max_stride = max_stride
+        self.min_run = min_run
+        self.streams = {}   # pid -> Stream
+
+        # Статистика
+        self.prefetched = 0
+        self.used = 0
+        self.operations = 0
+
+    def observe(self, pid, sector):
+        """Враховує звернення процесу до сектора (і до влучання, і до промаху кешу)"""
+        stream = self.streams.get(pid)
+        if stream is None:
+            stream = Stream(window=self.initial_window)
+            self.streams[pid] = stream
+
+        if sector in stream.prefetched:
+            stream.prefetched.discard(sector)
+            stream.used += 1
+            self.used += 1
+
+        if stream.last_sector is not None:
+            delta = sector - stream.last_sector
+            if delta == stream.stride:
+                stream.run += 1
+            else:
+                stream.stride = delta
+                stream.run = 1 if delta == 1 else 0
+        stream.last_sector = sector
+
+    def plan(self, pid, sector, track_end):
+        """
+        Визначає попереднє читання для промаху кешу
+
+        Args:
+            pid: Ідентифікатор процесу
+            sector: Запитаний сектор (вже врахований через observe)
+            track_end: Перший сектор наступної доріжки
+
+        Returns:
+            tuple: (кількість суміжних секторів для читання, починаючи з sector;
+            список секторів, що додаються в кеш наперед)
+        """
+        stream = self.streams.get(pid)
+        if stream is None or stream.run < self.min_run or not 0 < stream.stride <= self.max_stride:
+            return 1, []
+
+        self._adapt(stream)
+
+        stride = stream.stride
+        prefetch = list(range(sector + stride, min(track_end, sector + stride * stream.window + 1), stride))
+        stream.prefetched = set(prefetch)
+        stream.issued = len(prefetch)
+        stream.used = 0
+        if not prefetch:
+            return 1, []
+
+        self.prefetched += len(prefetch)
+        self.operations += 1
+        return prefetch[-1] - sector + 1, prefetch
+
+    def _adapt(self, stream):
+        """Змінює вікно за часткою використаних секторів попереднього вікна"""
+        if not stream.issued:
+            return
+        ratio = stream.used / stream.issued
+        if ratio >= 0.75:
+            stream.window = min(stream.window * 2, self.max_window)
+        elif ratio < 0.25:
+            stream.window = max(stream.window // 2, self.min_window)
+
+    def get_statistics(self) -> dict:
+        """Повертає статистику попереднього читання"""
+        return {
+            'streams': len(self.streams),
+            'operations': self.operations,
+            'prefetched': self.prefetched,
+            'used': self.used,
+            'accuracy': (self.used / self.prefetched * 100) if self.prefetched > 0 else 0,
+        }
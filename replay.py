@@ -0,0 +1,441 @@
+"""
+Потокове відтворення траси запитів через HDDController.
+
+Траса читається ліниво (генератором) по одному запису, тому в пам'яті
+перебуває лише поточна порція запитів незалежно від розміру траси.
+
+Формат запису JSONL (поля, крім sector, необов'язкові):
+    {"timestamp": 0.5, "pid": "FinAnalytics", "sector": 3000, "op": "read", "size": 512}
+CSV - ті самі поля в заголовку.
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+from dataclasses import dataclass
+from itertools import islice
+import numpy as np
+
+from controller import HDDController
+from storage import SECTOR_SIZE
+
+
+@dataclass
+class TraceRecord:
+    sector: int
+    is_write: bool = False
+    pid: object = None
+    timestamp: float = 0.0
+    size: int = 512
+
+
+def _parse_op(op):
+    op = str(op).lower()
+    if op in ('w', 'write'):
+        return True
+    if op in ('r', 'read'):
+        return False
+    raise ValueError(f"Невідомий тип операції: {op}")
+
+
+def _make_record(fields):
+    return TraceRecord(sector=int(fields['sector']),
+                       is_write=_parse_op(fields.get('op', 'read')),
+                       pid=fields.get('pid'),
+                       timestamp=float(fields.get('timestamp', 0.0) or 0.0),
+                       size=int(fields.get('size', 512) or 512))
+
+
+def iter_jsonl(path):
+    """Генератор записів траси з JSONL-файлу"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield _make_record(json.loads(line))
+
+
+def iter_csv(path):
+    """Генератор записів траси з CSV-файлу із заголовком"""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            yield _make_record(row)
+
+
+TRACE_READERS = {
+    'jsonl': iter_jsonl,
+    'csv': iter_csv,
+}
+
+
+def open_trace(path, fmt=None):
+    """
+    Відкриває трасу для потокового читання
+
+    Args:
+        path: Шлях до файлу траси
+        fmt: Формат ('jsonl', 'csv' або 'bin'); за замовчуванням - за розширенням файлу
+
+    Returns:
+        Генератор TraceRecord
+    """
+    if fmt is None:
+        fmt = path.rsplit('.', 1)[-1].lower()
+    if fmt == 'bin':
+        # Імпорт тут, бо trace_format сам використовує читачі цього модуля
+        from trace_format import iter_binary
+        return iter_binary(path)
+    reader = TRACE_READERS.get(fmt)
+    if reader is None:
+        raise ValueError(f"Невідомий формат траси: {fmt}")
+    return reader(path)
+
+
+def iter_chunks(records, chunk_size):
+    """Розбиває потік записів на порції не більші за chunk_size"""
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class ReplaySink:
+    """Базовий приймач результатів відтворення"""
+
+    def record(self, record, delay, hit):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class JSONLSink(ReplaySink):
+    """Записує результат кожного запиту рядком JSONL"""
+
+    def __init__(self, path):
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def record(self, record, delay, hit):
+        self.file.write(json.dumps({
+            'timestamp': record.timestamp,
+            'pid': record.pid,
+            'sector': record.sector,
+            'op': 'write' if record.is_write else 'read',
+            'delay': delay,
+            'hit': hit,
+        }) + '\n')
+
+    def close(self):
+        self.file.close()
+
+
+class CSVSink(ReplaySink):
+    """Записує результат кожного запиту рядком CSV"""
+
+    def __init__(self, path):
+        self.file = open(path, 'w', encoding='utf-8', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(['timestamp', 'pid', 'sector', 'op', 'delay', 'hit'])
+
+    def record(self, record, delay, hit):
+        self.writer.writerow([record.timestamp, record.pid, record.sector,
+                              'write' if record.is_write else 'read', delay, int(hit)])
+
+    def close(self):
+        self.file.close()
+
+
+class SummarySink(ReplaySink):
+    """Накопичує підсумкові лічильники за сталий обсяг пам'яті"""
+
+    def __init__(self):
+        self.reads = 0
+        self.writes = 0
+        self.read_delay = 0.0
+        self.write_delay = 0.0
+        self.max_delay = 0.0
+
+    def record(self, record, delay, hit):
+        if record.is_write:
+            self.writes += 1
+            self.write_delay += delay
+        else:
+            self.reads += 1
+            self.read_delay += delay
+        if delay > self.max_delay:
+            self.max_delay = delay
+
+    def summary(self) -> dict:
+        return {
+            'reads': self.reads,
+            'writes': self.writes,
+            'mean_read_delay': self.read_delay / self.reads if self.reads else 0,
+            'mean_write_delay': self.write_delay / self.writes if self.writes else 0,
+            'max_delay': self.max_delay,
+        }
+
+
+class ProgressReporter:
+    """Періодично виводить кількість оброблених запитів і швидкість відтворення"""
+
+    def __init__(self, every=100_000, stream=sys.stderr):
+        self.every = every
+        self.stream = stream
+        self.start = time.perf_counter()
+        self.next_report = every
+
+    def update(self, processed):
+        if processed < self.next_report:
+            return
+        elapsed = time.perf_counter() - self.start
+        rate = processed / elapsed if elapsed > 0 else 0
+        print(f"Оброблено {processed} запитів ({rate:,.0f} запитів/с)", file=self.stream)
+        self.next_report = (processed // self.every + 1) * self.every
+
+
+def request_sectors(size, sector_size=SECTOR_SIZE):
+    """Кількість секторів запиту розміром size байт (щонайменше один); size - число або масив"""
+    if isinstance(size, np.ndarray):
+        return np.maximum(1, (size.astype(np.int64) + sector_size - 1) // sector_size)
+    return max(1, (size + sector_size - 1) // sector_size)
+
+
+def split_requests(sectors, is_write, counts):
+    """
+    Розгортає запити (перший сектор, ознака запису, кількість секторів) у
+    звернення до окремих секторів - так запит із кількох секторів
+    обслуговує replay
+
+    Returns:
+        tuple: (масив секторів, масив ознак запису); якщо всі запити
+        однесекторні, повертаються вхідні масиви без копіювання
+    """
+    sectors = np.asarray(sectors, dtype=np.int64)
+    counts = np.asarray(counts, dtype=np.int64)
+    if not counts.size or counts.max() == 1:
+        return sectors, is_write
+    # Зсув кожного звернення від першого сектора свого запиту
+    offsets = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(sectors, counts) + offsets, np.repeat(is_write, counts)
+
+
+def replay(controller, records, sinks=(), chunk_size=4096, progress=None):
+    """
+    Відтворює потік записів траси через контролер
+
+    Послідовні читання всередині порції подаються пакетом через
+    read_sectors, тож планувальник бачить реальну глибину черги;
+    записи виконуються в порядку траси. Запит розміром size байт
+    охоплює відповідну кількість суміжних секторів, і його затримка -
+    сума затримок цих секторів.
+
+    Args:
+        controller: HDDController
+        records: Ітерований потік TraceRecord
+        sinks: Приймачі результатів
+        chunk_size: Розмір порції записів
+        progress: ProgressReporter або None
+
+    Returns:
+        int: Кількість оброблених запитів
+    """
+    payload = np.zeros(controller.hdd.sector_size, dtype=np.uint8)
+    sector_size = controller.hdd.sector_size
+    processed = 0
+
+    for chunk in iter_chunks(records, chunk_size):
+        reads = []
+        for record in chunk:
+            count = request_sectors(record.size, sector_size)
+            if record.is_write:
+                _flush_reads(controller, reads, sinks)
+                delay = _write_request(controller, record.sector, count, payload)
+                for sink in sinks:
+                    sink.record(record, delay, False)
+            else:
+                reads.append((record, count))
+        _flush_reads(controller, reads, sinks)
+
+        processed += len(chunk)
+        if progress is not None:
+            progress.update(processed)
+
+    # Відкладені записи мають потрапити на диск до кінця відтворення
+    if controller.write_back:
+        controller.flush()
+
+    return processed
+
+
+def replay_binary(controller, trace, sinks=(), chunk_size=4096, progress=None):
+    """
+    Відтворює бінарну трасу (trace_format.TraceFile) так само, як replay,
+    але без TraceRecord на кожен запис: порції memmap розбираються
+    стовпчиками. Записи траси створюються лише для приймачів, якщо їх задано.
+
+    Returns:
+        int: Кількість оброблених запитів
+    """
+    from trace_format import OP_WRITE
+
+    payload = np.zeros(controller.hdd.sector_size, dtype=np.uint8)
+    sector_size = controller.hdd.sector_size
+    processed = 0
+
+    for chunk in trace.iter_chunks(chunk_size):
+        sectors = chunk['sector'].tolist()
+        writes = (chunk['op'] == OP_WRITE).tolist()
+        counts = request_sectors(chunk['size'], sector_size).tolist()
+        pids = [trace.pid_name(pid) for pid in chunk['pid'].tolist()]
+        records = None
+        if sinks:
+            records = [TraceRecord(sector=sector, is_write=write, pid=pid, timestamp=timestamp, size=size)
+                       for sector, write, pid, timestamp, size in zip(
+                           sectors, writes, pids, chunk['timestamp'].tolist(), chunk['size'].tolist())]
+
+        read_sectors, read_pids, read_counts, read_indices = [], [], [], []
+        for index, sector in enumerate(sectors):
+            count = counts[index]
+            if writes[index]:
+                if read_sectors:
+                    _read_requests(controller, read_sectors, read_pids, read_counts, read_indices,
+                                   records, sinks)
+                    read_sectors, read_pids, read_counts, read_indices = [], [], [], []
+                delay = _write_request(controller, sector, count, payload)
+                for sink in sinks:
+                    sink.record(records[index], delay, False)
+            else:
+                read_sectors.extend(range(sector, sector + count))
+                read_pids.extend([pids[index]] * count)
+                read_counts.append(count)
+                read_indices.append(index)
+        if read_sectors:
+            _read_requests(controller, read_sectors, read_pids, read_counts, read_indices, records, sinks)
+
+        processed += len(sectors)
+        if progress is not None:
+            progress.update(processed)
+
+    if controller.write_back:
+        controller.flush()
+
+    return processed
+
+
+def _write_request(controller, sector, count, payload):
+    """Записує count суміжних секторів і повертає сумарну затримку"""
+    delay = 0.0
+    for offset in range(count):
+        delay += controller.write_sector(sector + offset, payload)[0]
+    return delay
+
+
+def _read_requests(controller, sectors, pids, counts, indices, records, sinks):
+    """Виконує читання секторів кількох запитів одним пакетом і передає результати приймачам"""
+    results = controller.read_sectors(sectors, pids=pids)
+    if not sinks:
+        return
+    position = 0
+    for index, count in zip(indices, counts):
+        parts = results[position:position + count]
+        position += count
+        delay = sum(part[1] for part in parts)
+        hit = all(part[2] for part in parts)
+        for sink in sinks:
+            sink.record(records[index], delay, hit)
+
+
+def _flush_reads(controller, reads, sinks):
+    """Виконує накопичені читання (пари запис траси, кількість секторів) одним пакетом"""
+    if not reads:
+        return
+    sectors, pids, counts = [], [], []
+    for record, count in reads:
+        sectors.extend(range(record.sector, record.sector + count))
+        pids.extend([record.pid] * count)
+        counts.append(count)
+    _read_requests(controller, sectors, pids, counts, range(len(reads)),
+                   [record for record, _ in reads], sinks)
+    reads.clear()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Відтворення траси запитів через контролер HDD")
+    parser.add_argument('trace', help="Шлях до траси (.jsonl, .csv або .bin)")
+    parser.add_argument('--format', default=None, help="Формат траси (jsonl, csv, bin)")
+    parser.add_argument('--rpm', type=int, default=7500)
+    parser.add_argument('--sectors', type=int, default=500, help="Секторів на доріжці")
+    parser.add_argument('--tracks', type=int, default=10000)
+    parser.add_argument('--scheduler', default='LOOK')
+    parser.add_argument('--cache-policy', default='LFU')
+    parser.add_argument('--cache-left', type=int, default=5)
+    parser.add_argument('--cache-middle', type=int, default=10)
+    parser.add_argument('--cache-total', type=int, default=20)
+    parser.add_argument('--chunk-size', type=int, default=4096)
+    parser.add_argument('--readahead', action='store_true', help="Адаптивне попереднє читання")
+    parser.add_argument('--write-back', action='store_true', help="Відкладений запис з пакетним скиданням")
+    parser.add_argument('--dirty-ratio', type=float, default=0.5)
+    parser.add_argument('--flush-interval', type=float, default=None,
+                        help="Найбільший вік брудних даних до периодичного скидання (мс)")
+    parser.add_argument('--progress', type=int, default=100_000,
+                        help="Виводити швидкість кожні N запитів (0 - вимкнути)")
+    parser.add_argument('--output', default=None, help="Файл результатів (.jsonl або .csv)")
+    parser.add_argument('--from-snapshot', default=None,
+                        help="Почати зі стану знімка (параметри диска й кешу беруться зі знімка)")
+    parser.add_argument('--save-snapshot', default=None, help="Зберегти стан контролера після відтворення")
+    args = parser.parse_args(argv)
+
+    if args.from_snapshot:
+        controller = HDDController.load_snapshot(args.from_snapshot)
+    else:
+        controller = HDDController(rpm=args.rpm,
+                                   sectors_num=args.sectors,
+                                   tracks_num=args.tracks,
+                                   cache_left=args.cache_left,
+                                   cache_middle=args.cache_middle,
+                                   cache_total=args.cache_total,
+                                   scheduler_type=args.scheduler,
+                                   cache_policy=args.cache_policy,
+                                   readahead=args.readahead,
+                                   write_policy='back' if args.write_back else 'through',
+                                   dirty_ratio=args.dirty_ratio,
+                                   flush_interval=args.flush_interval)
+
+    summary = SummarySink()
+    sinks = [summary]
+    if args.output:
+        sinks.append(CSVSink(args.output) if args.output.endswith('.csv') else JSONLSink(args.output))
+
+    progress = ProgressReporter(args.progress) if args.progress else None
+
+    fmt = args.format or args.trace.rsplit('.', 1)[-1].lower()
+    try:
+        if fmt == 'bin':
+            from trace_format import TraceFile
+            processed = replay_binary(controller, TraceFile(args.trace), sinks,
+                                      chunk_size=args.chunk_size, progress=progress)
+        else:
+            processed = replay(controller, open_trace(args.trace, args.format), sinks,
+                               chunk_size=args.chunk_size, progress=progress)
+    finally:
+        for sink in sinks:
+            sink.close()
+
+    if args.save_snapshot:
+        controller.save_snapshot(args.save_snapshot)
+
+    stats = controller.get_statistics()
+    print(f"Оброблено запитів: {processed}")
+    print(f"Відсоток влучань: {stats['hit_rate']:.2f}%")
+    if stats['write_back'] is not None:
+        print(f"Скидань брудних секторів: {stats['write_back']['flushes']}, "
+              f"затримка скидань: {stats['write_back']['flush_delay']:.2f} мс")
+    for key, value in summary.summary().items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
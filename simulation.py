@@ -0,0 +1,295 @@
+"""
+Дискретно-подійне моделювання роботи контролера з віртуальним годинником.
+
+Події зберігаються в купі за часом настання. Процеси подають запити
+одночасно, диск обслуговує по одному запиту, а решта чекає в черзі
+планувальника. Затримки системного виклику, переривання та обробки
+даних процесом моделюються окремими подіями, тому час відгуку включає
+очікування в черзі.
+"""
+import heapq
+from dataclasses import dataclass
+import numpy as np
+
+from controller import HDDController
+
+
+@dataclass
+class SimJob:
+    process: str
+    sector: int
+    is_write: bool
+    data: np.ndarray = None
+    arrival_time: float = 0.0
+    enqueue_time: float = None      # постановка в чергу диска
+    dispatch_time: float = None     # початок обслуговування диском
+    service_time: float = None      # тривалість обслуговування диском
+    completion_time: float = None
+    hit: bool = False
+    on_complete: object = None      # виклик після завершення (для процесів замкненого циклу)
+
+    @property
+    def response_time(self):
+        return self.completion_time - self.arrival_time
+
+    @property
+    def queue_wait(self):
+        if self.enqueue_time is None:
+            return 0.0
+        return self.dispatch_time - self.enqueue_time
+
+
+class Simulator:
+    def __init__(self, controller: HDDController):
+        """
+        Args:
+            controller: Контролер, чиї кеш, планувальник, диск і затримки
+                використовуються в моделюванні
+        """
+        if controller.scheduler.max_queue_depth is not None:
+            # Блокування подавача обробляло б запити поза подіями моделювання
+            raise ValueError("Моделювання потребує планувальника з необмеженою чергою")
+        if controller.write_back:
+            # Записи подаються в планувальник напряму, в обхід брудних секторів контролера
+            raise ValueError("Моделювання підтримує лише режим запису write-through")
+
+        self.controller = controller
+        self.now = 0.0
+        self.events = []
+        self._sequence = 0
+
+        self.disk_busy = False
+        self.disk_busy_time = 0.0
+        self.disk_free_time = 0.0   # момент завершення останньої дискової операції
+        self._disk_jobs = {}    # id(DiskRequest) -> SimJob
+
+        self.completed = []
+        self.write_payload = np.zeros(controller.hdd.sector_size, dtype=np.uint8)
+
+    def schedule(self, delay, callback, *args):
+        """Планує виклик callback через delay мс віртуального часу"""
+        heapq.heappush(self.events, (self.now + delay, self._sequence, callback, args))
+        self._sequence += 1
+
+    def run(self, until=None):
+        """
+        Обробляє події в порядку часу
+
+        Args:
+            until: Момент зупинки (мс) або None - до вичерпання подій
+
+        Returns:
+            float: Поточний віртуальний час
+        """
+        while self.events:
+            if until is not None and self.events[0][0] > until:
+                self.now = until
+                break
+            self.now, _, callback, args = heapq.heappop(self.events)
+            callback(*args)
+        return self.now
+
+    # Процеси
+
+    def add_process(self, name, operations, start_time=0.0, think_time=0.0):
+        """
+        Додає процес замкненого циклу: кожна наступна операція подається
+        після завершення попередньої та паузи think_time
+
+        Args:
+            name: Ім'я процесу
+            operations: Ітерований набір пар (sector, is_write)
+        """
+        operations = iter(operations)
+        heapq.heappush(self.events, (start_time, self._sequence,
+                                     self._next_operation, (name, operations, think_time)))
+        self._sequence += 1
+
+    def add_arrivals(self, name, arrivals):
+        """
+        Додає процес відкритого циклу із заданими моментами надходження
+
+        Args:
+            name: Ім'я процесу
+            arrivals: Ітерований набір трійок (arrival_time, sector, is_write)
+        """
+        for arrival_time, sector, is_write in arrivals:
+            job = SimJob(process=name, sector=sector, is_write=is_write, arrival_time=arrival_time)
+            heapq.heappush(self.events, (arrival_time, self._sequence, self._arrive, (job, None)))
+            self._sequence += 1
+
+    def _next_operation(self, name, operations, think_time):
+        operation = next(operations, None)
+        if operation is None:
+            return
+        sector, is_write = operation
+        job = SimJob(process=name, sector=sector, is_write=is_write, arrival_time=self.now)
+        self._arrive(job, lambda: self.schedule(think_time, self._next_operation,
+                                                name, operations, think_time))
+
+    # Життєвий цикл запиту
+
+    def _arrive(self, job, on_complete):
+        job.on_complete = on_complete
+        if job.is_write:
+            # Процес формує дані, потім виконує системний виклик запису
+            job.data = self.write_payload
+            self.schedule(self.controller.user_process_write_delay + self.controller.syscall_write_delay,
+                          self._enqueue_disk, job)
+        else:
+            self.schedule(self.controller.syscall_read_delay, self._lookup_cache, job)
+
+    def _lookup_cache(self, job):
+        controller = self.controller
+        cached_data = controller.cache.get_sector(job.sector)
+        if cached_data is not None:
+            controller.cache_hits += 1
+            job.hit = True
+            self.schedule(controller.cache_access_delay + controller.user_process_read_delay,
+                          self._complete, job)
+            return
+
+        controller.cache_misses += 1
+        self._enqueue_disk(job)
+
+    def _enqueue_disk(self, job):
+        # Термін запиту відлічується від моменту подання, а не від годинника
+        # диска, що під час обслуговування іде попереду
+        request = self.controller.scheduler.submit(job.sector, job.is_write, job.data, pid=job.process,
+                                                   submit_time=self.now)
+        job.enqueue_time = self.now
+        self._disk_jobs[id(request)] = job
+        self._start_disk()
+
+    def _start_disk(self):
+        if self.disk_busy or not len(self.controller.scheduler):
+            return
+        # Під час простою пластина обертається далі
+        if self.now > self.disk_free_time:
+            self.controller.hdd.advance_clock(self.now - self.disk_free_time)
+
+        request = self.controller.scheduler.dispatch_next()
+        if request is None:
+            return
+
+        if request.result is None:
+            raise ValueError(f"Помилка обробки сектора {request.sector}")
+
+        # Злиті суміжні запити обслуговуються однією операцією
+        delay = request.result if request.is_write else request.result[1]
+        completions = []
+        for part in request.parts():
+            job = self._disk_jobs.pop(id(part))
+            job.dispatch_time = self.now
+            job.service_time = delay
+            completions.append((part, job))
+
+        self.disk_busy = True
+        self.disk_busy_time += delay
+        self.disk_free_time = self.now + delay
+        self.schedule(delay, self._disk_done, completions)
+
+    def _disk_done(self, completions):
+        self.disk_busy = False
+        controller = self.controller
+        for request, job in completions:
+            if job.is_write:
+                controller.cache.add_sector(job.sector, controller.hdd.peek_sector(job.sector))
+                self.schedule(controller.interrupt_handling_delay, self._complete, job)
+            else:
+                controller.cache.add_sector(job.sector, request.result[0])
+                self.schedule(controller.interrupt_handling_delay + controller.user_process_read_delay,
+                              self._complete, job)
+
+        self._start_disk()
+
+    def _complete(self, job):
+        job.completion_time = self.now
+        self.controller.total_delay += job.response_time
+        if self.controller.metrics is not None:
+            self._record_metrics(job)
+        self.completed.append(job)
+        if job.on_complete is not None:
+            job.on_complete()
+
+    def _record_metrics(self, job):
+        controller = self.controller
+        metrics = controller.metrics
+        queue_wait = job.queue_wait if not job.hit else None
+        if job.is_write:
+            metrics.record_request(True, job.response_time, syscall=controller.syscall_write_delay,
+                                   user_process=controller.user_process_write_delay, disk=job.service_time,
+                                   interrupt=controller.interrupt_handling_delay,
+                                   queue_wait=queue_wait, service_time=job.service_time)
+        elif job.hit:
+            metrics.record_request(False, job.response_time, syscall=controller.syscall_read_delay,
+                                   cache=controller.cache_access_delay,
+                                   user_process=controller.user_process_read_delay,
+                                   queue_wait=queue_wait, service_time=job.service_time)
+        else:
+            metrics.record_request(False, job.response_time, syscall=controller.syscall_read_delay,
+                                   disk=job.service_time, interrupt=controller.interrupt_handling_delay,
+                                   user_process=controller.user_process_read_delay,
+                                   queue_wait=queue_wait, service_time=job.service_time)
+
+    def get_statistics(self) -> dict:
+        """Повертає час відгуку, пропускну здатність та завантаженість диска"""
+        if not self.completed:
+            return {'completed': 0}
+
+        response = np.array([job.response_time for job in self.completed])
+        waits = np.array([job.queue_wait for job in self.completed])
+        makespan = max(job.completion_time for job in self.completed)
+
+        per_process = {}
+        for job in self.completed:
+            entry = per_process.setdefault(job.process, {'completed': 0, 'total_response': 0.0})
+            entry['completed'] += 1
+            entry['total_response'] += job.response_time
+        for entry in per_process.values():
+            entry['mean_response'] = entry['total_response'] / entry['completed']
+
+        return {
+            'completed': len(self.completed),
+            'makespan': makespan,
+            'throughput': len(self.completed) / makespan * 1000 if makespan > 0 else 0,
+            'mean_response': float(response.mean()),
+            'max_response': float(response.max()),
+            'mean_queue_wait': float(waits.mean()),
+            'disk_utilization': self.disk_busy_time / makespan if makespan > 0 else 0,
+            'processes': per_process,
+        }
+
+
+def simulate_processes():
+    """Одночасна робота процесів з main.py у віртуальному часі"""
+    controller = HDDController(rpm=300, sectors_num=1000, tracks_num=50000,
+                               cache_left=5, cache_middle=10, cache_total=20,
+                               scheduler_type='LOOK')
+    simulator = Simulator(controller)
+
+    processes = {
+        'FinAnalytics': ([3000, 45000], [3000, 3001, 3002, 45000, 45001, 45002]),
+        'DocProcessor': ([1000, 49999], [1000, 25000, 49999, 35000]),
+        'DataVis': ([15000], [15000, 30000, 42000]),
+    }
+    for name, (write_sectors, read_sectors) in processes.items():
+        operations = [(sector, True) for sector in write_sectors]
+        operations += [(sector, False) for sector in read_sectors]
+        simulator.add_process(name, operations)
+
+    simulator.run()
+    stats = simulator.get_statistics()
+
+    print(f"Виконано запитів: {stats['completed']}")
+    print(f"Час моделювання: {stats['makespan']:.2f} мс")
+    print(f"Пропускна здатність: {stats['throughput']:.2f} запитів/с")
+    print(f"Середній час відгуку: {stats['mean_response']:.2f} мс")
+    print(f"Середнє очікування в черзі: {stats['mean_queue_wait']:.2f} мс")
+    print(f"Завантаженість диска: {stats['disk_utilization'] * 100:.1f}%")
+    for name, entry in stats['processes'].items():
+        print(f"  {name}: {entry['completed']} запитів, середній відгук {entry['mean_response']:.2f} мс")
+
+
+if __name__ == "__main__":
+    simulate_processes()
@@ -0,0 +1,243 @@
+"""
+Знімок повного стану контролера для запуску вимірювань з прогрітого стану.
+
+Файл складається з 64-байтного заголовка, вирівняних за сторінкою масивів
+вмісту сховищ секторів, таблиці сховищ (JSON) та стану решти об'єктів
+контролера (pickle): сегментів кешу з лічильниками та часом звернень,
+черги й напрямку планувальника, позиції головки й годинника диска,
+попереднього читання, брудних секторів і статистики.
+
+Вміст дисків відновлюється через np.memmap у режимі копіювання під час
+запису: файл знімка не розбирається і не копіюється, а зміни відновленого
+контролера залишаються в його пам'яті. Тому один знімок після прогріву
+можна відновлювати багато разів (і в кількох процесах) для незалежних
+вимірювань. Дані секторів у кеші, що були представленнями сховища,
+відновлюються як представлення відновленого сховища.
+
+Знімок зберігає об'єкти модулів цієї версії коду і призначений для
+відновлення тією ж версією.
+"""
+import io
+import itertools
+import json
+import pickle
+import struct
+from bisect import bisect_right
+import numpy as np
+
+from storage import DenseStore, SparseStore, MemmapStore, readonly_view
+
+
+MAGIC = b'HDDSNAP\0'
+VERSION = 1
+HEADER_SIZE = 64
+ALIGNMENT = 4096
+# magic, версія, зміщення і довжина таблиці сховищ, зміщення і довжина стану
+_HEADER = struct.Struct('<8sIQQQQ')
+
+
+def _stores_of(controller):
+    """Сховища секторів контролера (по одному на диск масиву)"""
+    members = getattr(controller.hdd, 'members', None)
+    disks = members if members is not None else [controller.hdd]
+    return [disk.storage for disk in disks]
+
+
+def _address(array):
+    return array.__array_interface__['data'][0]
+
+
+class _SnapshotPickler(pickle.Pickler):
+    """
+    Замість сховищ і представлень їхніх даних записує посилання
+    (сховище, сектор); лічильники itertools.count - їхнє наступне значення
+    """
+
+    def __init__(self, file, stores, regions):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.store_ids = {id(store): index for index, store in enumerate(stores)}
+        # Відсортовані (початкова адреса, кінцева адреса, сховище, перший сектор або None для нульової сторінки)
+        self.regions = sorted(regions)
+        self.starts = [region[0] for region in self.regions]
+
+    def persistent_id(self, obj):
+        if isinstance(obj, np.ndarray):
+            return self._view_id(obj)
+        if isinstance(obj, (DenseStore, SparseStore, MemmapStore)):
+            return ('store', self.store_ids[id(obj)])
+        if isinstance(obj, itertools.count):
+            # repr лічильника - count(n), де n - наступне значення
+            return ('count', int(repr(obj)[6:-1]))
+        return None
+
+    def _view_id(self, array):
+        if not self.regions or array.size == 0 or not array.flags.c_contiguous:
+            return None
+        address = _address(array)
+        index = bisect_right(self.starts, address) - 1
+        if index < 0:
+            return None
+        start, end, store, first_sector, sector_size = self.regions[index]
+        if address + array.nbytes > end or (address - start) % sector_size or array.nbytes % sector_size:
+            return None
+        row = (address - start) // sector_size
+        sector = None if first_sector is None else first_sector + row
+        return ('view', store, sector, row, array.shape, array.flags.writeable)
+
+
+def save_snapshot(controller, path):
+    """
+    Зберігає повний стан контролера у файл знімка
+
+    Args:
+        controller: HDDController
+        path: Шлях до файлу знімка
+    """
+    stores = _stores_of(controller)
+    for store in stores:
+        store.flush()
+
+    with open(path, 'wb') as f:
+        f.write(b'\0' * HEADER_SIZE)
+        table = []
+        regions = []
+        for index, store in enumerate(stores):
+            entry = {'sectors_count': store.sectors_count,
+                     'sectors_per_track': store.sectors_per_track,
+                     'sector_size': store.sector_size}
+            if isinstance(store, SparseStore):
+                page_nums = sorted(store.pages)
+                entry.update(kind='sparse', pages=page_nums, offset=_write_aligned(
+                    f, [store.pages[page_num] for page_num in page_nums]))
+                for page_num in page_nums:
+                    page = store.pages[page_num]
+                    regions.append((_address(page), _address(page) + page.nbytes, index,
+                                    page_num * store.sectors_per_track, store.sector_size))
+                zero_page = store._zero_page
+                regions.append((_address(zero_page), _address(zero_page) + zero_page.nbytes, index,
+                                None, store.sector_size))
+            else:
+                entry.update(kind='memmap' if isinstance(store, MemmapStore) else 'dense',
+                             offset=_write_aligned(f, [store.data]))
+                regions.append((_address(store.data), _address(store.data) + store.data.nbytes, index,
+                                0, store.sector_size))
+            table.append(entry)
+
+        table_bytes = json.dumps(table).encode('utf-8')
+        table_offset = f.tell()
+        f.write(table_bytes)
+
+        state = io.BytesIO()
+        _SnapshotPickler(state, stores, regions).dump(controller)
+        state_offset = f.tell()
+        f.write(state.getbuffer())
+
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, VERSION, table_offset, len(table_bytes),
+                             state_offset, state.getbuffer().nbytes))
+
+
+def _write_aligned(f, arrays):
+    """Записує масиви підряд з межі сторінки і повертає зміщення першого"""
+    offset = -(-f.tell() // ALIGNMENT) * ALIGNMENT
+    f.write(b'\0' * (offset - f.tell()))
+    for array in arrays:
+        # Великі масиви (memmap-образи) записуються порціями без повної копії в пам'ять
+        for start in range(0, len(array), 65536):
+            f.write(np.ascontiguousarray(array[start:start + 65536]).tobytes())
+    return offset
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    def __init__(self, file, stores):
+        super().__init__(file)
+        self.stores = stores
+
+    def persistent_load(self, pid):
+        kind = pid[0]
+        if kind == 'store':
+            return self.stores[pid[1]]
+        if kind == 'count':
+            return itertools.count(pid[1])
+        if kind == 'view':
+            _, index, sector, row, shape, writeable = pid
+            store = self.stores[index]
+            rows = int(np.prod(shape[:-1])) if len(shape) > 1 else 1
+            if sector is None:
+                data = store._zero_page[row:row + rows]
+            else:
+                data = store.read_range(sector, rows)
+            data = data.reshape(shape)
+            return data if writeable else readonly_view(data)
+        raise pickle.UnpicklingError(f"Невідоме посилання у знімку: {kind}")
+
+
+def load_snapshot(path, storage_path=None):
+    """
+    Відновлює контролер зі знімка
+
+    Args:
+        path: Шлях до файлу знімка
+        storage_path: Для memmap-сховищ - шлях нового образу диска (для масиву
+            до нього додається номер диска), куди копіюється вміст знімка і
+            куди зберігатимуться зміни. Якщо не вказано, образ відображається
+            з файлу знімка з копіюванням під час запису, як і для 'dense'
+
+    Returns:
+        HDDController: Незалежний від інших відновлень контролер
+    """
+    with open(path, 'rb') as f:
+        magic, version, table_offset, table_length, state_offset, state_length = _HEADER.unpack(
+            f.read(_HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} не є знімком контролера версії {VERSION}")
+        f.seek(table_offset)
+        table = json.loads(f.read(table_length).decode('utf-8'))
+        f.seek(state_offset)
+        state = f.read(state_length)
+
+    multiple = len(table) > 1
+    stores = [_restore_store(path, entry, storage_path if not multiple or storage_path is None
+                             else f"{storage_path}.{index}")
+              for index, entry in enumerate(table)]
+    return _SnapshotUnpickler(io.BytesIO(state), stores).load()
+
+
+def _restore_store(path, entry, storage_path):
+    sectors_count = entry['sectors_count']
+    sectors_per_track = entry['sectors_per_track']
+    sector_size = entry['sector_size']
+    kind = entry['kind']
+
+    if kind == 'sparse':
+        store = SparseStore.__new__(SparseStore)
+        store.sectors_count = sectors_count
+        store.sectors_per_track = sectors_per_track
+        store.sector_size = sector_size
+        store._zero_page = np.zeros((sectors_per_track, sector_size), dtype=np.uint8)
+        store._zero_page.flags.writeable = False
+        store.pages = {}
+        if entry['pages']:
+            pages = np.memmap(path, dtype=np.uint8, mode='c', offset=entry['offset'],
+                              shape=(len(entry['pages']), sectors_per_track, sector_size))
+            store.pages = {page_num: pages[index] for index, page_num in enumerate(entry['pages'])}
+        return store
+
+    data = np.memmap(path, dtype=np.uint8, mode='c', offset=entry['offset'],
+                     shape=(sectors_count, sector_size))
+    if kind == 'memmap' and storage_path is not None:
+        # Новий образ отримує копію вмісту, і зміни зберігаються в ньому
+        store = MemmapStore(sectors_count, sectors_per_track, storage_path, sector_size)
+        for start in range(0, sectors_count, 65536):
+            store.data[start:start + 65536] = data[start:start + 65536]
+        return store
+
+    store_cls = MemmapStore if kind == 'memmap' else DenseStore
+    store = store_cls.__new__(store_cls)
+    store.sectors_count = sectors_count
+    store.sectors_per_track = sectors_per_track
+    store.sector_size = sector_size
+    store.data = data
+    if kind == 'memmap':
+        store.path = path
+    return store
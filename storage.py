@@ -0,0 +1,205 @@
+import os
+import numpy as np
+
+
+SECTOR_SIZE = 512
+
+
+def readonly_view(data):
+    """Повертає незмінюване представлення масиву без копіювання даних"""
+    view = data.view()
+    view.flags.writeable = False
+    return view
+
+
+def writable(data):
+    """
+    Повертає змінюваний масив з даними сектора.
+    Копія створюється лише тоді, коли вхідний масив є представленням
+    лише для читання (копіювання під час запису).
+    """
+    if data.flags.writeable:
+        return data
+    return data.copy()
+
+
+class DenseStore:
+    """Сховище секторів у вигляді суцільного масиву sectors × 512 (uint8)"""
+
+    def __init__(self, sectors_count, sectors_per_track, sector_size=SECTOR_SIZE):
+        self.sectors_count = sectors_count
+        self.sectors_per_track = sectors_per_track
+        self.sector_size = sector_size
+        self.data = np.zeros((sectors_count, sector_size), dtype=np.uint8)
+
+    def read(self, sector):
+        """Повертає рядок масиву, що відповідає сектору"""
+        return self.data[sector]
+
+    def read_range(self, sector, count):
+        """Повертає count суміжних рядків масиву, починаючи з sector"""
+        return self.data[sector:sector + count]
+
+    def write(self, sector, data):
+        """Записує дані сектора"""
+        self.data[sector] = data
+
+    def write_range(self, sector, rows):
+        """Записує суміжні сектори, починаючи з sector"""
+        self.data[sector:sector + len(rows)] = rows
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class SparseStore:
+    """
+    Розріджене сховище: пам'ять виділяється посторінково (одна сторінка -
+    sectors_per_track секторів, для однакових доріжок - одна доріжка) лише
+    для сторінок, у які щось записували.
+    Незаписані сектори читаються зі спільної нульової сторінки.
+    """
+
+    def __init__(self, sectors_count, sectors_per_track, sector_size=SECTOR_SIZE):
+        self.sectors_count = sectors_count
+        self.sectors_per_track = sectors_per_track
+        self.sector_size = sector_size
+        self.pages = {}
+
+        self._zero_page = np.zeros((sectors_per_track, sector_size), dtype=np.uint8)
+        self._zero_page.flags.writeable = False
+
+    def read(self, sector):
+        """Повертає рядок сторінки, що відповідає сектору"""
+        page_num, offset = divmod(sector, self.sectors_per_track)
+        page = self.pages.get(page_num, self._zero_page)
+        return page[offset]
+
+    def read_range(self, sector, count):
+        """
+        Повертає count суміжних секторів як зріз сторінки; діапазон, що
+        перетинає межу сторінок (доріжки зонованого диска), збирається в копію
+        """
+        page_num, offset = divmod(sector, self.sectors_per_track)
+        if offset + count <= self.sectors_per_track:
+            page = self.pages.get(page_num, self._zero_page)
+            return page[offset:offset + count]
+        return np.concatenate([self.read_range(start, part) for start, part in self._split(sector, count)])
+
+    def write(self, sector, data):
+        """Записує дані сектора, за потреби виділяючи нову сторінку"""
+        page_num, offset = divmod(sector, self.sectors_per_track)
+        self._writable_page(page_num)[offset] = data
+
+    def write_range(self, sector, rows):
+        """Записує суміжні сектори (діапазон може перетинати межу сторінок)"""
+        done = 0
+        for start, count in self._split(sector, len(rows)):
+            page_num, offset = divmod(start, self.sectors_per_track)
+            self._writable_page(page_num)[offset:offset + count] = rows[done:done + count]
+            done += count
+
+    def _split(self, sector, count):
+        """Розбиває діапазон секторів на частини в межах сторінок: (початок, кількість)"""
+        end = sector + count
+        while sector < end:
+            part = min(end, (sector // self.sectors_per_track + 1) * self.sectors_per_track) - sector
+            yield sector, part
+            sector += part
+
+    def _writable_page(self, page_num):
+        page = self.pages.get(page_num)
+        if page is None:
+            page = np.zeros((self.sectors_per_track, self.sector_size), dtype=np.uint8)
+            self.pages[page_num] = page
+        return page
+
+    @property
+    def committed_bytes(self):
+        """Обсяг фактично виділеної пам'яті (байт)"""
+        return len(self.pages) * self.sectors_per_track * self.sector_size
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class MemmapStore:
+    """
+    Сховище, відображене на файл образу диска через np.memmap.
+    Новий файл створюється розрідженим, тому ОС виділяє місце лише під
+    записані сторінки; наявний образ відкривається без повторної ініціалізації.
+    """
+
+    def __init__(self, sectors_count, sectors_per_track, path, sector_size=SECTOR_SIZE):
+        if path is None:
+            raise ValueError("Для memmap-сховища потрібно вказати шлях до образу диска")
+
+        self.sectors_count = sectors_count
+        self.sectors_per_track = sectors_per_track
+        self.sector_size = sector_size
+        self.path = path
+
+        expected_size = sectors_count * sector_size
+        if os.path.exists(path):
+            if os.path.getsize(path) != expected_size:
+                raise ValueError(f"Розмір образу {path} не відповідає геометрії диска")
+            mode = 'r+'
+        else:
+            mode = 'w+'
+
+        self.data = np.memmap(path, dtype=np.uint8, mode=mode,
+                              shape=(sectors_count, sector_size))
+
+    def read(self, sector):
+        """Повертає рядок образу, що відповідає сектору"""
+        return self.data[sector]
+
+    def read_range(self, sector, count):
+        """Повертає count суміжних рядків образу, починаючи з sector"""
+        return self.data[sector:sector + count]
+
+    def write(self, sector, data):
+        """Записує дані сектора в образ"""
+        self.data[sector] = data
+
+    def write_range(self, sector, rows):
+        """Записує суміжні сектори в образ, починаючи з sector"""
+        self.data[sector:sector + len(rows)] = rows
+
+    def flush(self):
+        """Скидає змінені сторінки на диск"""
+        self.data.flush()
+
+    def close(self):
+        self.flush()
+        del self.data
+
+
+def create_store(kind, sectors_count, sectors_per_track, path=None, sector_size=SECTOR_SIZE):
+    """
+    Створює сховище секторів вказаного типу
+
+    Args:
+        kind: Тип сховища ('dense', 'sparse' або 'memmap')
+        sectors_count: Загальна кількість секторів
+        sectors_per_track: Кількість секторів на доріжці
+        path: Шлях до образу диска (лише для 'memmap')
+        sector_size: Розмір сектора (байт)
+
+    Returns:
+        Сховище з методами read/read_range/write/write_range/flush/close
+    """
+    kind = kind.lower()
+    if kind == 'dense':
+        return DenseStore(sectors_count, sectors_per_track, sector_size)
+    elif kind == 'sparse':
+        return SparseStore(sectors_count, sectors_per_track, sector_size)
+    elif kind == 'memmap':
+        return MemmapStore(sectors_count, sectors_per_track, path, sector_size)
+    raise ValueError(f"Невідомий тип сховища: {kind}")
@@ -0,0 +1,172 @@
+"""
+Паралельний перебір конфігурацій контролера на одній трасі.
+
+Сітка параметрів розгортається в набір точок, кожна точка відтворюється
+в окремому процесі ProcessPoolExecutor. Траса передається процесам лише
+шляхом до бінарного файлу: кожен процес відкриває її через np.memmap,
+тому сторінки траси спільні через кеш ОС і не серіалізуються.
+Готові результати дописуються в JSONL-файл контрольних точок, тож
+перерваний перебір можна продовжити з того самого місця. Ключ точки
+містить відбиток траси (шлях, розмір і час зміни файлу), тому
+результати іншої чи зміненої траси з контрольних точок не беруться.
+"""
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from controller import HDDController
+from replay import replay_binary
+from trace_format import TraceFile, convert_trace
+
+
+def expand_grid(grid):
+    """
+    Розгортає сітку параметрів у список точок
+
+    Args:
+        grid: Словник параметр HDDController -> список значень
+
+    Returns:
+        list: Словники параметрів для кожної комбінації значень
+    """
+    names = sorted(grid)
+    return [dict(zip(names, values))
+            for values in itertools.product(*(grid[name] for name in names))]
+
+
+def trace_fingerprint(trace_path):
+    """Відбиток траси: хеш абсолютного шляху, розміру та часу зміни файлу"""
+    stat = os.stat(trace_path)
+    identity = f"{os.path.abspath(trace_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha256(identity.encode('utf-8')).hexdigest()[:16]
+
+
+def point_key(params, fingerprint):
+    """Канонічний ключ точки для контрольних точок (fingerprint - відбиток траси)"""
+    return json.dumps({'trace': fingerprint, 'params': params}, sort_keys=True)
+
+
+def run_point(params, trace_path, chunk_size=4096):
+    """
+    Відтворює трасу для однієї конфігурації (виконується у процесі-працівнику)
+
+    Returns:
+        dict: Параметри точки разом із результатами get_statistics()
+    """
+    controller = HDDController(**params)
+    processed = replay_binary(controller, TraceFile(trace_path), chunk_size=chunk_size)
+    stats = controller.get_statistics()
+
+    row = dict(params)
+    row['requests'] = processed
+    row['cache_hits'] = stats['cache_hits']
+    row['cache_misses'] = stats['cache_misses']
+    row['hit_rate'] = stats['hit_rate']
+    row['total_delay'] = stats['total_delay']
+    row['mean_delay'] = stats['total_delay'] / processed if processed else 0
+    # Скидання брудних секторів у write-back не входить у затримки запитів
+    flush_delay = stats['write_back']['flush_delay'] if stats['write_back'] else 0.0
+    row['flush_delay'] = flush_delay
+    row['mean_delay_with_flush'] = (stats['total_delay'] + flush_delay) / processed if processed else 0
+    row['cache_evictions'] = stats['cache']['evictions']
+    return row
+
+
+def load_checkpoint(path):
+    """Повертає вже пораховані результати з файлу контрольних точок"""
+    results = {}
+    if path and os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    entry = json.loads(line)
+                    results[entry['key']] = entry['row']
+    return results
+
+
+def run_sweep(grid, trace_path, workers=None, checkpoint=None, chunk_size=4096):
+    """
+    Виконує перебір сітки параметрів паралельно
+
+    Args:
+        grid: Сітка параметрів HDDController
+        trace_path: Траса (.bin відкривається напряму, інші формати
+            попередньо перетворюються у тимчасовий бінарний файл)
+        workers: Кількість процесів (за замовчуванням - кількість ядер)
+        checkpoint: JSONL-файл контрольних точок або None
+        chunk_size: Розмір порції відтворення
+
+    Returns:
+        list: Рядки результатів у порядку точок сітки
+    """
+    points = expand_grid(grid)
+    results = load_checkpoint(checkpoint)
+    fingerprint = trace_fingerprint(trace_path)
+    todo = [params for params in points if point_key(params, fingerprint) not in results]
+
+    temp_dir = None
+    if not trace_path.endswith('.bin'):
+        temp_dir = tempfile.TemporaryDirectory()
+        binary_path = os.path.join(temp_dir.name, 'trace.bin')
+        convert_trace(trace_path, binary_path)
+        trace_path = binary_path
+
+    checkpoint_file = open(checkpoint, 'a', encoding='utf-8') if checkpoint else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(run_point, params, trace_path, chunk_size): params
+                       for params in todo}
+            for future in as_completed(futures):
+                key = point_key(futures[future], fingerprint)
+                row = future.result()
+                results[key] = row
+                if checkpoint_file:
+                    checkpoint_file.write(json.dumps({'key': key, 'row': row}) + '\n')
+                    checkpoint_file.flush()
+    finally:
+        if checkpoint_file:
+            checkpoint_file.close()
+        if temp_dir is not None:
+            temp_dir.cleanup()
+
+    return [results[point_key(params, fingerprint)] for params in points]
+
+
+def write_table(rows, path):
+    """Зберігає результати перебору у CSV-таблицю"""
+    if not rows:
+        return
+    columns = list(rows[0])
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Паралельний перебір конфігурацій контролера HDD")
+    parser.add_argument('trace', help="Траса (.bin, .jsonl або .csv)")
+    parser.add_argument('grid', help="JSON-файл сітки: параметр HDDController -> список значень")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--checkpoint', default=None, help="JSONL-файл контрольних точок")
+    parser.add_argument('--output', default='sweep_results.csv')
+    parser.add_argument('--chunk-size', type=int, default=4096)
+    args = parser.parse_args(argv)
+
+    with open(args.grid, 'r', encoding='utf-8') as f:
+        grid = json.load(f)
+
+    rows = run_sweep(grid, args.trace, workers=args.workers,
+                     checkpoint=args.checkpoint, chunk_size=args.chunk_size)
+    write_table(rows, args.output)
+    print(f"Пораховано точок: {len(rows)}, результати: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from LFU import LFUCache
+from cache_policies import LRUCache, ClockCache, TwoQCache, ARCCache, SLRUCache
+from controller import HDDController
+
+# Політика -> (кеш на 2 сектори, сектор, що витісняється в test_eviction_order)
+POLICIES = {
+    'LFU': (lambda total: LFUCache(max_left=min(total, 1), max_middle=min(total, 1), max_total=total), 2),
+    'LRU': (lambda total: LRUCache(max_total=total), 2),
+    'CLOCK': (lambda total: ClockCache(max_total=total), 2),
+    # A1in - FIFO: сектор 1 витісняється першим, хоч до нього і зверталися
+    '2Q': (lambda total: TwoQCache(max_total=total, max_in=1, max_out=2), 1),
+    'ARC': (lambda total: ARCCache(max_total=total), 2),
+    'SLRU': (lambda total: SLRUCache(max_total=total, max_protected=total // 2), 2),
+}
+
+
+def _cache(policy, total):
+    cache = POLICIES[policy][0](total)
+    cache.evicted = []
+    cache.on_evict = lambda sector, data: cache.evicted.append(sector)
+    return cache
+
+
+@pytest.mark.parametrize('policy', POLICIES)
+def test_hits_and_misses_are_counted(policy):
+    cache = _cache(policy, 2)
+    cache.add_sector(1, 'a')
+    cache.add_sector(2, 'b')
+
+    assert cache.get_sector(1) == 'a'
+    assert cache.get_sector(3) is None
+    stats = cache.get_statistics()
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (1, 1, 0)
+
+
+@pytest.mark.parametrize('policy', POLICIES)
+def test_eviction_order(policy):
+    cache = _cache(policy, 2)
+    cache.add_sector(1, 'a')
+    cache.add_sector(2, 'b')
+    cache.get_sector(1)
+    cache.add_sector(3, 'c')
+
+    victim = POLICIES[policy][1]
+    assert cache.evicted == [victim]
+    assert cache.get_sector(victim) is None
+    assert cache.get_sector(3) == 'c'
+
+
+@pytest.mark.parametrize('policy', POLICIES)
+def test_update_replaces_data_without_eviction(policy):
+    cache = _cache(policy, 2)
+    cache.add_sector(1, 'a')
+    cache.add_sector(1, 'b')
+
+    assert cache.get_sector(1) == 'b'
+    assert cache.evicted == []
+
+
+@pytest.mark.parametrize('policy', POLICIES)
+def test_zero_capacity_never_admits(policy):
+    cache = _cache(policy, 0)
+    for sector in range(3):
+        cache.add_sector(sector, 'a')
+        assert cache.get_sector(sector) is None
+
+    assert cache.evicted == [0, 1, 2]
+    assert cache.get_statistics()['misses'] == 3
+
+
+@pytest.mark.parametrize('write_policy', ['through', 'back'])
+@pytest.mark.parametrize('policy', POLICIES)
+def test_controller_without_cache(policy, write_policy):
+    controller = HDDController(cache_policy=policy, cache_total=0, cache_left=0, cache_middle=0,
+                               write_policy=write_policy)
+    controller.write_sector(10, np.full(512, 3, dtype=np.uint8))
+
+    data, _, hit = controller.read_sector(10)
+    assert data[0] == 3
+    assert not hit
+
+
+@pytest.mark.parametrize('policy', POLICIES)
+def test_membership_check_has_no_side_effects(policy):
+    cache = _cache(policy, 2)
+    cache.add_sector(1, 'a')
+    cache.add_sector(2, 'b')
+    cache.get_sector(1)
+    stats = cache.get_statistics()
+
+    # Перевірка членства не рахується зверненням і не змінює порядок витіснення
+    assert 2 in cache and 3 not in cache
+    assert cache.get_statistics() == stats
+    cache.add_sector(3, 'c')
+    assert cache.evicted == [POLICIES[policy][1]]
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from controller import HDDController
+
+
+def _sector_data(value):
+    return np.full(512, value, dtype=np.uint8)
+
+
+@pytest.mark.parametrize('storage', ['dense', 'sparse'])
+def test_read_returns_view_valid_until_next_write(storage):
+    controller = HDDController(storage=storage, tracks_num=100, cache_total=0, cache_left=0, cache_middle=0)
+    controller.write_sector(10, _sector_data(1))
+
+    data, _, _ = controller.read_sector(10)
+    assert not data.flags.writeable
+    kept = data.copy()
+
+    controller.write_sector(10, _sector_data(2))
+    # Після запису вміст представлення не визначений, а копія лишається старою
+    assert kept[0] == 1
+    assert controller.read_sectors([10])[0][0][0] == 2
+
+
+def test_write_back_flush_respects_rejecting_queue_depth():
+    controller = HDDController(write_policy='back', cache_total=20, dirty_ratio=0.5,
+                               max_queue_depth=4, queue_overflow='reject')
+    for sector in range(10):
+        controller.write_sector(sector * 600, _sector_data(sector + 1))
+
+    assert not controller.dirty
+    assert controller.flushed_sectors == 10
+    assert [controller.hdd.peek_sector(sector * 600)[0] for sector in range(10)] == list(range(1, 11))
+
+
+def test_write_back_flushes_dirty_data_older_than_interval():
+    # Кожен запис у кеш триває 7.16 мс часу симуляції
+    controller = HDDController(write_policy='back', cache_total=20, dirty_ratio=1.0, flush_interval=20.0)
+    for sector in range(2):
+        controller.write_sector(sector * 600, _sector_data(sector + 1))
+    assert len(controller.dirty) == 2 and controller.flushes == 0
+
+    # Влучання в кеш теж просуває час симуляції
+    controller.read_sector(0)
+    assert not controller.dirty
+    assert controller.flushes == 1
+    assert controller.hdd.peek_sector(600)[0] == 2
+
+    # Вік відраховується від першого брудного сектора після скидання
+    controller.write_sector(1200, _sector_data(3))
+    controller.write_sector(1800, _sector_data(4))
+    assert len(controller.dirty) == 2
+
+
+def test_write_back_without_interval_keeps_dirty_data():
+    controller = HDDController(write_policy='back', cache_total=20, dirty_ratio=1.0)
+    for sector in range(5):
+        controller.write_sector(sector * 600, _sector_data(sector + 1))
+
+    assert len(controller.dirty) == 5 and controller.flushes == 0
+    with pytest.raises(ValueError):
+        HDDController(write_policy='back', flush_interval=0)
+
+
+@pytest.mark.parametrize('max_queue_depth', [None, 1])
+def test_repeated_sector_in_batch_shares_one_disk_read(max_queue_depth):
+    controller = HDDController(max_queue_depth=max_queue_depth)
+    reference = HDDController(max_queue_depth=max_queue_depth)
+
+    results = controller.read_sectors([10, 700, 10, 700, 10])
+    reference.read_sectors([10, 700])
+
+    assert [hit for _, _, hit in results] == [False] * 5
+    assert results[2][0] is results[0][0]
+    # Лише дві дискові операції - стільки ж часу диска, як у пакета без повторів
+    assert controller.hdd.clock == reference.hdd.clock
+
+
+@pytest.mark.parametrize('overflow', ['block', 'reject', 'coalesce'])
+def test_read_batch_respects_bounded_queue(overflow):
+    controller = HDDController(max_queue_depth=4, queue_overflow=overflow)
+    sectors = [sector * 600 for sector in range(30)]
+    for sector in sectors:
+        controller.write_sector(sector, _sector_data(sector % 251 + 1))
+
+    results = controller.read_sectors(sectors)
+
+    assert [data[0] for data, _, _ in results] == [sector % 251 + 1 for sector in sectors]
+    assert controller.cache_misses == sum(not hit for _, _, hit in results) >= 10
+    assert not len(controller.scheduler)
+    assert controller.scheduler.rejected == 0
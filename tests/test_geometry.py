@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from geometry import Geometry, LinearSeek, Zone, curve_seek_table, linear_seek_table
+from hard_drive import HDD
+
+
+def _layout(geometry):
+    """Доріжка та кут кожного сектора, отримані перебором доріжок"""
+    tracks, angles = [], []
+    for zone in geometry.zones:
+        for _ in range(zone.tracks):
+            track = len(set(tracks))
+            tracks += [track] * zone.sectors_per_track
+            angles += [index / zone.sectors_per_track for index in range(zone.sectors_per_track)]
+    return tracks, angles
+
+
+@pytest.mark.parametrize('geometry', [
+    Geometry([Zone(3, 7), Zone(2, 5), Zone(4, 3)], np.zeros(9)),
+    Geometry.uniform_disk(6, 4),
+])
+def test_scalar_and_vector_lookups_match_layout(geometry):
+    tracks, angles = _layout(geometry)
+    sectors = np.arange(geometry.total_sectors)
+
+    assert geometry.total_sectors == len(tracks)
+    assert geometry.tracks_of(sectors).tolist() == tracks
+    assert geometry.angles_of(sectors).tolist() == pytest.approx(angles)
+    assert [geometry.track_of(sector) for sector in sectors.tolist()] == tracks
+    assert [geometry.angle_of(sector) for sector in sectors.tolist()] == pytest.approx(angles)
+    for sector, track in enumerate(tracks):
+        assert geometry.track_start(track) == tracks.index(track)
+        assert geometry.track_end(sector) == tracks.index(track) + geometry.sectors_on(track)
+        assert geometry.zones[geometry.zone_of(sector)] is geometry.zones[geometry.zone_of_track(track)]
+    assert geometry.zones_of(sectors).tolist() == [geometry.zone_of(sector) for sector in sectors.tolist()]
+
+
+def test_zoned_disk_spreads_sectors_from_outer_to_inner():
+    geometry = Geometry.zoned_disk(1000, outer_sectors=800, inner_sectors=400, zones=5)
+
+    assert [zone.sectors_per_track for zone in geometry.zones] == [800, 700, 600, 500, 400]
+    assert sum(zone.tracks for zone in geometry.zones) == 1000
+    assert geometry.total_sectors == 200 * (800 + 700 + 600 + 500 + 400)
+    assert geometry.sectors_on(0) == 800 and geometry.sectors_on(999) == 400
+
+
+def test_curve_seek_table_shape():
+    table = curve_seek_table(10001, track_to_track=0.5, full_stroke=10.0, knee_fraction=0.2)
+    knee = 2000
+
+    assert table[0] == 0.0
+    assert table[1] == pytest.approx(0.5)
+    assert table[-1] == pytest.approx(10.0)
+    assert np.all(np.diff(table[1:]) > 0)
+    # Корінь на коротких відстанях, пряма з тим самим нахилом після коліна
+    slope = np.diff(table[1:])
+    assert slope[knee - 2] == pytest.approx(slope[knee], rel=1e-3)
+    assert np.allclose(np.diff(slope[knee:]), 0, atol=1e-12)
+    assert table[4] - table[1] == pytest.approx(table[9] - table[4])
+
+
+@pytest.mark.parametrize('kwargs', [{'track_to_track': 0}, {'track_to_track': 11}, {'knee_fraction': 0}])
+def test_curve_seek_table_rejects_invalid_parameters(kwargs):
+    with pytest.raises(ValueError):
+        curve_seek_table(100, **kwargs)
+
+
+def test_linear_seek_matches_table():
+    seek = LinearSeek(100, one_step_delay=0.3, max_reach_delay=12)
+    table = linear_seek_table(100, one_step_delay=0.3, max_reach_delay=12)
+    distances = np.arange(100)
+
+    assert seek[distances].tolist() == table.tolist()
+    assert [seek[int(distance)] for distance in distances] == table.tolist()
+    assert seek.max() == table.max()
+
+    geometry = Geometry.uniform_disk(100, 50, one_step_delay=0.3, max_reach_delay=12)
+    assert [geometry.seek_time(int(distance)) for distance in distances] == table.tolist()
+    assert geometry.seek_times(distances).tolist() == table.tolist()
+
+
+@pytest.mark.parametrize('zones, table', [
+    ([], np.zeros(1)),
+    ([Zone(0, 5)], np.zeros(1)),
+    ([Zone(4, 5)], np.zeros(3)),
+])
+def test_invalid_geometry_is_rejected(zones, table):
+    with pytest.raises(ValueError):
+        Geometry(zones, table)
+
+
+def test_outer_zone_transfers_more_per_revolution():
+    geometry = Geometry.zoned_disk(1000, outer_sectors=800, inner_sectors=400, zones=2)
+    hdd = HDD(geometry=geometry)
+    outer = hdd.read_sectors(0, 800)[1]
+    inner_start = int(geometry.zone_first_sector[1])
+    hdd.rw_head_position = 500
+    inner = hdd.read_sectors(inner_start, 400)[1]
+
+    # Ціла доріжка читається за один оберт незалежно від зони
+    assert outer == pytest.approx(inner)
+    assert 800 / outer == pytest.approx(2 * 400 / inner)
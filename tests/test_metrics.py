@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from metrics import BATCH_SIZE, SUB_BUCKETS, Histogram, MetricsRecorder
+
+
+def _bucket(histogram, value):
+    """Кошик значення за визначенням: старші біти цілого числа одиниць"""
+    scaled = int(value * (1 / histogram.unit))
+    if scaled < 1:
+        return 0
+    exponent = scaled.bit_length()
+    top = scaled >> (exponent - 7) if exponent > 7 else scaled << (7 - exponent)
+    return min((exponent - 1) * SUB_BUCKETS + (top - SUB_BUCKETS) + 1, len(histogram.counts) - 1)
+
+
+def test_batched_buckets_match_definition():
+    rng = np.random.default_rng(0)
+    values = np.concatenate([rng.exponential(10.0, 5000), [0.0, 0.0005, 0.001, 0.127, 0.128, 1.0, 64.0, 1e7, 1e12]])
+    histogram = Histogram()
+    for value in values.tolist():
+        histogram.record(value)
+
+    expected = np.zeros(len(histogram.counts), dtype=np.int64)
+    for value in values.tolist():
+        expected[_bucket(histogram, value)] += 1
+    assert histogram.counts.tolist() == expected.tolist()
+    assert histogram.count == len(values)
+    assert (histogram.min, histogram.max) == (values.min(), values.max())
+    assert histogram.total == pytest.approx(values.sum())
+
+
+def test_percentiles_within_bucket_error():
+    histogram = Histogram()
+    values = np.arange(1, 10001) * 0.01
+    histogram.record_many(values)
+
+    for q in (50, 95, 99):
+        exact = np.percentile(values, q)
+        assert abs(histogram.percentile(q) - exact) <= exact / SUB_BUCKETS + histogram.unit
+
+
+def test_recorder_folds_pending_requests_on_read():
+    metrics = MetricsRecorder()
+    requests = BATCH_SIZE + 10      # одна повна порція і залишок
+    for index in range(requests):
+        if index % 2:
+            metrics.record_request(False, 12.0, syscall=0.15, disk=4.8, interrupt=0.05, user_process=7.0,
+                                   queue_wait=1.0, service_time=4.8)
+        else:
+            metrics.record_request(True, 7.16, syscall=0.15, cache=0.01, user_process=7.0)
+
+    summary = metrics.summary()
+    assert summary['read']['count'] == summary['write']['count'] == requests // 2
+    assert summary['service_time']['count'] == summary['queue_wait']['count'] == requests // 2
+    assert summary['queue_wait']['mean'] == pytest.approx(1.0)
+    components = summary['components']
+    assert components['disk']['total'] == pytest.approx(4.8 * requests / 2)
+    assert components['syscall']['mean'] == pytest.approx(0.15)
+    assert metrics.components['cache'] == pytest.approx(0.01 * requests / 2)
@@ -0,0 +1,77 @@
+import json
+
+import numpy as np
+import pytest
+
+from cache_policies import LRUCache
+from controller import HDDController
+from mrc import MissRatioCurve, profile_trace
+from trace_format import OP_READ, OP_WRITE, TRACE_DTYPE, TraceWriter
+
+SIZES = [0, 1, 2, 5, 10, 50, 200]
+
+
+def _lru_misses(sectors, writes, size):
+    """Промахи читань LRU-кешу так, як його використовує контролер (записи лише оновлюють кеш)"""
+    cache = LRUCache(max_total=size)
+    misses = 0
+    for sector, write in zip(sectors, writes):
+        if not write and cache.get_sector(sector) is None:
+            misses += 1
+        cache.add_sector(sector, sector)
+    return misses
+
+
+def test_miss_ratio_matches_lru_replay():
+    rng = np.random.default_rng(1)
+    sectors = rng.zipf(1.3, 5000) % 300
+    writes = rng.random(5000) < 0.2
+    mrc = MissRatioCurve(initial_capacity=64)   # малий початковий розмір перевіряє ущільнення дерева
+    mrc.feed(sectors, writes)
+
+    reads = int((~writes).sum())
+    expected = [_lru_misses(sectors.tolist(), writes.tolist(), size) / reads for size in SIZES]
+    assert mrc.miss_ratio(SIZES).tolist() == pytest.approx(expected)
+
+
+def test_trace_without_reuse_is_all_cold_misses(tmp_path):
+    path = tmp_path / 'distinct.jsonl'
+    path.write_text(''.join(json.dumps({'sector': sector * 7}) + '\n' for sector in range(100)))
+
+    mrc, miss, latency = profile_trace(str(path), SIZES)
+
+    assert mrc.cold_misses == 100
+    assert miss.tolist() == [1.0] * len(SIZES)
+    assert np.all(latency > 0)
+
+
+def test_text_and_binary_traces_give_same_profile(tmp_path):
+    sectors = [10, 10, 499, 3000, 10, 499]
+    ops = [OP_WRITE, OP_READ, OP_READ, OP_READ, OP_READ, OP_WRITE]
+    sizes = [512, 1024, 4096, 512, 2048, 512]
+
+    text_path = tmp_path / 'trace.jsonl'
+    text_path.write_text(''.join(
+        json.dumps({'sector': sector, 'op': 'write' if op == OP_WRITE else 'read', 'size': size}) + '\n'
+        for sector, op, size in zip(sectors, ops, sizes)))
+    records = np.zeros(len(sectors), dtype=TRACE_DTYPE)
+    records['sector'], records['op'], records['size'] = sectors, ops, sizes
+    binary_path = str(tmp_path / 'trace.bin')
+    with TraceWriter(binary_path) as writer:
+        writer.append(records)
+
+    text = profile_trace(str(text_path), SIZES)
+    binary = profile_trace(binary_path, SIZES)
+
+    assert (text[0].reads, text[0].writes) == (binary[0].reads, binary[0].writes) == (15, 2)
+    assert text[1].tolist() == binary[1].tolist()
+    assert text[2].tolist() == binary[2].tolist()
+
+
+def test_array_controller_is_rejected(tmp_path):
+    path = tmp_path / 'trace.jsonl'
+    path.write_text(json.dumps({'sector': 1}) + '\n')
+    controller = HDDController(raid_level='RAID0', collect_metrics=False)
+
+    with pytest.raises(ValueError):
+        profile_trace(str(path), SIZES, controller=controller)
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from access_planners import LOOKScheduler
+from controller import HDDController
+from raid import ArrayScheduler, DiskArray
+
+
+def _controller(level, disks=4):
+    return HDDController(raid_level=level, raid_disks=disks, stripe_size=8, tracks_num=100,
+                         cache_total=0, cache_left=0, cache_middle=0, collect_metrics=False)
+
+
+def _sector_data(value):
+    return np.full(512, value, dtype=np.uint8)
+
+
+def test_capacity_and_layout():
+    assert DiskArray('JBOD', disks=3, track_num=100).total_sectors == 3 * 50_000
+    assert DiskArray('RAID1', disks=3, track_num=100).total_sectors == 50_000
+    assert DiskArray('RAID5', disks=4, track_num=100).total_sectors == 3 * 50_000
+
+    raid0 = DiskArray('RAID0', disks=4, stripe_size=8, track_num=100)
+    assert [raid0.locate(sector) for sector in (0, 7, 8, 31, 32)] == [(0, 0), (0, 7), (1, 0), (3, 7), (0, 8)]
+    jbod = DiskArray('JBOD', disks=2, track_num=100)
+    assert jbod.locate(50_000) == (1, 0)
+
+
+def test_raid5_parity_rotates_and_never_holds_data():
+    array = DiskArray('RAID5', disks=4, stripe_size=8, track_num=100)
+    assert [array.parity_disk(row) for row in range(5)] == [3, 2, 1, 0, 3]
+    for sector in range(0, 24 * 8, 3):
+        member, member_sector = array.locate(sector)
+        parity_member, parity_sector = array.locate_parity(sector)
+        assert member != parity_member
+        assert member_sector == parity_sector
+
+
+@pytest.mark.parametrize('level, disks', [('JBOD', 0), ('RAID0', 1), ('RAID5', 2), ('RAID6', 4)])
+def test_invalid_arrays_are_rejected(level, disks):
+    with pytest.raises(ValueError):
+        DiskArray(level, disks=disks, track_num=10)
+
+
+def test_raid1_writes_every_mirror():
+    controller = _controller('RAID1', disks=3)
+    controller.write_sector(123, _sector_data(7))
+
+    assert [member.peek_sector(123)[0] for member in controller.hdd.members] == [7, 7, 7]
+    assert controller.read_sector(123)[0][0] == 7
+
+
+def test_raid1_reads_are_spread_across_mirrors():
+    controller = _controller('RAID1', disks=2)
+    scheduler = controller.scheduler
+    for sector in (0, 40_000, 100, 40_100):
+        scheduler.submit(sector)
+    scheduler.drain()
+
+    # Читання розподіляються між дзеркалами за очікуваною затримкою
+    assert all(busy > 0 for busy in scheduler.busy_time)
+
+
+def test_raid5_parity_matches_data_after_writes():
+    controller = _controller('RAID5')
+    array = controller.hdd
+    rng = np.random.default_rng(0)
+    sectors = rng.integers(0, 400, size=200).tolist()
+    # Пакет записів: записи зі спільною парністю обробляються по черзі
+    requests = controller.scheduler.submit_many(
+        (sector, True, rng.integers(0, 256, 512, dtype=np.uint8)) for sector in sectors)
+    controller.scheduler.drain()
+    assert all(request.result is not None for request in requests)
+
+    for sector in set(sectors):
+        _, member_sector = array.locate(sector)
+        stripe = np.bitwise_xor.reduce([member.peek_sector(member_sector) for member in array.members])
+        assert not stripe.any()
+
+
+def test_raid5_reads_back_last_written_data():
+    controller = _controller('RAID5')
+    for value, sector in enumerate([5, 13, 5, 29, 13], start=1):
+        controller.write_sector(sector, _sector_data(value))
+
+    assert [controller.read_sector(sector)[0][0] for sector in (5, 13, 29)] == [3, 5, 4]
+
+
+def test_raid0_disks_work_in_parallel():
+    array = DiskArray('RAID0', disks=4, stripe_size=8, track_num=100)
+    scheduler = ArrayScheduler(array, LOOKScheduler)
+    requests = [scheduler.submit(sector) for sector in (0, 8, 16, 24)]
+    scheduler.drain()
+
+    delays = [request.result[1] for request in requests]
+    makespan = scheduler.get_statistics()['makespan']
+    # Чотири читання на різних дисках займають час найдовшого, а не суму
+    assert makespan == pytest.approx(max(delays))
+    assert makespan < sum(delays)
@@ -0,0 +1,83 @@
+import pytest
+
+from controller import HDDController
+from readahead import ReadAhead
+
+
+def _sequential(readahead, pid, sectors, track_end=500):
+    plans = []
+    for sector in sectors:
+        readahead.observe(pid, sector)
+        plans.append(readahead.plan(pid, sector, track_end))
+    return plans
+
+
+def test_sequential_stream_prefetches_window_on_same_track():
+    readahead = ReadAhead(initial_window=4)
+    first, second = _sequential(readahead, 'p', [100, 101])
+
+    assert first == (1, [])
+    assert second == (5, [102, 103, 104, 105])
+
+
+def test_strided_stream_prefetches_with_stride():
+    readahead = ReadAhead(initial_window=3)
+    plans = _sequential(readahead, 'p', [10, 14, 18])
+
+    assert plans[1] == (1, [])         # крок 4 ще не повторився
+    assert plans[2] == (13, [22, 26, 30])
+
+
+def test_prefetch_stops_at_track_end():
+    readahead = ReadAhead(initial_window=8)
+    _, plan = _sequential(readahead, 'p', [495, 496], track_end=500)
+
+    assert plan == (4, [497, 498, 499])
+
+
+def test_window_grows_when_used_and_shrinks_when_wasted():
+    readahead = ReadAhead(initial_window=4, min_window=2, max_window=16)
+    _sequential(readahead, 'p', [0, 1])
+    # Усі сектори вікна використані - наступне вікно вдвічі більше
+    for sector in range(2, 6):
+        readahead.observe('p', sector)
+    assert readahead.plan('p', 5, 500)[1] == list(range(6, 14))
+
+    # Потік перестрибує далі - вікно витрачене марно і зменшується
+    _, (_, prefetch) = _sequential(readahead, 'p', [100, 101])
+    assert prefetch == [102, 103, 104, 105]
+    assert readahead.get_statistics()['used'] == 4
+
+
+def test_streams_are_tracked_per_process():
+    readahead = ReadAhead(initial_window=4)
+    readahead.observe('a', 10)
+    readahead.observe('b', 300)
+    readahead.observe('a', 11)
+
+    assert readahead.plan('a', 11, 500)[1] == [12, 13, 14, 15]
+    assert readahead.plan('b', 300, 500) == (1, [])
+
+
+def test_invalid_windows_are_rejected():
+    with pytest.raises(ValueError):
+        ReadAhead(initial_window=1, min_window=2)
+
+
+@pytest.mark.parametrize('batch', [False, True])
+def test_prefetch_does_not_touch_cached_sectors(batch):
+    controller = HDDController(readahead=True, cache_total=64, cache_left=16, cache_middle=16)
+    controller.read_sector(104, pid='other')
+    buffer = controller.cache.sector_map[104]
+    counter, data = buffer.counter, buffer.data
+
+    if batch:
+        controller.read_sectors([100, 101], pids=['p', 'p'])
+    else:
+        controller.read_sector(100, pid='p')
+        controller.read_sector(101, pid='p')
+
+    assert controller.readahead.get_statistics()['prefetched'] > 0
+    assert 103 in controller.cache and 105 in controller.cache
+    assert controller.cache.sector_map[104] is buffer
+    assert (buffer.counter, buffer.data) == (counter, data)
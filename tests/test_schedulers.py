@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+
+from access_planners import (Direction, FIFOScheduler, LOOKScheduler, NLOOKScheduler, SATFScheduler,
+                             DeadlineScheduler)
+from hard_drive import HDD
+
+SCHEDULERS = [LOOKScheduler, NLOOKScheduler, SATFScheduler, DeadlineScheduler]
+SECTOR = 3 * 500 + 42   # доріжка 3
+
+
+def _scheduler(cls, direction, max_transfer=1):
+    hdd = HDD()
+    # Головка нижче або вище доріжки запитів, щоб ліфт підходив до неї в заданому напрямку
+    hdd.rw_head_position = 0 if direction == Direction.UP else 6
+    scheduler = cls(hdd, max_transfer=max_transfer)
+    if hasattr(scheduler, 'direction'):
+        scheduler.direction = direction
+    return scheduler
+
+
+def _sector_data(value):
+    return np.full(512, value, dtype=np.uint8)
+
+
+@pytest.mark.parametrize('direction', [Direction.UP, Direction.DOWN])
+@pytest.mark.parametrize('cls', SCHEDULERS)
+def test_read_after_write_to_same_sector_sees_new_data(cls, direction):
+    scheduler = _scheduler(cls, direction)
+    scheduler.submit(SECTOR + 1)     # сусідній сектор на тій самій доріжці
+    scheduler.submit(SECTOR, is_write=True, data=_sector_data(7))
+    read = scheduler.submit(SECTOR)
+    scheduler.drain()
+
+    data, _ = read.result
+    assert data[0] == 7
+
+
+@pytest.mark.parametrize('direction', [Direction.UP, Direction.DOWN])
+@pytest.mark.parametrize('cls', SCHEDULERS)
+def test_later_write_to_same_sector_wins(cls, direction):
+    scheduler = _scheduler(cls, direction)
+    scheduler.submit(SECTOR - 1)
+    scheduler.submit(SECTOR, is_write=True, data=_sector_data(1))
+    scheduler.submit(SECTOR, is_write=True, data=_sector_data(2))
+    scheduler.drain()
+
+    assert scheduler.hdd.peek_sector(SECTOR)[0] == 2
+
+
+@pytest.mark.parametrize('direction', [Direction.UP, Direction.DOWN])
+@pytest.mark.parametrize('cls', [FIFOScheduler] + SCHEDULERS)
+def test_merge_does_not_reorder_read_after_write(cls, direction):
+    scheduler = _scheduler(cls, direction, max_transfer=8)
+    scheduler.submit(SECTOR, is_write=True, data=_sector_data(7))
+    read = scheduler.submit(SECTOR)
+    scheduler.submit(SECTOR + 1, is_write=True, data=_sector_data(9))
+    scheduler.drain()
+
+    assert read.result[0][0] == 7
+    assert scheduler.hdd.peek_sector(SECTOR + 1)[0] == 9
+
+
+@pytest.mark.parametrize('direction', [Direction.UP, Direction.DOWN])
+@pytest.mark.parametrize('cls', [FIFOScheduler] + SCHEDULERS)
+def test_merge_does_not_move_write_ahead_of_read(cls, direction):
+    scheduler = _scheduler(cls, direction, max_transfer=8)
+    scheduler.submit(SECTOR, is_write=True, data=_sector_data(7))
+    read = scheduler.submit(SECTOR + 1)
+    scheduler.submit(SECTOR + 1, is_write=True, data=_sector_data(9))
+    # Дані читання - представлення сховища, дійсне до наступного запису
+    seen = None
+    while scheduler.dispatch_next() is not None:
+        if read.done and seen is None:
+            seen = read.result[0].copy()
+
+    assert seen[0] == 0
+    assert scheduler.hdd.peek_sector(SECTOR + 1)[0] == 9
+
+
+@pytest.mark.parametrize('cls', [FIFOScheduler] + SCHEDULERS)
+def test_adjacent_writes_merge_into_one_operation(cls):
+    scheduler = _scheduler(cls, Direction.UP, max_transfer=8)
+    for offset in range(4):
+        scheduler.submit(SECTOR + offset, is_write=True, data=_sector_data(offset + 1))
+    scheduler.drain()
+
+    assert scheduler.merges == 3
+    assert [scheduler.hdd.peek_sector(SECTOR + offset)[0] for offset in range(4)] == [1, 2, 3, 4]
+    assert not scheduler._covered
+
+
+@pytest.mark.parametrize('rotation_model', ['exact', 'average'])
+def test_satf_dispatches_request_with_least_access_time(rotation_model):
+    hdd = HDD(track_num=2000, rotation_model=rotation_model)
+    hdd.rw_head_position = 1000
+    scheduler = SATFScheduler(hdd)
+    rng = np.random.default_rng(7)
+    # Ближні доріжки разом з далекими, де час переведення вже максимальний
+    sectors = np.concatenate([rng.integers(990 * 500, 1010 * 500, 40), rng.integers(0, hdd.total_sectors, 40)])
+    queued = [scheduler.submit(sector) for sector in sectors.tolist()]
+
+    while queued:
+        best = min(hdd.access_time(request.sector) for request in queued)
+        request = scheduler.dispatch_next()
+        queued.remove(request)
+        assert request.result[1] == pytest.approx(best)
+
+
+def test_exact_rotation_tracks_platter_angle():
+    hdd = HDD(rotation_model='exact')
+    revolution = hdd.revolution_time
+    rw_delay = revolution / hdd.sectors_per_track
+
+    hdd.read_sector(100)
+    # Наступний сектор доріжки підходить під головку одразу після попереднього
+    assert hdd.read_sector(101)[1] == pytest.approx(rw_delay)
+    # Той самий сектор - лише після майже повного оберту
+    assert hdd.read_sector(101)[1] == pytest.approx(revolution)
+
+    # Під час простою пластина обертається далі
+    hdd.advance_clock(revolution / 2)
+    assert hdd.access_time(102) == pytest.approx(revolution / 2 + rw_delay)
@@ -0,0 +1,86 @@
+import pytest
+
+from controller import HDDController
+from simulation import Simulator
+
+
+def test_disk_requests_are_stamped_with_simulation_time():
+    controller = HDDController(scheduler_type='DEADLINE', cache_total=0, cache_left=0, cache_middle=0)
+    simulator = Simulator(controller)
+    scheduler = controller.scheduler
+    submitted = []
+    submit = scheduler.submit
+    scheduler.submit = lambda *args, **kwargs: submitted.append(submit(*args, **kwargs)) or submitted[-1]
+
+    # Другий запит надходить, поки диск обслуговує перший
+    simulator.add_arrivals('p', [(0.0, 0, False), (1.0, 2_500_000, False), (2.0, 5000, False)])
+    simulator.run()
+
+    jobs = sorted(simulator.completed, key=lambda job: job.arrival_time)
+    assert [request.submit_time for request in submitted] == [job.enqueue_time for job in jobs]
+    assert submitted[1].submit_time < controller.hdd.clock
+
+
+def _controller(**kwargs):
+    return HDDController(cache_total=4, cache_left=1, cache_middle=2, **kwargs)
+
+
+def test_response_time_is_sum_of_component_events():
+    controller = _controller()
+    simulator = Simulator(controller)
+    simulator.add_arrivals('p', [(0.0, 100, False), (50.0, 100, False)])
+    simulator.run()
+
+    miss, hit = simulator.completed
+    assert not miss.hit and hit.hit
+    assert miss.queue_wait == 0.0
+    assert miss.response_time == pytest.approx(controller.syscall_read_delay + miss.service_time +
+                                               controller.interrupt_handling_delay +
+                                               controller.user_process_read_delay)
+    assert hit.response_time == pytest.approx(controller.syscall_read_delay + controller.cache_access_delay +
+                                              controller.user_process_read_delay)
+
+
+def test_disk_serves_one_request_at_a_time():
+    simulator = Simulator(_controller())
+    simulator.add_arrivals('a', [(0.0, 0, False), (0.1, 2_000_000, True)])
+    simulator.add_arrivals('b', [(0.2, 4_000_000, False), (0.3, 1_000_000, False)])
+    simulator.run()
+
+    jobs = sorted(simulator.completed, key=lambda job: job.dispatch_time)
+    for previous, job in zip(jobs, jobs[1:]):
+        assert job.dispatch_time >= previous.dispatch_time + previous.service_time - 1e-9
+    assert sum(job.queue_wait > 0 for job in jobs) >= 2
+
+    stats = simulator.get_statistics()
+    assert stats['completed'] == 4
+    assert 0 < stats['disk_utilization'] <= 1
+    assert stats['mean_queue_wait'] > 0
+
+
+def test_closed_loop_process_waits_for_completion_and_think_time():
+    simulator = Simulator(_controller())
+    simulator.add_process('p', [(10, False), (20_000, False), (30_000, True)], start_time=5.0, think_time=3.0)
+    simulator.run()
+
+    first, second, third = simulator.completed
+    assert first.arrival_time == 5.0
+    assert second.arrival_time == pytest.approx(first.completion_time + 3.0)
+    assert third.arrival_time == pytest.approx(second.completion_time + 3.0)
+    assert third.is_write
+
+
+def test_run_until_stops_the_clock():
+    simulator = Simulator(_controller())
+    simulator.add_arrivals('p', [(0.0, 0, False), (1000.0, 500, False)])
+
+    assert simulator.run(until=500.0) == 500.0
+    assert len(simulator.completed) == 1
+    simulator.run()
+    assert len(simulator.completed) == 2
+
+
+@pytest.mark.parametrize('kwargs', [{'max_queue_depth': 4}, {'write_policy': 'back'}])
+def test_unsupported_controllers_are_rejected(kwargs):
+    with pytest.raises(ValueError):
+        Simulator(_controller(**kwargs))
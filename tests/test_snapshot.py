@@ -0,0 +1,36 @@
+import numpy as np
+
+from controller import HDDController
+
+
+def _evictions(controller, sectors):
+    """Порядок витіснення при додаванні нових секторів у кеш"""
+    evicted = []
+    controller.cache.on_evict = lambda sector, data: evicted.append(sector)
+    for sector in sectors:
+        controller.cache.add_sector(sector, controller.hdd.peek_sector(sector))
+    return evicted
+
+
+def test_lfu_round_trip_keeps_eviction_order(tmp_path):
+    total = 120_000
+    controller = HDDController(cache_left=1000, cache_middle=2000, cache_total=total)
+    rng = np.random.default_rng(0)
+    for sector in range(total):
+        controller.cache.add_sector(sector, controller.hdd.peek_sector(sector))
+    # Різні лічильники, щоб правий сегмент витісняв не лише за віком
+    for sector in rng.integers(0, total, size=50_000).tolist():
+        controller.cache.get_sector(sector)
+
+    path = tmp_path / 'warm.snap'
+    controller.save_snapshot(path)
+    restored = HDDController.load_snapshot(path)
+
+    for name in ('left_segment', 'middle_segment', 'right_segment'):
+        original = getattr(controller.cache, name)
+        copy = getattr(restored.cache, name)
+        assert len(copy) == len(original)
+        assert copy.tail.sector_number == original.tail.sector_number
+
+    incoming = range(total, total + 20_000)
+    assert _evictions(restored, incoming) == _evictions(controller, incoming)
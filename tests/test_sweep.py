@@ -0,0 +1,46 @@
+import json
+import os
+
+from sweep import expand_grid, run_sweep
+
+GRID = {'cache_total': [4, 8], 'scheduler_type': ['LOOK']}
+
+
+def _trace(path, sectors):
+    path.write_text(''.join(json.dumps({'sector': sector, 'size': 512}) + '\n' for sector in sectors))
+    return str(path)
+
+
+def _checkpoint_lines(path):
+    with open(path, encoding='utf-8') as f:
+        return sum(1 for line in f if line.strip())
+
+
+def test_expand_grid_covers_all_combinations():
+    points = expand_grid({'b': [1, 2], 'a': ['x', 'y', 'z']})
+    assert len(points) == 6
+    assert points[0] == {'a': 'x', 'b': 1}
+
+
+def test_resume_reuses_results_only_for_the_same_trace(tmp_path):
+    checkpoint = str(tmp_path / 'checkpoint.jsonl')
+    short = _trace(tmp_path / 'short.jsonl', [10, 20, 10, 20])
+    other = _trace(tmp_path / 'other.jsonl', [10, 620, 1230, 1840, 2450, 3060])
+
+    first = run_sweep(GRID, short, workers=1, checkpoint=checkpoint)
+    assert _checkpoint_lines(checkpoint) == 2
+    # Продовження на тій самій трасі нічого не перераховує
+    assert run_sweep(GRID, short, workers=1, checkpoint=checkpoint) == first
+    assert _checkpoint_lines(checkpoint) == 2
+
+    rows = run_sweep(GRID, other, workers=1, checkpoint=checkpoint)
+    assert _checkpoint_lines(checkpoint) == 4
+    assert [row['requests'] for row in first] == [4, 4]
+    assert [row['requests'] for row in rows] == [6, 6]
+
+    # Змінена на місці траса теж рахується заново
+    _trace(tmp_path / 'short.jsonl', [10, 20, 30, 40, 50, 60, 70])
+    os.utime(short, ns=(0, 10**18))
+    changed = run_sweep(GRID, short, workers=1, checkpoint=checkpoint)
+    assert _checkpoint_lines(checkpoint) == 6
+    assert [row['requests'] for row in changed] == [7, 7]
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from controller import HDDController
+from hard_drive import HDD
+from replay import SummarySink, replay, replay_binary, request_sectors
+from trace_format import OP_READ, OP_WRITE, TRACE_DTYPE, TraceFile, TraceWriter, iter_binary, simulate_trace
+
+
+def _write_trace(path):
+    records = np.zeros(6, dtype=TRACE_DTYPE)
+    records['sector'] = [100, 100, 5000, 7000, 100, 20000]
+    records['op'] = [OP_WRITE, OP_READ, OP_READ, OP_WRITE, OP_READ, OP_READ]
+    records['size'] = [1024, 512, 4096, 512, 2048, 100]
+    with TraceWriter(path) as writer:
+        writer.pid_id('p')
+        writer.append(records)
+
+
+def test_binary_replay_matches_record_replay(tmp_path):
+    path = str(tmp_path / 'trace.bin')
+    _write_trace(path)
+    trace = TraceFile(path)
+    # Стовпчик секторів передається рушію без перетворення
+    sectors = trace.records['sector']
+    assert np.shares_memory(np.asarray(sectors, dtype=np.int64), sectors)
+
+    results = []
+    for run in (lambda c, s: replay(c, iter_binary(path), s), lambda c, s: replay_binary(c, trace, s)):
+        controller = HDDController()
+        sink = SummarySink()
+        processed = run(controller, [sink])
+        results.append((processed, sink.summary(), controller.cache_hits + controller.cache_misses,
+                        controller.total_delay))
+
+    assert results[0] == results[1]
+    assert results[0][0] == 6
+    # size задає довжину читань: 1 + 8 + 4 + 1 секторів
+    assert results[0][2] == 14
+
+
+def test_simulate_batch_rejects_range_crossing_track():
+    hdd = HDD()
+    with pytest.raises(ValueError):
+        hdd.simulate_batch([499], None, [8])
+    with pytest.raises(ValueError):
+        hdd.read_sectors(499, 8)
+
+
+def test_simulate_batch_matches_sequential_multi_sector_reads():
+    sectors, counts = [10, 4000, 492, 70000], [1, 4, 8, 2]
+    delays, head = HDD().simulate_batch(sectors, None, counts)
+
+    hdd = HDD()
+    expected = [hdd.read_sectors(sector, count)[1] for sector, count in zip(sectors, counts)]
+    assert delays.tolist() == expected
+    assert head == hdd.rw_head_position
+
+
+def test_simulate_trace_splits_sized_requests_like_replay(tmp_path):
+    path = str(tmp_path / 'trace.bin')
+    _write_trace(path)
+    # Запит у 8 секторів з сектора 499 перетинає межу доріжки
+    records = np.zeros(1, dtype=TRACE_DTYPE)
+    records['sector'] = 499
+    records['size'] = 4096
+    sized_path = str(tmp_path / 'sized.bin')
+    with TraceWriter(sized_path) as writer:
+        writer.append(records)
+
+    for trace_path in (path, sized_path):
+        trace = TraceFile(trace_path)
+        count, total_delay, head = simulate_trace(HDD(), trace)
+
+        hdd = HDD()
+        expected = 0.0
+        for record in trace.records:
+            for offset in range(request_sectors(int(record['size']))):
+                expected += hdd.read_sector(int(record['sector']) + offset)[1]
+        assert count == len(trace)
+        assert total_delay == pytest.approx(expected)
+        assert head == hdd.rw_head_position
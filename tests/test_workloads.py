@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from controller import HDDController
+from replay import replay_binary
+from trace_format import OP_WRITE, TraceFile
+from workloads import (HotspotPattern, ProcessSpec, SequentialPattern, UniformPattern, Workload, ZipfPattern,
+                       main_processes)
+
+
+def _trace(workload, count):
+    return np.concatenate(list(workload.blocks(count, block_size=1000)))
+
+
+def test_sequential_pattern_continues_across_blocks():
+    pattern = SequentialPattern(universe=10, start=7, stride=2)
+    rng = np.random.default_rng(0)
+
+    assert pattern.sample(3, rng).tolist() == [7, 9, 1]
+    assert pattern.sample(2, rng).tolist() == [3, 5]
+
+
+@pytest.mark.parametrize('pattern', [
+    UniformPattern(1000, offset=500),
+    ZipfPattern(1000, alpha=1.1, offset=500),
+    HotspotPattern(1000, offset=500),
+])
+def test_patterns_stay_within_their_range(pattern):
+    sectors = pattern.sample(10000, np.random.default_rng(1))
+    assert sectors.min() >= 500 and sectors.max() < 1500
+
+
+def test_hotspot_concentrates_accesses():
+    pattern = HotspotPattern(10000, hot_fraction=0.1, hot_probability=0.9, hot_start=2000)
+    sectors = pattern.sample(20000, np.random.default_rng(2))
+    in_hot = ((sectors >= 2000) & (sectors < 3000)).mean()
+    assert 0.88 < in_hot < 0.94
+
+
+def test_same_seed_gives_same_trace():
+    first = _trace(main_processes(seed=3), 5000)
+    second = _trace(main_processes(seed=3), 5000)
+    other = _trace(main_processes(seed=4), 5000)
+
+    assert np.array_equal(first, second)
+    assert not np.array_equal(first, other)
+
+
+def test_blocks_are_ordered_and_respect_rates_and_write_ratio():
+    workload = Workload({
+        'reader': ProcessSpec(UniformPattern(1000), rate=300, write_ratio=0.0),
+        'writer': ProcessSpec(UniformPattern(1000), rate=100, write_ratio=1.0, burst_factor=8),
+    }, seed=5)
+    trace = _trace(workload, 20000)
+
+    assert len(trace) == 20000
+    assert np.all(np.diff(trace['timestamp']) >= 0)
+    writer = trace['pid'] == 1
+    assert np.all(trace['op'][writer] == OP_WRITE)
+    assert not np.any(trace['op'][~writer] == OP_WRITE)
+    # Пачки не змінюють середньої інтенсивності процесу
+    assert writer.mean() == pytest.approx(0.25, abs=0.03)
+
+
+def test_default_trace_replays_on_default_controller(tmp_path):
+    path = str(tmp_path / 'trace.bin')
+    assert main_processes(seed=6).write_trace(path, 2000) == 2000
+
+    controller = HDDController(collect_metrics=False)
+    assert replay_binary(controller, TraceFile(path)) == 2000
+    assert TraceFile(path).records['sector'].max() < controller.hdd.total_sectors
@@ -0,0 +1,187 @@
+"""
+Компактний бінарний формат траси запитів.
+
+Файл складається з 64-байтного заголовка, масиву записів фіксованої
+ширини TRACE_DTYPE та таблиці імен процесів (JSON) у кінці файлу.
+Масив записів відкривається через np.memmap, тож читач віддає
+порції траси без розбору тексту та без копіювання. Номери секторів
+зберігаються як int64 - тип, з яким працює HDD, тож стовпчик sector
+передається рушію без перетворення.
+"""
+import argparse
+import json
+import struct
+import numpy as np
+
+from replay import TraceRecord, open_trace, request_sectors, split_requests
+
+
+MAGIC = b'HDDTRACE'
+VERSION = 1
+HEADER_SIZE = 64
+# magic, версія, кількість записів, зміщення таблиці процесів
+_HEADER = struct.Struct('<8sIQQ')
+
+OP_READ = 0
+OP_WRITE = 1
+
+TRACE_DTYPE = np.dtype([
+    ('timestamp', '<f8'),
+    ('pid', '<u4'),
+    ('sector', '<i8'),
+    ('op', 'u1'),
+    ('size', '<u4'),
+])
+
+
+class TraceWriter:
+    """Потоковий запис бінарної траси порціями"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'wb')
+        self.file.write(b'\0' * HEADER_SIZE)
+        self.count = 0
+        self.pid_names = []
+        self._pid_ids = {}
+
+    def pid_id(self, name):
+        """Повертає числовий ідентифікатор процесу, реєструючи нові імена"""
+        pid = self._pid_ids.get(name)
+        if pid is None:
+            pid = len(self.pid_names)
+            self._pid_ids[name] = pid
+            self.pid_names.append(name)
+        return pid
+
+    def append(self, records):
+        """Дописує порцію записів (масив з dtype TRACE_DTYPE)"""
+        records = np.asarray(records, dtype=TRACE_DTYPE)
+        self.file.write(records.tobytes())
+        self.count += len(records)
+
+    def close(self):
+        pid_table_offset = self.file.tell()
+        self.file.write(json.dumps(self.pid_names).encode('utf-8'))
+        self.file.seek(0)
+        self.file.write(_HEADER.pack(MAGIC, VERSION, self.count, pid_table_offset))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class TraceFile:
+    """Бінарна траса, відображена в пам'ять"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            magic, version, count, pid_table_offset = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} не є бінарною трасою версії {VERSION}")
+            f.seek(pid_table_offset)
+            self.pid_names = json.loads(f.read().decode('utf-8'))
+
+        if count:
+            self.records = np.memmap(path, dtype=TRACE_DTYPE, mode='r',
+                                     offset=HEADER_SIZE, shape=(count,))
+        else:
+            self.records = np.empty(0, dtype=TRACE_DTYPE)
+
+    def iter_chunks(self, chunk_size=65536):
+        """Генератор порцій записів - зрізів memmap без копіювання"""
+        for start in range(0, len(self.records), chunk_size):
+            yield self.records[start:start + chunk_size]
+
+    def pid_name(self, pid):
+        return self.pid_names[pid] if pid < len(self.pid_names) else pid
+
+    def __len__(self):
+        return len(self.records)
+
+
+def iter_binary(path, chunk_size=65536):
+    """
+    Генератор TraceRecord з бінарної траси для загального конвеєра replay
+    (повільний шлях: об'єкт на кожен запис; відтворення бінарної траси
+    без них - replay.replay_binary)
+    """
+    trace = TraceFile(path)
+    for chunk in trace.iter_chunks(chunk_size):
+        timestamps = chunk['timestamp'].tolist()
+        pids = chunk['pid'].tolist()
+        sectors = chunk['sector'].tolist()
+        ops = chunk['op'].tolist()
+        sizes = chunk['size'].tolist()
+        for timestamp, pid, sector, op, size in zip(timestamps, pids, sectors, ops, sizes):
+            yield TraceRecord(sector=sector,
+                              is_write=op == OP_WRITE,
+                              pid=trace.pid_name(pid),
+                              timestamp=timestamp,
+                              size=size)
+
+
+def convert_trace(src, dst, fmt=None, chunk_size=65536):
+    """
+    Перетворює текстову трасу (JSONL або CSV) у бінарний формат потоково
+
+    Returns:
+        int: Кількість записаних запитів
+    """
+    chunk = np.empty(chunk_size, dtype=TRACE_DTYPE)
+    filled = 0
+
+    with TraceWriter(dst) as writer:
+        for record in open_trace(src, fmt):
+            chunk[filled] = (record.timestamp,
+                             writer.pid_id(record.pid),
+                             record.sector,
+                             OP_WRITE if record.is_write else OP_READ,
+                             record.size)
+            filled += 1
+            if filled == chunk_size:
+                writer.append(chunk)
+                filled = 0
+        if filled:
+            writer.append(chunk[:filled])
+        return writer.count
+
+
+def simulate_trace(hdd, trace, chunk_size=1 << 20):
+    """
+    Обчислює затримки всієї траси векторним рушієм HDD.simulate_batch
+    (без кешу). Запит розміром size байт, як і в replay, обслуговується
+    зверненнями до кожного з його секторів; траса з однесекторних
+    запитів передається рушію зрізами memmap без копіювання
+
+    Returns:
+        tuple: (кількість запитів, сумарна затримка, кінцева позиція головки)
+    """
+    count = 0
+    total_delay = 0.0
+    for chunk in trace.iter_chunks(chunk_size):
+        sectors, writes = split_requests(chunk['sector'], chunk['op'] == OP_WRITE,
+                                         request_sectors(chunk['size'], hdd.sector_size))
+        delays, _ = hdd.simulate_batch(sectors, writes)
+        count += len(chunk)
+        total_delay += float(delays.sum())
+    return count, total_delay, hdd.rw_head_position
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Перетворення траси у бінарний формат")
+    parser.add_argument('src', help="Текстова траса (.jsonl або .csv)")
+    parser.add_argument('dst', help="Бінарна траса (.bin)")
+    parser.add_argument('--format', default=None, help="Формат вхідної траси (jsonl, csv)")
+    args = parser.parse_args(argv)
+
+    count = convert_trace(args.src, args.dst, args.format)
+    print(f"Записано запитів: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Генератор синтетичних навантажень.
+
+Навантаження складається з процесів; кожен процес має шаблон доступу
+до секторів (послідовний, рівномірний, zipf, гаряча зона), частку
+записів та потік надходжень (пуассонівський або пачками). Запити
+генеруються векторно блоками у форматі TRACE_DTYPE, тож 10^8 запитів
+можна записати в бінарну трасу або передати в replay, не тримаючи їх
+усі в пам'яті. Однаковий seed дає однакову трасу.
+
+    python workloads.py trace.bin --requests 100000000 --seed 1 --sectors 500 --tracks 10000
+"""
+import argparse
+from dataclasses import dataclass
+import numpy as np
+
+from replay import TraceRecord
+from trace_format import TRACE_DTYPE, OP_READ, OP_WRITE, TraceWriter
+
+
+# Шаблони доступу: sample(count, rng) повертає масив номерів секторів
+
+class SequentialPattern:
+    """Послідовне читання з кроком stride, що продовжується між блоками"""
+
+    def __init__(self, universe, start=0, stride=1):
+        self.universe = universe
+        self.position = start
+        self.stride = stride
+
+    def sample(self, count, rng):
+        sectors = (self.position + np.arange(count, dtype=np.int64) * self.stride) % self.universe
+        self.position = (self.position + count * self.stride) % self.universe
+        return sectors
+
+
+class UniformPattern:
+    """Рівномірний випадковий доступ"""
+
+    def __init__(self, universe, offset=0):
+        self.universe = universe
+        self.offset = offset
+
+    def sample(self, count, rng):
+        return self.offset + rng.integers(0, self.universe, size=count, dtype=np.int64)
+
+
+class ZipfPattern:
+    """
+    Доступ за законом Zipf: ранг k обирається з імовірністю ~ 1/k^alpha.
+    Популярні ранги розкидаються по діапазону мультиплікативним хешем.
+    """
+
+    def __init__(self, universe, alpha=1.2, offset=0, scatter=True):
+        self.universe = universe
+        self.alpha = alpha
+        self.offset = offset
+        self.scatter = scatter
+
+    def sample(self, count, rng):
+        ranks = rng.zipf(self.alpha, size=count).astype(np.int64) % self.universe
+        if self.scatter:
+            ranks = (ranks * 2_654_435_761) % self.universe
+        return self.offset + ranks
+
+
+class HotspotPattern:
+    """Частка hot_probability звернень припадає на зону розміром hot_fraction"""
+
+    def __init__(self, universe, hot_fraction=0.1, hot_probability=0.9, hot_start=0, offset=0):
+        self.universe = universe
+        self.hot_size = max(1, int(universe * hot_fraction))
+        self.hot_probability = hot_probability
+        self.hot_start = hot_start
+        self.offset = offset
+
+    def sample(self, count, rng):
+        sectors = rng.integers(0, self.universe, size=count, dtype=np.int64)
+        is_hot = rng.random(count) < self.hot_probability
+        sectors[is_hot] = self.hot_start + rng.integers(0, self.hot_size, size=int(is_hot.sum()))
+        return self.offset + sectors
+
+
+@dataclass
+class ProcessSpec:
+    pattern: object
+    rate: float = 100.0             # середня інтенсивність (запитів/с)
+    write_ratio: float = 0.0        # частка записів
+    burst_factor: float = 1.0       # у скільки разів інтенсивніше в пачці (1 - без пачок)
+    burst_fraction: float = 0.1     # частка часових слотів, що є пачками
+    burst_slot: float = 50.0        # тривалість слоту (мс)
+
+
+class Workload:
+    def __init__(self, processes, seed=0):
+        """
+        Args:
+            processes: Словник ім'я процесу -> ProcessSpec
+            seed: Початкове значення генератора (однаковий seed - однакова траса)
+        """
+        self.names = list(processes)
+        self.specs = [processes[name] for name in self.names]
+        streams = np.random.SeedSequence(seed).spawn(len(self.specs))
+        self.rngs = [np.random.default_rng(stream) for stream in streams]
+        self.now = 0.0
+        self.total_rate = sum(spec.rate for spec in self.specs)
+
+    def _arrivals(self, spec, rng, start, duration):
+        """Моменти надходжень процесу у вікні [start, start + duration) (мс)"""
+        slots = max(1, int(np.ceil(duration / spec.burst_slot)))
+        slot_length = duration / slots
+        base_rate = spec.rate / 1000
+
+        if spec.burst_factor != 1.0:
+            # Середня інтенсивність зберігається: слоти-пачки інтенсивніші, решта - тихіші
+            norm = spec.burst_fraction * spec.burst_factor + (1 - spec.burst_fraction)
+            in_burst = rng.random(slots) < spec.burst_fraction
+            rates = np.where(in_burst, base_rate * spec.burst_factor / norm, base_rate / norm)
+        else:
+            rates = np.full(slots, base_rate)
+
+        counts = rng.poisson(rates * slot_length)
+        slot_starts = start + np.arange(slots) * slot_length
+        times = np.repeat(slot_starts, counts) + rng.random(int(counts.sum())) * slot_length
+        times.sort()
+        return times
+
+    def blocks(self, count, block_size=1 << 20):
+        """
+        Генератор блоків запитів (масиви TRACE_DTYPE), упорядкованих за часом
+
+        Args:
+            count: Загальна кількість запитів
+            block_size: Середній розмір блоку
+        """
+        remaining = count
+        window = block_size / (self.total_rate / 1000)
+
+        while remaining > 0:
+            parts = []
+            for pid, (spec, rng) in enumerate(zip(self.specs, self.rngs)):
+                times = self._arrivals(spec, rng, self.now, window)
+                n = len(times)
+                part = np.empty(n, dtype=TRACE_DTYPE)
+                part['timestamp'] = times
+                part['pid'] = pid
+                part['sector'] = spec.pattern.sample(n, rng)
+                part['op'] = np.where(rng.random(n) < spec.write_ratio, OP_WRITE, OP_READ)
+                part['size'] = 512
+                parts.append(part)
+
+            block = np.concatenate(parts)
+            block = block[np.argsort(block['timestamp'], kind='stable')]
+            if len(block) > remaining:
+                block = block[:remaining]
+            remaining -= len(block)
+            self.now += window
+            yield block
+
+    def records(self, count, block_size=1 << 16):
+        """Генератор TraceRecord для конвеєра replay"""
+        for block in self.blocks(count, block_size):
+            for timestamp, pid, sector, op, size in zip(block['timestamp'].tolist(), block['pid'].tolist(),
+                                                        block['sector'].tolist(), block['op'].tolist(),
+                                                        block['size'].tolist()):
+                yield TraceRecord(sector=sector, is_write=op == OP_WRITE,
+                                  pid=self.names[pid], timestamp=timestamp, size=size)
+
+    def write_trace(self, path, count, block_size=1 << 20):
+        """
+        Записує навантаження у бінарну трасу блоками
+
+        Returns:
+            int: Кількість записаних запитів
+        """
+        with TraceWriter(path) as writer:
+            for name in self.names:
+                writer.pid_id(name)
+            for block in self.blocks(count, block_size):
+                writer.append(block)
+            return writer.count
+
+
+def main_processes(total_sectors=500 * 10000, seed=0):
+    """
+    Навантаження з процесами на зразок тих, що моделюються в main.py
+
+    Args:
+        total_sectors: Кількість секторів диска (за замовчуванням - як у
+            HDDController з параметрами за замовчуванням)
+        seed: Початкове значення генератора
+    """
+    return Workload({
+        'FinAnalytics': ProcessSpec(SequentialPattern(total_sectors, start=3000),
+                                    rate=200, write_ratio=0.3),
+        'DocProcessor': ProcessSpec(UniformPattern(total_sectors),
+                                    rate=100, write_ratio=0.5, burst_factor=8),
+        'DataVis': ProcessSpec(ZipfPattern(total_sectors, alpha=1.1),
+                               rate=150, write_ratio=0.1),
+    }, seed=seed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Генерація синтетичної траси у бінарному форматі")
+    parser.add_argument('output', help="Бінарна траса (.bin)")
+    parser.add_argument('--requests', type=int, default=1_000_000)
+    parser.add_argument('--sectors', type=int, default=500, help="Секторів на доріжці")
+    parser.add_argument('--tracks', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    count = main_processes(args.sectors * args.tracks, args.seed).write_trace(args.output, args.requests)
+    print(f"Записано запитів: {count}")
+
+
+if __name__ == "__main__":
+    main()